@@ -15,8 +15,13 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 from app.models import Base  # imports User + Todo models
+from app.core.config import settings
 target_metadata = Base.metadata
 
+# Migrate the database the app is configured for (settings.DATABASE_URL);
+# "%" is escaped for configparser interpolation
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
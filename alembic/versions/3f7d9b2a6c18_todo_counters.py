@@ -0,0 +1,112 @@
+"""Per-owner todo counters maintained by triggers
+
+Revision ID: 3f7d9b2a6c18
+Revises: 9c4a1e7d2f60
+Create Date: 2026-10-17 13:05:27.904116
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7d9b2a6c18'
+down_revision: Union[str, Sequence[str], None] = '9c4a1e7d2f60'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# tag_id 0 is the owner-wide row
+TRIGGERS = {
+    # New todo: owner-wide total (+ done)
+    "todo_counters_todo_ai": (
+        "AFTER INSERT ON todos BEGIN "
+        "INSERT OR IGNORE INTO todo_counters (owner_id, tag_id, total, done) VALUES (new.owner_id, 0, 0, 0); "
+        "UPDATE todo_counters SET total = total + 1, done = done + (CASE WHEN new.is_done THEN 1 ELSE 0 END) "
+        "WHERE owner_id = new.owner_id AND tag_id = 0; "
+        "END"
+    ),
+    # Deleted todo: unlink tags first (todo_tags trigger still sees the todo)
+    "todo_counters_todo_bd": (
+        "BEFORE DELETE ON todos BEGIN "
+        "DELETE FROM todo_tags WHERE todo_id = old.id; "
+        "END"
+    ),
+    "todo_counters_todo_ad": (
+        "AFTER DELETE ON todos BEGIN "
+        "UPDATE todo_counters SET total = total - 1, done = done - (CASE WHEN old.is_done THEN 1 ELSE 0 END) "
+        "WHERE owner_id = old.owner_id AND tag_id = 0; "
+        "END"
+    ),
+    # Status flip: owner-wide row and every tag row of the todo
+    "todo_counters_todo_au": (
+        "AFTER UPDATE OF is_done ON todos "
+        "WHEN (CASE WHEN old.is_done THEN 1 ELSE 0 END) != (CASE WHEN new.is_done THEN 1 ELSE 0 END) BEGIN "
+        "UPDATE todo_counters SET done = done + (CASE WHEN new.is_done THEN 1 ELSE -1 END) "
+        "WHERE owner_id = new.owner_id AND (tag_id = 0 OR tag_id IN (SELECT tag_id FROM todo_tags WHERE todo_id = new.id)); "
+        "END"
+    ),
+    "todo_counters_link_ai": (
+        "AFTER INSERT ON todo_tags BEGIN "
+        "INSERT OR IGNORE INTO todo_counters (owner_id, tag_id, total, done) "
+        "SELECT owner_id, new.tag_id, 0, 0 FROM todos WHERE id = new.todo_id; "
+        "UPDATE todo_counters SET total = total + 1, "
+        "done = done + (SELECT CASE WHEN is_done THEN 1 ELSE 0 END FROM todos WHERE id = new.todo_id) "
+        "WHERE owner_id = (SELECT owner_id FROM todos WHERE id = new.todo_id) AND tag_id = new.tag_id; "
+        "END"
+    ),
+    "todo_counters_link_ad": (
+        "AFTER DELETE ON todo_tags BEGIN "
+        "UPDATE todo_counters SET total = total - 1, "
+        "done = done - (SELECT CASE WHEN is_done THEN 1 ELSE 0 END FROM todos WHERE id = old.todo_id) "
+        "WHERE owner_id = (SELECT owner_id FROM todos WHERE id = old.todo_id) AND tag_id = old.tag_id; "
+        "END"
+    ),
+    "todo_counters_tag_bd": (
+        "BEFORE DELETE ON tags BEGIN "
+        "DELETE FROM todo_tags WHERE tag_id = old.id; "
+        "END"
+    ),
+    "todo_counters_tag_ad": (
+        "AFTER DELETE ON tags BEGIN "
+        "DELETE FROM todo_counters WHERE owner_id = old.owner_id AND tag_id = old.id; "
+        "END"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('todo_counters',
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('tag_id', sa.Integer(), nullable=False),
+    sa.Column('total', sa.Integer(), nullable=False),
+    sa.Column('done', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('owner_id', 'tag_id')
+    )
+    # Drop links left behind by earlier bulk deletes, then backfill
+    op.execute("DELETE FROM todo_tags WHERE todo_id NOT IN (SELECT id FROM todos)")
+    op.execute(
+        "INSERT INTO todo_counters (owner_id, tag_id, total, done) "
+        "SELECT owner_id, 0, COUNT(*), SUM(CASE WHEN is_done THEN 1 ELSE 0 END) "
+        "FROM todos GROUP BY owner_id"
+    )
+    op.execute(
+        "INSERT INTO todo_counters (owner_id, tag_id, total, done) "
+        "SELECT t.owner_id, tt.tag_id, COUNT(*), SUM(CASE WHEN t.is_done THEN 1 ELSE 0 END) "
+        "FROM todo_tags tt JOIN todos t ON t.id = tt.todo_id GROUP BY t.owner_id, tt.tag_id"
+    )
+    if op.get_bind().dialect.name != "sqlite":
+        return  # PostgreSQL triggers are created in f5a1c8d3b260
+    for name, body in TRIGGERS.items():
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == "sqlite":
+        for name in TRIGGERS:
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+    op.drop_table('todo_counters')
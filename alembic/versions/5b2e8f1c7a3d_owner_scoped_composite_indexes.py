@@ -0,0 +1,42 @@
+"""Owner-scoped composite indexes
+
+Revision ID: 5b2e8f1c7a3d
+Revises: d491c7059c4c
+Create Date: 2026-10-17 09:12:44.318205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2e8f1c7a3d'
+down_revision: Union[str, Sequence[str], None] = 'd491c7059c4c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # get_all / get_page_after (unfiltered and is_done-filtered), delete_completed
+    op.create_index('ix_todos_owner_created', 'todos', ['owner_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_todos_owner_done_created', 'todos', ['owner_id', 'is_done', 'created_at', 'id'], unique=False)
+    # get_overdue
+    op.create_index('ix_todos_owner_done_due', 'todos', ['owner_id', 'is_done', 'due_date'], unique=False)
+    # get_today
+    op.create_index('ix_todos_owner_due', 'todos', ['owner_id', 'due_date'], unique=False)
+    # tag_id filter, tag deletion cascade
+    op.create_index('ix_todo_tags_tag_todo', 'todo_tags', ['tag_id', 'todo_id'], unique=False)
+    # TagRepository.get_all
+    op.create_index('ix_tags_owner_name', 'tags', ['owner_id', 'name'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tags_owner_name', table_name='tags')
+    op.drop_index('ix_todo_tags_tag_todo', table_name='todo_tags')
+    op.drop_index('ix_todos_owner_due', table_name='todos')
+    op.drop_index('ix_todos_owner_done_due', table_name='todos')
+    op.drop_index('ix_todos_owner_done_created', table_name='todos')
+    op.drop_index('ix_todos_owner_created', table_name='todos')
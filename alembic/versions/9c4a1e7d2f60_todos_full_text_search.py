@@ -0,0 +1,61 @@
+"""Full-text search on todos (SQLite FTS5)
+
+Revision ID: 9c4a1e7d2f60
+Revises: 5b2e8f1c7a3d
+Create Date: 2026-10-17 10:41:03.552871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4a1e7d2f60'
+down_revision: Union[str, Sequence[str], None] = '5b2e8f1c7a3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return  # PostgreSQL searches with pg_trgm indexes instead (f5a1c8d3b260)
+    # External-content FTS5 table: stores only the index, rows live in todos
+    op.execute(
+        "CREATE VIRTUAL TABLE todos_fts USING fts5("
+        "title, description, content='todos', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_ai AFTER INSERT ON todos BEGIN "
+        "INSERT INTO todos_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_ad AFTER DELETE ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "END"
+    )
+    op.execute(
+        "CREATE TRIGGER todos_fts_au AFTER UPDATE OF title, description ON todos BEGIN "
+        "INSERT INTO todos_fts(todos_fts, rowid, title, description) "
+        "VALUES ('delete', old.id, old.title, old.description); "
+        "INSERT INTO todos_fts(rowid, title, description) "
+        "VALUES (new.id, new.title, new.description); "
+        "END"
+    )
+    # Index rows that existed before this revision
+    op.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_ai")
+    op.execute("DROP TABLE IF EXISTS todos_fts")
@@ -0,0 +1,33 @@
+"""Per-owner data versions for conditional GETs
+
+Revision ID: a8e3c5f0b917
+Revises: 3f7d9b2a6c18
+Create Date: 2026-10-17 15:22:48.117392
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8e3c5f0b917'
+down_revision: Union[str, Sequence[str], None] = '3f7d9b2a6c18'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('data_versions',
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('owner_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('data_versions')
@@ -0,0 +1,73 @@
+"""Owner column in the FTS5 index
+
+Revision ID: b7d3e9a1c452
+Revises: f5a1c8d3b260
+Create Date: 2026-10-18 09:20:15.402117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9a1c452'
+down_revision: Union[str, Sequence[str], None] = 'f5a1c8d3b260'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_fts(columns: Sequence[str]) -> None:
+    """(Re)create todos_fts over `columns` with its sync triggers, then index every row."""
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    op.execute(
+        f"CREATE VIRTUAL TABLE todos_fts USING fts5("
+        f"{cols}, content='todos', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        f"CREATE TRIGGER todos_fts_ai AFTER INSERT ON todos BEGIN "
+        f"INSERT INTO todos_fts(rowid, {cols}) VALUES (new.id, {new}); "
+        f"END"
+    )
+    op.execute(
+        f"CREATE TRIGGER todos_fts_ad AFTER DELETE ON todos BEGIN "
+        f"INSERT INTO todos_fts(todos_fts, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"END"
+    )
+    op.execute(
+        f"CREATE TRIGGER todos_fts_au AFTER UPDATE OF {cols} ON todos BEGIN "
+        f"INSERT INTO todos_fts(todos_fts, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+        f"INSERT INTO todos_fts(rowid, {cols}) VALUES (new.id, {new}); "
+        f"END"
+    )
+    op.execute("INSERT INTO todos_fts(todos_fts) VALUES ('rebuild')")
+
+
+def _drop_fts() -> None:
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS todos_fts_ai")
+    op.execute("DROP TABLE IF EXISTS todos_fts")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    # Every MATCH starts with the owner's token, so a search only walks that
+    # owner's postings instead of every user's matches
+    _drop_fts()
+    _create_fts(("title", "description", "owner_id"))
+    # bm25 ignores the owner column (it matches all of the owner's rows)
+    op.execute("INSERT INTO todos_fts(todos_fts, rank) VALUES ('rank', 'bm25(1.0, 1.0, 0.0)')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    _drop_fts()
+    _create_fts(("title", "description"))
@@ -0,0 +1,43 @@
+"""Unique tag names per owner
+
+Revision ID: c6d2f4a9e185
+Revises: a8e3c5f0b917
+Create Date: 2026-10-17 19:04:31.552908
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6d2f4a9e185'
+down_revision: Union[str, Sequence[str], None] = 'a8e3c5f0b917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Merge duplicate (owner_id, name) tags into the oldest one: move their todo
+    # links over, then delete them (the todo_counters_tag_bd / _ad triggers
+    # drop the remaining links and counters). "WHERE true" lets SQLite parse
+    # ON CONFLICT after a SELECT with joins.
+    op.execute(
+        "INSERT INTO todo_tags (todo_id, tag_id) "
+        "SELECT tt.todo_id, keep.id FROM todo_tags tt "
+        "JOIN tags dup ON dup.id = tt.tag_id "
+        "JOIN (SELECT owner_id, name, MIN(id) AS id FROM tags GROUP BY owner_id, name) keep "
+        "ON keep.owner_id = dup.owner_id AND keep.name = dup.name AND keep.id <> dup.id "
+        "WHERE true ON CONFLICT DO NOTHING"
+    )
+    op.execute("DELETE FROM tags WHERE id NOT IN (SELECT MIN(id) FROM tags GROUP BY owner_id, name)")
+    # Also serves TagRepository.get_all, like the index it replaces
+    op.drop_index('ix_tags_owner_name', table_name='tags')
+    op.create_index('uq_tags_owner_name', 'tags', ['owner_id', 'name'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('uq_tags_owner_name', table_name='tags')
+    op.create_index('ix_tags_owner_name', 'tags', ['owner_id', 'name'], unique=False)
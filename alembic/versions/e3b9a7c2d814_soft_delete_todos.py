@@ -0,0 +1,114 @@
+"""Soft-deleted todos, purged in the background; incremental auto-vacuum
+
+Revision ID: e3b9a7c2d814
+Revises: c6d2f4a9e185
+Create Date: 2026-10-17 19:31:06.274519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b9a7c2d814'
+down_revision: Union[str, Sequence[str], None] = 'c6d2f4a9e185'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Counter triggers (3f7d9b2a6c18) that must ignore soft-deleted todos: a todo
+# leaves the counters when deleted_at is set, not again when it is purged
+TRIGGERS = {
+    "todo_counters_todo_ad": (
+        "AFTER DELETE ON todos WHEN old.deleted_at IS NULL BEGIN "
+        "UPDATE todo_counters SET total = total - 1, done = done - (CASE WHEN old.is_done THEN 1 ELSE 0 END) "
+        "WHERE owner_id = old.owner_id AND tag_id = 0; "
+        "END"
+    ),
+    "todo_counters_todo_au": (
+        "AFTER UPDATE OF is_done ON todos "
+        "WHEN new.deleted_at IS NULL "
+        "AND (CASE WHEN old.is_done THEN 1 ELSE 0 END) != (CASE WHEN new.is_done THEN 1 ELSE 0 END) BEGIN "
+        "UPDATE todo_counters SET done = done + (CASE WHEN new.is_done THEN 1 ELSE -1 END) "
+        "WHERE owner_id = new.owner_id AND (tag_id = 0 OR tag_id IN (SELECT tag_id FROM todo_tags WHERE todo_id = new.id)); "
+        "END"
+    ),
+    # Soft delete: owner-wide row and every tag row of the todo
+    "todo_counters_todo_sd": (
+        "AFTER UPDATE OF deleted_at ON todos "
+        "WHEN old.deleted_at IS NULL AND new.deleted_at IS NOT NULL BEGIN "
+        "UPDATE todo_counters SET total = total - 1, done = done - (CASE WHEN new.is_done THEN 1 ELSE 0 END) "
+        "WHERE owner_id = new.owner_id AND (tag_id = 0 OR tag_id IN (SELECT tag_id FROM todo_tags WHERE todo_id = new.id)); "
+        "END"
+    ),
+    "todo_counters_link_ad": (
+        "AFTER DELETE ON todo_tags "
+        "WHEN (SELECT deleted_at FROM todos WHERE id = old.todo_id) IS NULL BEGIN "
+        "UPDATE todo_counters SET total = total - 1, "
+        "done = done - (SELECT CASE WHEN is_done THEN 1 ELSE 0 END FROM todos WHERE id = old.todo_id) "
+        "WHERE owner_id = (SELECT owner_id FROM todos WHERE id = old.todo_id) AND tag_id = old.tag_id; "
+        "END"
+    ),
+}
+
+# Definitions replaced above, restored on downgrade
+PREVIOUS_TRIGGERS = {
+    "todo_counters_todo_ad": (
+        "AFTER DELETE ON todos BEGIN "
+        "UPDATE todo_counters SET total = total - 1, done = done - (CASE WHEN old.is_done THEN 1 ELSE 0 END) "
+        "WHERE owner_id = old.owner_id AND tag_id = 0; "
+        "END"
+    ),
+    "todo_counters_todo_au": (
+        "AFTER UPDATE OF is_done ON todos "
+        "WHEN (CASE WHEN old.is_done THEN 1 ELSE 0 END) != (CASE WHEN new.is_done THEN 1 ELSE 0 END) BEGIN "
+        "UPDATE todo_counters SET done = done + (CASE WHEN new.is_done THEN 1 ELSE -1 END) "
+        "WHERE owner_id = new.owner_id AND (tag_id = 0 OR tag_id IN (SELECT tag_id FROM todo_tags WHERE todo_id = new.id)); "
+        "END"
+    ),
+    "todo_counters_link_ad": (
+        "AFTER DELETE ON todo_tags BEGIN "
+        "UPDATE todo_counters SET total = total - 1, "
+        "done = done - (SELECT CASE WHEN is_done THEN 1 ELSE 0 END FROM todos WHERE id = old.todo_id) "
+        "WHERE owner_id = (SELECT owner_id FROM todos WHERE id = old.todo_id) AND tag_id = old.tag_id; "
+        "END"
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('todos', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    # Purger scan; stays tiny since it only holds rows waiting to be purged
+    op.create_index('ix_todos_deleted', 'todos', ['deleted_at'], unique=False,
+                    sqlite_where=sa.text('deleted_at IS NOT NULL'),
+                    postgresql_where=sa.text('deleted_at IS NOT NULL'))
+    bind = op.get_bind()
+    if bind.dialect.name != "sqlite":
+        return  # PostgreSQL triggers are created in f5a1c8d3b260
+
+    for name, body in TRIGGERS.items():
+        op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute(f"CREATE TRIGGER {name} {body}")
+
+    # auto_vacuum can only be switched by rebuilding the file once; afterwards
+    # the purger returns free pages with PRAGMA incremental_vacuum
+    if bind.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+        with op.get_context().autocommit_block():
+            bind.exec_driver_sql("PRAGMA auto_vacuum = INCREMENTAL")
+            bind.exec_driver_sql("VACUUM")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Purge what is still soft-deleted (the new triggers keep counters right)
+    op.execute("DELETE FROM todo_tags WHERE todo_id IN (SELECT id FROM todos WHERE deleted_at IS NOT NULL)")
+    op.execute("DELETE FROM todos WHERE deleted_at IS NOT NULL")
+    if op.get_bind().dialect.name == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS todo_counters_todo_sd")
+        for name, body in PREVIOUS_TRIGGERS.items():
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+            op.execute(f"CREATE TRIGGER {name} {body}")
+    op.drop_index('ix_todos_deleted', table_name='todos')
+    op.drop_column('todos', 'deleted_at')
@@ -0,0 +1,125 @@
+"""PostgreSQL: pg_trgm search indexes and todo counter triggers
+
+Revision ID: f5a1c8d3b260
+Revises: e3b9a7c2d814
+Create Date: 2026-10-17 20:02:17.640335
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5a1c8d3b260'
+down_revision: Union[str, Sequence[str], None] = 'e3b9a7c2d814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# PL/pgSQL versions of the SQLite counter triggers (3f7d9b2a6c18, e3b9a7c2d814):
+# name -> (timing and event, WHEN condition or None, function body).
+# tag_id 0 is the owner-wide row; soft-deleted todos are not counted.
+TRIGGERS = {
+    "todo_counters_todo_ai": (
+        "AFTER INSERT ON todos", None,
+        "INSERT INTO todo_counters (owner_id, tag_id, total, done) VALUES (NEW.owner_id, 0, 0, 0) "
+        "ON CONFLICT DO NOTHING; "
+        "UPDATE todo_counters SET total = total + 1, done = done + (CASE WHEN NEW.is_done THEN 1 ELSE 0 END) "
+        "WHERE owner_id = NEW.owner_id AND tag_id = 0; "
+        "RETURN NULL;",
+    ),
+    "todo_counters_todo_bd": (
+        "BEFORE DELETE ON todos", None,
+        "DELETE FROM todo_tags WHERE todo_id = OLD.id; "
+        "RETURN OLD;",
+    ),
+    "todo_counters_todo_ad": (
+        "AFTER DELETE ON todos", "OLD.deleted_at IS NULL",
+        "UPDATE todo_counters SET total = total - 1, done = done - (CASE WHEN OLD.is_done THEN 1 ELSE 0 END) "
+        "WHERE owner_id = OLD.owner_id AND tag_id = 0; "
+        "RETURN NULL;",
+    ),
+    "todo_counters_todo_au": (
+        "AFTER UPDATE OF is_done ON todos",
+        "NEW.deleted_at IS NULL AND COALESCE(OLD.is_done, false) IS DISTINCT FROM COALESCE(NEW.is_done, false)",
+        "UPDATE todo_counters SET done = done + (CASE WHEN NEW.is_done THEN 1 ELSE -1 END) "
+        "WHERE owner_id = NEW.owner_id AND (tag_id = 0 OR tag_id IN (SELECT tag_id FROM todo_tags WHERE todo_id = NEW.id)); "
+        "RETURN NULL;",
+    ),
+    "todo_counters_todo_sd": (
+        "AFTER UPDATE OF deleted_at ON todos", "OLD.deleted_at IS NULL AND NEW.deleted_at IS NOT NULL",
+        "UPDATE todo_counters SET total = total - 1, done = done - (CASE WHEN NEW.is_done THEN 1 ELSE 0 END) "
+        "WHERE owner_id = NEW.owner_id AND (tag_id = 0 OR tag_id IN (SELECT tag_id FROM todo_tags WHERE todo_id = NEW.id)); "
+        "RETURN NULL;",
+    ),
+    "todo_counters_link_ai": (
+        "AFTER INSERT ON todo_tags", None,
+        "INSERT INTO todo_counters (owner_id, tag_id, total, done) "
+        "SELECT owner_id, NEW.tag_id, 0, 0 FROM todos WHERE id = NEW.todo_id ON CONFLICT DO NOTHING; "
+        "UPDATE todo_counters c SET total = c.total + 1, done = c.done + (CASE WHEN t.is_done THEN 1 ELSE 0 END) "
+        "FROM todos t WHERE t.id = NEW.todo_id AND c.owner_id = t.owner_id AND c.tag_id = NEW.tag_id; "
+        "RETURN NULL;",
+    ),
+    # A WHEN clause cannot hold a subquery here: the live-todo check is in the join
+    "todo_counters_link_ad": (
+        "AFTER DELETE ON todo_tags", None,
+        "UPDATE todo_counters c SET total = c.total - 1, done = c.done - (CASE WHEN t.is_done THEN 1 ELSE 0 END) "
+        "FROM todos t WHERE t.id = OLD.todo_id AND t.deleted_at IS NULL "
+        "AND c.owner_id = t.owner_id AND c.tag_id = OLD.tag_id; "
+        "RETURN NULL;",
+    ),
+    "todo_counters_tag_bd": (
+        "BEFORE DELETE ON tags", None,
+        "DELETE FROM todo_tags WHERE tag_id = OLD.id; "
+        "RETURN OLD;",
+    ),
+    "todo_counters_tag_ad": (
+        "AFTER DELETE ON tags", None,
+        "DELETE FROM todo_counters WHERE owner_id = OLD.owner_id AND tag_id = OLD.id; "
+        "RETURN NULL;",
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return  # SQLite uses FTS5 and the triggers of earlier revisions
+
+    # q search: ILIKE '%word%' on title/description, served by trigram GIN indexes
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index('ix_todos_title_trgm', 'todos', ['title'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'})
+    op.create_index('ix_todos_description_trgm', 'todos', ['description'], unique=False,
+                    postgresql_using='gin', postgresql_ops={'description': 'gin_trgm_ops'})
+
+    # Earlier revisions ran here without triggers: recount before installing them
+    op.execute("DELETE FROM todo_tags WHERE todo_id NOT IN (SELECT id FROM todos)")
+    op.execute("DELETE FROM todo_counters")
+    op.execute(
+        "INSERT INTO todo_counters (owner_id, tag_id, total, done) "
+        "SELECT owner_id, 0, COUNT(*), SUM(CASE WHEN is_done THEN 1 ELSE 0 END) "
+        "FROM todos WHERE deleted_at IS NULL GROUP BY owner_id"
+    )
+    op.execute(
+        "INSERT INTO todo_counters (owner_id, tag_id, total, done) "
+        "SELECT t.owner_id, tt.tag_id, COUNT(*), SUM(CASE WHEN t.is_done THEN 1 ELSE 0 END) "
+        "FROM todo_tags tt JOIN todos t ON t.id = tt.todo_id "
+        "WHERE t.deleted_at IS NULL GROUP BY t.owner_id, tt.tag_id"
+    )
+    for name, (event, condition, body) in TRIGGERS.items():
+        op.execute(f"CREATE FUNCTION {name}() RETURNS trigger LANGUAGE plpgsql AS $$ BEGIN {body} END $$")
+        when = f"WHEN ({condition}) " if condition else ""
+        op.execute(f"CREATE TRIGGER {name} {event} FOR EACH ROW {when}EXECUTE FUNCTION {name}()")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    for name, (event, _, _) in TRIGGERS.items():
+        table = event.rsplit(" ON ", 1)[1]
+        op.execute(f"DROP TRIGGER IF EXISTS {name} ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {name}()")
+    op.drop_index('ix_todos_description_trgm', table_name='todos')
+    op.drop_index('ix_todos_title_trgm', table_name='todos')
@@ -0,0 +1,75 @@
+import hashlib
+import time
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from ..core.database import get_db, get_async_db
+from ..core.auth_cache import Principal
+from ..repositories.version_repository import DataVersionRepository, AsyncDataVersionRepository
+from .deps import get_current_user, get_current_user_async
+
+# Responses that embed "now" (is_overdue, /todos/today) change without a write;
+# their ETags also roll over every TIME_BUCKET_SECONDS.
+TIME_BUCKET_SECONDS = 60
+
+
+def make_etag(request: Request, owner_id: int, version: int, time_sensitive: bool) -> str:
+    """Strong ETag from the owner's data version plus the request's path and query."""
+    parts = [str(owner_id), request.url.path]
+    parts += [f"{k}={v}" for k, v in sorted(request.query_params.multi_items())]
+    if time_sensitive:
+        parts.append(str(int(time.time() // TIME_BUCKET_SECONDS)))
+    digest = hashlib.sha1("\n".join(parts).encode()).hexdigest()[:16]
+    return f'"v{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match uses the weak comparison: a W/ prefix is ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (c.strip() for c in if_none_match.split(","))
+    return any(c.removeprefix("W/") == etag for c in candidates)
+
+
+def _respond(request: Request, response: Response, etag: str) -> None:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        # Starlette renders 304 without a body
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+
+
+def conditional_get(time_sensitive: bool = True):
+    """Dependency: answer 304 when the client's ETag is current, else tag the response.
+
+    Only the data_versions row is read, so a cache hit never touches the
+    todo tables. Shares the request's DB session with the endpoint.
+    """
+    def dependency(
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+        current_user: Principal = Depends(get_current_user),
+    ) -> None:
+        version = DataVersionRepository(db).get(current_user.id)
+        _respond(request, response, make_etag(request, current_user.id, version, time_sensitive))
+
+    return dependency
+
+
+def conditional_get_async(time_sensitive: bool = True):
+    """AsyncSession variant of conditional_get (settings.DB_ASYNC)."""
+    async def dependency(
+        request: Request,
+        response: Response,
+        db=Depends(get_async_db),
+        current_user: Principal = Depends(get_current_user_async),
+    ) -> None:
+        version = await AsyncDataVersionRepository(db).get(current_user.id)
+        _respond(request, response, make_etag(request, current_user.id, version, time_sensitive))
+
+    return dependency
@@ -1,36 +1,103 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from ..core.database import get_db
+from ..core.database import SessionLocal, get_db, get_async_db
 from ..core.security import decode_access_token
+from ..core.auth_cache import Principal, principal_cache
 from ..models.user import User
 
 # tokenUrl phải khớp với path đầy đủ của endpoint login
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login", auto_error=False)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    """Decode JWT token and return the authenticated User object."""
-    credentials_exception = HTTPException(
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Không thể xác thực. Vui lòng đăng nhập lại.",
         headers={"WWW-Authenticate": "Bearer"},
     )
 
+
+def principal_from_token(token: str, db: Session) -> Principal:
+    """Decode a JWT and return its user's Principal (raises 401).
+
+    Tokens seen before are served from principal_cache without re-verifying
+    the signature or querying the users table.
+    """
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    credentials_exception = _credentials_exception()
+
     payload = decode_access_token(token)
     if payload is None:
         raise credentials_exception
 
+    # Our tokens always carry exp; one without it would never expire
     user_id: int = payload.get("user_id")
-    if user_id is None:
+    if user_id is None or payload.get("exp") is None:
         raise credentials_exception
 
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise credentials_exception
 
-    return user
+    principal = Principal.from_user(user)
+    principal_cache.put(token, principal, payload["exp"])
+    return principal
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> Principal:
+    """Decode JWT token and return the authenticated user's Principal."""
+    return principal_from_token(token, db)
+
+
+def stream_principal(token: Optional[str]) -> Principal:
+    """Authenticate a long-lived connection with a short-lived session, so no
+    pooled connection is held for the life of the stream."""
+    if not token:
+        raise _credentials_exception()
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    with SessionLocal() as db:
+        return principal_from_token(token, db)
+
+
+def get_stream_user(
+    token: Optional[str] = Depends(optional_oauth2_scheme),
+    access_token: Optional[str] = Query(None, description="For clients that cannot send headers (EventSource)"),
+) -> Principal:
+    """Like get_current_user, also accepting the token as ?access_token=."""
+    return stream_principal(token or access_token)
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    db=Depends(get_async_db),
+) -> Principal:
+    """AsyncSession variant of get_current_user (settings.DB_ASYNC)."""
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+
+    payload = decode_access_token(token)
+    if payload is None or payload.get("user_id") is None or payload.get("exp") is None:
+        raise _credentials_exception()
+
+    user = (await db.execute(select(User).filter(User.id == payload["user_id"]))).scalars().first()
+    if user is None:
+        raise _credentials_exception()
+
+    principal = Principal.from_user(user)
+    principal_cache.put(token, principal, payload["exp"])
+    return principal
@@ -0,0 +1,30 @@
+from fastapi import Depends, Request
+
+from ..core.auth_cache import Principal
+from ..core.rate_limit import read_limiter, write_limiter, write_gate
+from .deps import get_current_user
+
+_READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def rate_limited(user_dependency=get_current_user):
+    """Router dependency: the user's read or write budget, then a write slot.
+
+    Mount with Depends(..., scope="function") so the slot is released when
+    the endpoint returns, before the response is sent. Runs ahead of the
+    route's own dependencies, so a refused request never reaches the
+    database. `user_dependency` is get_current_user_async on the async stack.
+    """
+    async def dependency(request: Request, current_user: Principal = Depends(user_dependency)):
+        if request.method in _READ_METHODS:
+            read_limiter.check(current_user.id)
+            yield
+            return
+        write_limiter.check(current_user.id)
+        await write_gate.acquire()
+        try:
+            yield
+        finally:
+            write_gate.release()
+
+    return dependency
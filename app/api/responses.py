@@ -0,0 +1,18 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic_core import to_json
+
+
+def json_response(content: Any, response: Response) -> Response:
+    """Encode already-shaped response data straight to JSON bytes.
+
+    For list endpoints whose services build response dicts from trusted
+    database rows: pydantic-core's encoder replaces FastAPI's response_model
+    re-validation + jsonable_encoder + json.dumps. Headers set on the
+    injected `response` (ETag, ...) are kept; the route's response_model
+    still documents the schema.
+    """
+    rendered = Response(to_json(content), media_type="application/json")
+    rendered.headers.raw.extend(response.headers.raw)
+    return rendered
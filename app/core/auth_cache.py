@@ -0,0 +1,107 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Set
+
+from sqlalchemy import event
+
+from .config import settings
+from ..models.user import User
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Lightweight, session-independent view of an authenticated user."""
+    id: int
+    email: str
+    is_active: bool
+    created_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=user.is_active,
+            created_at=user.created_at,
+        )
+
+
+class PrincipalCache:
+    """Bounded LRU of verified token digests -> Principal.
+
+    An entry lives until the token's `exp` (capped by `ttl_seconds`), so a hit
+    can skip both the JWT signature check and the users-table lookup. Raw
+    tokens are never stored, only their SHA-256 digest.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: int):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, tuple[Principal, float]]" = OrderedDict()
+        self._by_user: Dict[int, Set[bytes]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Principal]:
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, token: str, principal: Principal, exp: float) -> None:
+        if self.max_size <= 0:
+            return
+        key = self._digest(token)
+        expires_at = min(exp, time.time() + self.ttl_seconds)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (principal, expires_at)
+            self._by_user.setdefault(principal.id, set()).add(key)
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            for key in self._by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _remove(self, key: bytes) -> None:
+        principal, _ = self._entries.pop(key)
+        keys = self._by_user.get(principal.id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_user[principal.id]
+
+
+principal_cache = PrincipalCache(
+    max_size=settings.AUTH_CACHE_MAX_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+
+# Any change to a user row drops that user's cached principals
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_principals(mapper, connection, target: User) -> None:
+    principal_cache.invalidate_user(target.id)
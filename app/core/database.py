@@ -1,14 +1,81 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
-# Persistent SQLite database at ./todo_app.db
-SQLALCHEMY_DATABASE_URL = "sqlite:///./todo_app.db"
+from .config import settings
+from .storage import resolve_pragmas, install_pragmas
+from .metrics import install_sql_metrics, TimedQueuePool, TimedAsyncQueuePool
 
-# Engine setup
+# Async driver used when DATABASE_ASYNC_URL is not set
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_url(url: str) -> str:
+    parsed = make_url(url)
+    return parsed.set(drivername=ASYNC_DRIVERS[parsed.get_backend_name()]).render_as_string(hide_password=False)
+
+
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+ASYNC_SQLALCHEMY_DATABASE_URL = settings.DATABASE_ASYNC_URL or async_url(SQLALCHEMY_DATABASE_URL)
+BACKEND = make_url(SQLALCHEMY_DATABASE_URL).get_backend_name()  # "sqlite" | "postgresql"
+IS_SQLITE = BACKEND == "sqlite"
+
+_POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+)
+
+# Engine setup (pool sized explicitly, SQLite pragmas from the storage profile)
 engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
+    SQLALCHEMY_DATABASE_URL,
+    **({"connect_args": {"check_same_thread": False}} if IS_SQLITE else {}),
+    **_POOL_OPTIONS,
+    **({"poolclass": TimedQueuePool} if settings.METRICS_ENABLED else {}),
 )
+if IS_SQLITE:
+    install_pragmas(engine, resolve_pragmas(settings))
+if settings.METRICS_ENABLED:
+    install_sql_metrics(engine)
+
+
+def create_writer_engine():
+    """Single-connection engine for the group-commit writer (core/group_commit.py).
+
+    pysqlite's implicit BEGIN breaks SAVEPOINTs (releasing the first one
+    commits), so on SQLite the driver runs in autocommit mode and each
+    transaction is opened with BEGIN IMMEDIATE, taking the write lock up front.
+    """
+    writer = create_engine(
+        SQLALCHEMY_DATABASE_URL,
+        **({"connect_args": {"check_same_thread": False}} if IS_SQLITE else {}),
+        pool_size=1,
+        max_overflow=0,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    if IS_SQLITE:
+        install_pragmas(writer, resolve_pragmas(settings))
+
+        @event.listens_for(writer, "connect")
+        def _autocommit(dbapi_connection, connection_record):
+            dbapi_connection.isolation_level = None
+
+        @event.listens_for(writer, "begin")
+        def _begin(conn):
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+    if settings.METRICS_ENABLED:
+        install_sql_metrics(writer)
+    return writer
+
+
+def upsert(table):
+    """INSERT supporting on_conflict_do_nothing/do_update on the configured backend."""
+    return (sqlite.insert if IS_SQLITE else postgresql.insert)(table)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -16,6 +83,26 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Base model for ORM
 Base = declarative_base()
 
+# Async engine (settings.DB_ASYNC); greenlet and aiosqlite/asyncpg are only needed when enabled
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        ASYNC_SQLALCHEMY_DATABASE_URL,
+        **_POOL_OPTIONS,
+        **({"poolclass": TimedAsyncQueuePool} if settings.METRICS_ENABLED else {}),
+    )
+    if IS_SQLITE:
+        install_pragmas(async_engine.sync_engine, resolve_pragmas(settings))
+    if settings.METRICS_ENABLED:
+        install_sql_metrics(async_engine.sync_engine)
+    # expire_on_commit=False: expired attributes would need an implicit (sync) reload
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
 # Dependency to provide a database session
 def get_db():
     db = SessionLocal()
@@ -23,3 +110,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+# Dependency to provide an async database session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
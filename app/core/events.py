@@ -0,0 +1,128 @@
+import asyncio
+import itertools
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Optional, Set
+
+from pydantic_core import to_json
+
+from .config import settings
+from .metrics import EVENT_SUBSCRIBERS, EVENTS_PUBLISHED, EVENT_SUBSCRIBERS_EVICTED
+
+logger = logging.getLogger("app.events")
+
+# Put in a subscriber's queue in place of its backlog when it falls behind
+EVICTED = object()
+
+
+class Subscription:
+    """One connected client: a bounded queue of pre-encoded events, owned by
+    the event loop that serves the connection."""
+
+    __slots__ = ("owner_id", "queue", "loop", "evicted")
+
+    def __init__(self, owner_id: int, maxsize: int):
+        self.owner_id = owner_id
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.loop = asyncio.get_running_loop()
+        self.evicted = False
+
+    def offer(self, event) -> bool:
+        """Runs on self.loop. Returns True if this event got the subscriber evicted."""
+        if self.evicted:
+            return False
+        try:
+            self.queue.put_nowait(event)
+            return False
+        except asyncio.QueueFull:
+            # Slow consumer: drop its backlog and tell it to reconnect and refetch
+            self.evicted = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(EVICTED)
+            return True
+
+
+class ChangeEvent:
+    """An event encoded once, shared by every subscriber of the owner."""
+
+    __slots__ = ("id", "type", "data")
+
+    def __init__(self, event_id: int, event_type: str, data: str):
+        self.id = event_id
+        self.type = event_type
+        self.data = data
+
+    def sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {self.data}\n\n"
+
+    def json(self) -> str:
+        return f'{{"id":{self.id},"type":"{self.type}","data":{self.data}}}'
+
+
+class ChangeBroker:
+    """In-process fan-out of per-owner change events.
+
+    publish() may be called from any thread (sync routes run in the
+    threadpool); delivery is handed to each subscriber's event loop.
+    An idle subscriber is just a queue and a parked coroutine. Events are
+    not persisted: a client that reconnects (or is evicted) refetches.
+    """
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self, owner_id: int) -> Subscription:
+        subscription = Subscription(owner_id, self.queue_size)
+        with self._lock:
+            self._subscribers[owner_id].add(subscription)
+        EVENT_SUBSCRIBERS.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.owner_id)
+            if subscribers is None or subscription not in subscribers:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.owner_id]
+        EVENT_SUBSCRIBERS.dec()
+
+    def subscriber_count(self, owner_id: Optional[int] = None) -> int:
+        with self._lock:
+            if owner_id is not None:
+                return len(self._subscribers.get(owner_id, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+    def publish(self, owner_id: int, event_type: str, data: Any = None) -> None:
+        """Send an event to the owner's subscribers. Call after the commit."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(owner_id, ()))
+        if not subscribers:
+            return
+        event = ChangeEvent(next(self._ids), event_type, to_json(data).decode())
+        EVENTS_PUBLISHED.inc((event_type,))
+        by_loop = defaultdict(list)
+        for subscription in subscribers:
+            by_loop[subscription.loop].append(subscription)
+        for loop, group in by_loop.items():
+            try:
+                loop.call_soon_threadsafe(self._deliver, group, event)
+            except RuntimeError:  # Loop already closed (shutdown)
+                for subscription in group:
+                    self.unsubscribe(subscription)
+
+    def _deliver(self, subscriptions, event: ChangeEvent) -> None:
+        for subscription in subscriptions:
+            if subscription.offer(event):
+                EVENT_SUBSCRIBERS_EVICTED.inc()
+                logger.info("evicted slow event subscriber owner=%s", subscription.owner_id)
+                self.unsubscribe(subscription)
+
+
+change_broker = ChangeBroker(settings.EVENTS_QUEUE_SIZE)
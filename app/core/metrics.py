@@ -0,0 +1,259 @@
+"""In-process Prometheus metrics: HTTP latency, SQL statements, pool waits.
+
+Everything is kept in plain dicts behind one lock per metric, so recording
+costs a couple of dict lookups; /metrics renders the text exposition format.
+"""
+import logging
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool, AsyncAdaptedQueuePool
+
+from .config import settings
+
+slow_query_logger = logging.getLogger("app.sql.slow")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self._header() + [
+            f"{self.name}{_labels(self.labelnames, k)} {v}" for k, v in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, labels: Tuple[str, ...] = (), amount: float = 1.0) -> None:
+        self.inc(labels, -amount)
+
+    def set(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, labels: Tuple[str, ...] = ()) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            row = self._values.get(labels)
+            if row is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._values.items()]
+        lines = self._header()
+        for labels, row in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, row):
+                cumulative += count
+                le = _labels(self.labelnames, labels, 'le="%s"' % bound)
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            cumulative += row[len(self.buckets)]
+            le = _labels(self.labelnames, labels, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {row[-1]}")
+        return lines
+
+
+REGISTRY: List[_Metric] = []
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ─── Metrics ───
+
+HTTP_REQUESTS = Counter("http_requests_total", "HTTP requests handled.", ("method", "route", "status"))
+HTTP_LATENCY = Histogram("http_request_duration_seconds", "HTTP request latency.", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+SQL_STATEMENTS = Counter("sql_statements_total", "SQL statements executed, by HTTP route.", ("route",))
+SQL_SECONDS = Counter("sql_statement_seconds_total", "Time spent executing SQL, by HTTP route.", ("route",))
+SQL_LATENCY = Histogram("sql_statement_duration_seconds", "SQL statement latency.")
+SLOW_QUERIES = Counter("sql_slow_queries_total", "Statements slower than SLOW_QUERY_THRESHOLD_MS.", ("route",))
+PASSWORD_HASH_PENDING = Gauge("password_hash_pending", "Password hash/verify jobs queued or running.")
+PASSWORD_HASH_REJECTED = Counter("password_hash_rejected_total", "Password jobs refused by admission control.")
+PASSWORD_HASH_LATENCY = Histogram("password_hash_duration_seconds", "Password job latency including queueing.", ("op",))
+EVENT_SUBSCRIBERS = Gauge("change_feed_subscribers", "Open /todos/stream and /todos/ws connections.")
+EVENTS_PUBLISHED = Counter("change_feed_events_total", "Change events published to at least one subscriber.", ("type",))
+EVENT_SUBSCRIBERS_EVICTED = Counter("change_feed_evictions_total", "Subscribers dropped for falling behind.")
+TODOS_PURGED = Counter("todos_purged_total", "Soft-deleted todos hard-deleted by the purger.")
+PURGE_BATCH_LATENCY = Histogram("todo_purge_batch_duration_seconds", "Purger batch transaction time.")
+PAGES_VACUUMED = Counter("sqlite_pages_vacuumed_total", "Free pages returned by PRAGMA incremental_vacuum.")
+POOL_WAIT = Histogram("db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection.")
+RATE_LIMIT_DECISIONS = Counter("rate_limit_decisions_total", "Per-user limiter decisions.", ("budget", "outcome"))
+RATE_LIMIT_DECISION_LATENCY = Histogram(
+    "rate_limit_decision_duration_seconds", "Time to take a per-user limiter decision.",
+    buckets=(1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 1e-3),
+)
+WRITES_IN_FLIGHT = Gauge("write_requests_in_flight", "Write requests holding a write slot.")
+WRITES_QUEUED = Gauge("write_requests_queued", "Write requests waiting for a write slot.")
+WRITES_REJECTED = Counter("write_requests_rejected_total", "Write requests refused by the write cap.", ("reason",))
+WRITE_QUEUE_WAIT = Histogram("write_queue_wait_seconds", "Time write requests waited for a slot.")
+GROUP_COMMIT_BATCH_SIZE = Histogram(
+    "group_commit_batch_units", "Units of work committed per group-commit transaction.",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+GROUP_COMMIT_UNITS = Counter("group_commit_units_total", "Group-commit units of work, by outcome.", ("outcome",))
+GROUP_COMMIT_LATENCY = Histogram("group_commit_unit_duration_seconds", "Unit of work latency from submit to result (queueing included).")
+
+
+# ─── Per-request SQL attribution ───
+
+class _RequestStats:
+    __slots__ = ("statements", "seconds", "slow")
+
+    def __init__(self):
+        self.statements = 0
+        self.seconds = 0.0
+        self.slow = 0
+
+
+# Shared (mutable) across the request's task and its threadpool calls
+_request_stats: ContextVar[Optional[_RequestStats]] = ContextVar("request_stats", default=None)
+_NO_ROUTE = "-"
+
+
+def install_sql_metrics(sync_engine) -> None:
+    """Time every cursor execution on `sync_engine`."""
+    threshold = settings.SLOW_QUERY_THRESHOLD_MS / 1000.0
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        SQL_LATENCY.observe(elapsed)
+        stats = _request_stats.get()
+        if stats is None:
+            SQL_STATEMENTS.inc((_NO_ROUTE,))
+            SQL_SECONDS.inc((_NO_ROUTE,), elapsed)
+        else:
+            stats.statements += 1
+            stats.seconds += elapsed
+        if elapsed >= threshold:
+            if stats is not None:
+                stats.slow += 1
+            else:
+                SLOW_QUERIES.inc((_NO_ROUTE,))
+            slow_query_logger.warning("slow query (%.1f ms): %s", elapsed * 1000, " ".join(statement.split())[:500])
+
+
+class _TimedPoolMixin:
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_WAIT.observe(time.perf_counter() - start)
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    """QueuePool that records checkout wait time in POOL_WAIT."""
+
+
+class TimedAsyncQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait time in POOL_WAIT."""
+
+
+# ─── ASGI middleware ───
+
+class MetricsMiddleware:
+    """Records latency, status and SQL usage per route template (not raw path)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = ["500"]
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        stats = _RequestStats()
+        token = _request_stats.set(stats)
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            route = scope.get("route")
+            label = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.inc((method, label, status[0]))
+            HTTP_LATENCY.observe(elapsed, (method, label))
+            if stats.statements:
+                SQL_STATEMENTS.inc((label,), stats.statements)
+                SQL_SECONDS.inc((label,), stats.seconds)
+            if stats.slow:
+                SLOW_QUERIES.inc((label,), stats.slow)
@@ -0,0 +1,109 @@
+"""Bounded worker pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (~250 ms per call). Running it inline on the
+request threadpool lets a login burst starve every other route, so jobs go
+to a separate process pool and are refused (503) once too many are pending.
+"""
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, wait
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from .config import settings
+from .metrics import PASSWORD_HASH_PENDING, PASSWORD_HASH_REJECTED, PASSWORD_HASH_LATENCY
+from .security import get_password_hash, verify_and_update_password
+
+
+def _init_worker(niceness: int) -> None:
+    # Lower CPU priority so request handling wins when cores are scarce
+    if niceness and hasattr(os, "nice"):
+        os.nice(niceness)
+
+
+def _warm_up() -> None:
+    # Unpickling this job imports this module, and with it passlib and bcrypt
+    pass
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full; surfaced as 503 + Retry-After."""
+
+
+class PasswordHasher:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> Optional[Executor]:
+        if self.workers <= 0:
+            return None
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a process that already runs threads is unsafe
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(settings.PASSWORD_HASH_NICE,),
+                )
+            return self._executor
+
+    def start(self, timeout: float = 30.0) -> None:
+        """Start every worker up front so the first logins don't pay for worker startup.
+
+        The pool spawns a process per job while none is idle, so one job per
+        worker, submitted together, starts them all; waits until they ran.
+        """
+        executor = self._get_executor()
+        if executor is not None:
+            wait([executor.submit(_warm_up) for _ in range(self.workers)], timeout=timeout)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _submit(self, op: str, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                PASSWORD_HASH_REJECTED.inc()
+                raise PasswordHasherBusy()
+            self._pending += 1
+        PASSWORD_HASH_PENDING.inc()
+        start = time.perf_counter()
+        try:
+            executor = self._get_executor()
+            if executor is None:
+                return await run_in_threadpool(fn, *args)
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+            PASSWORD_HASH_PENDING.dec()
+            PASSWORD_HASH_LATENCY.observe(time.perf_counter() - start, (op,))
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> str:
+        return await self._submit("hash", get_password_hash, password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+        """(valid, new_hash). new_hash is set when the stored hash should be upgraded."""
+        return await self._submit("verify", verify_and_update_password, password, hashed_password)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,161 @@
+"""Admission control: per-user token buckets and a cap on concurrent writes.
+
+SQLite has a single writer, so one client looping on POST /todos can push
+every other user's writes into busy-waits. Each user gets a read and a
+write budget (429 once spent), and write requests beyond
+WRITE_MAX_CONCURRENCY wait briefly in a bounded queue, then get 503,
+instead of piling up on the database lock until they time out.
+
+Budgets live in this process only: with several workers each enforces its own.
+"""
+import asyncio
+import math
+import threading
+import time
+from collections import OrderedDict, deque
+
+from .config import settings
+from .metrics import (
+    RATE_LIMIT_DECISIONS, RATE_LIMIT_DECISION_LATENCY,
+    WRITES_IN_FLIGHT, WRITES_QUEUED, WRITES_REJECTED, WRITE_QUEUE_WAIT,
+)
+
+
+class RateLimited(Exception):
+    """The user's budget is spent; surfaced as 429 + Retry-After."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(retry_after)
+        self.retry_after = max(1, math.ceil(retry_after))
+
+
+class WriteCapacityExceeded(Exception):
+    """No write slot freed up in time; surfaced as 503 + Retry-After."""
+
+
+class TokenBucketLimiter:
+    """Bounded LRU of user id -> (tokens, last refill time).
+
+    A bucket holds up to `burst` tokens and refills at `rate` per second;
+    each request takes one. Users not seen for a while are evicted, and
+    start again with a full bucket.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_keys: int):
+        self.name = name
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[int, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: int) -> float:
+        """Take a token: 0.0 if allowed, else the seconds until one is available."""
+        if self.rate <= 0:
+            return 0.0
+        started = time.perf_counter()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._buckets.get(key)
+            if entry is None:
+                tokens = float(self.burst)
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                tokens = min(self.burst, entry[0] + (now - entry[1]) * self.rate)
+                self._buckets.move_to_end(key)
+            wait = 0.0 if tokens >= 1 else (1 - tokens) / self.rate
+            self._buckets[key] = (tokens - 1 if wait == 0.0 else tokens, now)
+        RATE_LIMIT_DECISIONS.inc((self.name, "allowed" if wait == 0.0 else "limited"))
+        RATE_LIMIT_DECISION_LATENCY.observe(time.perf_counter() - started)
+        return wait
+
+    def check(self, key: int) -> None:
+        """acquire(), raising RateLimited when over budget."""
+        wait = self.acquire(key)
+        if wait:
+            raise RateLimited(wait)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+
+class WriteGate:
+    """At most `max_concurrent` write requests at once.
+
+    Beyond that, up to `max_queue` requests wait (FIFO) at most `timeout`
+    seconds for a slot; anything else is refused right away. Used from
+    the event loop only (async dependency), so no lock is needed.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, timeout: float):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self._in_flight = 0
+        self._waiters: "deque[asyncio.Future]" = deque()
+
+    async def acquire(self) -> None:
+        if self.max_concurrent <= 0:
+            return
+        if self._in_flight < self.max_concurrent and not self._waiters:
+            self._in_flight += 1
+            WRITES_IN_FLIGHT.inc()
+            return
+        if len(self._waiters) >= self.max_queue or self.timeout <= 0:
+            WRITES_REJECTED.inc(("queue_full",))
+            raise WriteCapacityExceeded()
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        WRITES_QUEUED.inc()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except BaseException as exc:
+            timed_out = isinstance(exc, asyncio.TimeoutError)
+            if waiter.done():
+                # release() handed the slot over just as the wait ended
+                if timed_out:
+                    return
+                self.release()  # cancelled (client gone): pass the slot on
+                raise
+            waiter.cancel()
+            self._waiters.remove(waiter)
+            if timed_out:
+                WRITES_REJECTED.inc(("timeout",))
+                raise WriteCapacityExceeded() from None
+            raise
+        finally:
+            WRITES_QUEUED.dec()
+            WRITE_QUEUE_WAIT.observe(time.perf_counter() - started)
+
+    def release(self) -> None:
+        """Hand the slot to the oldest waiter, or free it."""
+        if self.max_concurrent <= 0:
+            return
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._in_flight -= 1
+        WRITES_IN_FLIGHT.dec()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+
+read_limiter = TokenBucketLimiter(
+    "read", settings.RATE_LIMIT_READ_PER_SECOND, settings.RATE_LIMIT_READ_BURST, settings.RATE_LIMIT_MAX_USERS
+)
+write_limiter = TokenBucketLimiter(
+    "write", settings.RATE_LIMIT_WRITE_PER_SECOND, settings.RATE_LIMIT_WRITE_BURST, settings.RATE_LIMIT_MAX_USERS
+)
+write_gate = WriteGate(
+    max_concurrent=settings.WRITE_MAX_CONCURRENCY,
+    max_queue=settings.WRITE_QUEUE_MAX,
+    timeout=settings.WRITE_QUEUE_TIMEOUT_SECONDS,
+)
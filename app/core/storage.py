@@ -0,0 +1,103 @@
+"""SQLite storage profile: pragmas applied to every pooled connection."""
+import logging
+from typing import Dict, Optional
+
+from sqlalchemy import event
+
+from .config import Settings
+
+logger = logging.getLogger(__name__)
+
+# Named presets; any SQLITE_* setting that is not None overrides its preset value.
+#   safe     - rollback journal, fsync on every commit (SQLite defaults)
+#   balanced - WAL: readers never block on the writer, one fsync per checkpoint
+#   fast     - WAL without fsync; a power loss can drop the latest commits
+STORAGE_PROFILES: Dict[str, Dict[str, object]] = {
+    "safe": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "mmap_size": 0,
+        "cache_size": -2000,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+    },
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": 256 * 1024 * 1024,
+        "cache_size": -64000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "mmap_size": 1024 * 1024 * 1024,
+        "cache_size": -256000,
+        "temp_store": "MEMORY",
+        "busy_timeout": 10000,
+    },
+}
+
+# Pragmas read back by storage_report()
+_REPORTED = ("journal_mode", "synchronous", "mmap_size", "cache_size", "temp_store", "busy_timeout", "foreign_keys", "auto_vacuum")
+
+
+def resolve_pragmas(settings: Settings, profile: Optional[str] = None) -> Dict[str, object]:
+    """Pragma values for `profile` (default: settings.SQLITE_PROFILE) plus explicit overrides."""
+    name = profile or settings.SQLITE_PROFILE
+    if name not in STORAGE_PROFILES:
+        raise ValueError(f"Unknown SQLITE_PROFILE {name!r}, expected one of {sorted(STORAGE_PROFILES)}")
+    pragmas = dict(STORAGE_PROFILES[name])
+    overrides = {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+    }
+    pragmas.update({k: v for k, v in overrides.items() if v is not None})
+    pragmas["foreign_keys"] = "ON" if settings.SQLITE_FOREIGN_KEYS else "OFF"
+    return pragmas
+
+
+def install_pragmas(sync_engine, pragmas: Dict[str, object]) -> None:
+    """Apply `pragmas` on each new DBAPI connection of `sync_engine`."""
+    # journal_mode is persistent and needs an exclusive lock: set it first
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    @event.listens_for(sync_engine, "connect")
+    def _apply(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for statement in statements:
+                cursor.execute(statement)
+        finally:
+            cursor.close()
+
+
+def storage_report(sync_engine) -> Dict[str, object]:
+    """Pragma values actually in effect on a pooled connection (SQLite), plus pool sizing."""
+    report: Dict[str, object] = {}
+    if sync_engine.dialect.name == "sqlite":
+        with sync_engine.connect() as conn:
+            report.update(
+                (name, conn.exec_driver_sql(f"PRAGMA {name}").scalar())
+                for name in _REPORTED
+            )
+    pool = sync_engine.pool
+    report["pool"] = type(pool).__name__
+    if hasattr(pool, "size"):
+        report["pool_size"] = pool.size()
+        report["max_overflow"] = getattr(pool, "_max_overflow", None)
+        report["pool_timeout"] = getattr(pool, "_timeout", None)
+    return report
+
+
+def log_storage_report(sync_engine, profile: str) -> None:
+    report = ", ".join(f"{k}={v}" for k, v in storage_report(sync_engine).items())
+    if sync_engine.dialect.name == "sqlite":
+        logger.info("SQLite storage profile %r: %s", profile, report)
+    else:
+        logger.info("%s storage: %s", sync_engine.dialect.name, report)
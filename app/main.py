@@ -1,12 +1,41 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, JSONResponse
 from .core.config import settings
-from .routers import todos, auth, tags
+from .core.database import engine
+from .core.storage import log_storage_report
+from .core.metrics import MetricsMiddleware, render_metrics
+from .core.group_commit import group_writer
+from .core.password_hasher import password_hasher, PasswordHasherBusy
+from .core.rate_limit import RateLimited, WriteCapacityExceeded
+from .api.deps import get_current_user, get_current_user_async
+from .api.limits import rate_limited
+from .services.todo_purger import todo_purger
+from .routers import todos, auth, tags, todos_bulk, todos_transfer, todos_events, todos_stats
+
+if settings.DB_ASYNC:
+    # Same API on async def routes + AsyncSession
+    from .routers import async_todos as todos, async_auth as auth, async_tags as tags
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    log_storage_report(engine, settings.SQLITE_PROFILE)
+    password_hasher.start()
+    todo_purger.start()
+    group_writer.start()
+    yield
+    group_writer.shutdown()
+    todo_purger.shutdown()
+    password_hasher.shutdown()
+
 
 app = FastAPI(
     title=settings.APP_NAME,
     version=settings.API_VERSION,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan,
 )
 
 # CORS Middleware
@@ -18,16 +47,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Hệ thống đang bận, vui lòng thử lại sau"},
+        headers={"Retry-After": "1"},
+    )
+
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request: Request, exc: RateLimited):
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Bạn gửi quá nhiều yêu cầu, vui lòng thử lại sau"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+@app.exception_handler(WriteCapacityExceeded)
+async def write_capacity_handler(request: Request, exc: WriteCapacityExceeded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Hệ thống đang bận, vui lòng thử lại sau"},
+        headers={"Retry-After": "1"},
+    )
+
+# Per-user budgets + write cap (core/rate_limit.py) on the /todos and /tags
+# routers; the extra /todos routers always run on the sync stack
+limits = [Depends(rate_limited(get_current_user), scope="function")]
+stack_limits = [Depends(rate_limited(get_current_user_async), scope="function")] if settings.DB_ASYNC else limits
+
 # Include Routers with Prefix /api/v1
 api_prefix = f"/api/{settings.API_VERSION}"
 app.include_router(auth.router, prefix=api_prefix)
-app.include_router(todos.router, prefix=api_prefix, tags=["todos"])
-app.include_router(tags.router, prefix=api_prefix)
+app.include_router(todos_bulk.router, prefix=api_prefix, tags=["todos"], dependencies=limits)
+app.include_router(todos_transfer.router, prefix=api_prefix, tags=["todos"], dependencies=limits)
+app.include_router(todos_events.router, prefix=api_prefix, tags=["todos"])
+app.include_router(todos_stats.router, prefix=api_prefix, tags=["todos"], dependencies=limits)
+app.include_router(todos.router, prefix=api_prefix, tags=["todos"], dependencies=stack_limits)
+app.include_router(tags.router, prefix=api_prefix, dependencies=stack_limits)
 
 @app.get("/health")
 def health_check():
     return {"status": "ok", "version": settings.API_VERSION}
 
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def metrics():
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 def root():
     return {"message": "Welcome to Todo API. Documentation at /docs"}
@@ -1,5 +1,7 @@
 # Import all models here so Alembic can detect them
 from ..core.database import Base
 from .user import User
-from .todo import Todo
+from .todo import Todo, todos_fts
 from .tag import Tag, todo_tags
+from .todo_counter import TodoCounter
+from .data_version import DataVersion
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from ..core.database import Base
+
+
+class DataVersion(Base):
+    """Monotonic per-owner version of todo/tag data, bumped by every repository write.
+
+    Conditional GETs derive their ETag from it, so an unchanged owner is
+    answered with 304 without reading the todo tables.
+    """
+    __tablename__ = "data_versions"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
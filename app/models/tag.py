@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from ..core.database import Base
 
@@ -8,11 +8,17 @@ todo_tags = Table(
     Base.metadata,
     Column("todo_id", Integer, ForeignKey("todos.id", ondelete="CASCADE"), primary_key=True),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    # The primary key covers todo -> tags; this covers tag -> todos
+    Index("ix_todo_tags_tag_todo", "tag_id", "todo_id"),
 )
 
 
 class Tag(Base):
     __tablename__ = "tags"
+    __table_args__ = (
+        # One tag per name and owner; tag_names upserts conflict on it
+        Index("uq_tags_owner_name", "owner_id", "name", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(50), nullable=False)
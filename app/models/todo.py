@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import table, column
 from datetime import datetime
 from ..core.database import Base
 from .tag import todo_tags
@@ -7,6 +8,16 @@ from .tag import todo_tags
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        # Owner-scoped query shapes used by TodoRepository
+        Index("ix_todos_owner_created", "owner_id", "created_at", "id"),
+        Index("ix_todos_owner_done_created", "owner_id", "is_done", "created_at", "id"),
+        Index("ix_todos_owner_done_due", "owner_id", "is_done", "due_date"),
+        Index("ix_todos_owner_due", "owner_id", "due_date"),
+        # TodoPurger scan (soft-deleted rows only)
+        Index("ix_todos_deleted", "deleted_at", sqlite_where=text("deleted_at IS NOT NULL"),
+              postgresql_where=text("deleted_at IS NOT NULL")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
@@ -16,11 +27,29 @@ class Todo(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+    # Soft delete: set by deletes, hidden from every TodoRepository read and
+    # hard-deleted later by the background purger (services/todo_purger.py)
+    deleted_at = Column(DateTime, nullable=True)
+
     # Level 5: Data Ownership
     owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
 
     # Level 6: Deadline
     due_date = Column(DateTime, nullable=True)
 
-    # Level 6: Tags (Many-to-Many)
-    tags = relationship("Tag", secondary=todo_tags, back_populates="todos", lazy="joined")
+    # Level 6: Tags (Many-to-Many). selectin by default; TodoRepository picks
+    # the loader per query (see _load_tags)
+    tags = relationship("Tag", secondary=todo_tags, back_populates="todos", lazy="selectin")
+
+
+# FTS5 index over title/description, plus owner_id so a MATCH can be scoped
+# to one owner (external content table, kept in sync by triggers created in
+# migration b7d3e9a1c452). Not part of Base.metadata.
+# SQLite only: on PostgreSQL, q is matched with ILIKE served by pg_trgm
+# indexes on title/description (migration f5a1c8d3b260).
+todos_fts = table(
+    "todos_fts",
+    column("rowid", Integer),
+    column("todos_fts"),  # hidden column, left operand of MATCH
+    column("rank"),  # bm25() score, lower is more relevant
+)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from ..core.database import Base
+
+# tag_id value of the owner-wide row (real tag ids start at 1)
+ALL_TAGS = 0
+
+
+class TodoCounter(Base):
+    """Per-owner todo totals, per tag and overall (tag_id == ALL_TAGS).
+
+    Maintained by triggers on todos / todo_tags / tags (migration
+    3f7d9b2a6c18), so every write path updates them in its own transaction.
+    """
+    __tablename__ = "todo_counters"
+
+    owner_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    tag_id = Column(Integer, primary_key=True, default=ALL_TAGS)
+    total = Column(Integer, nullable=False, default=0)
+    done = Column(Integer, nullable=False, default=0)
+
@@ -0,0 +1,112 @@
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from fastapi import Depends
+
+from ..models.tag import Tag
+from ..schemas.tag import TagCreate
+from ..core.database import get_async_db
+from ..core.events import change_broker
+from .tag_repository import _tag_event, tag_name_cache, upsert_names_stmt, names_query
+from .version_repository import AsyncDataVersionRepository
+
+
+class AsyncTagRepository:
+    """AsyncSession counterpart of TagRepository (settings.DB_ASYNC)."""
+
+    def __init__(self, db):
+        self.db = db
+        self.versions = AsyncDataVersionRepository(db)
+
+    async def get_all(self, owner_id: int) -> List[Tag]:
+        result = await self.db.execute(
+            select(Tag).filter(Tag.owner_id == owner_id).order_by(Tag.name)
+        )
+        return list(result.scalars().all())
+
+    async def get_by_id(self, tag_id: int, owner_id: int) -> Optional[Tag]:
+        result = await self.db.execute(
+            select(Tag).filter(Tag.id == tag_id, Tag.owner_id == owner_id)
+        )
+        return result.scalars().first()
+
+    async def get_by_ids(self, tag_ids: List[int], owner_id: int) -> List[Tag]:
+        """Get multiple tags by IDs, filtered by owner. Returns only tags belonging to the owner."""
+        result = await self.db.execute(select(Tag).filter(
+            Tag.id.in_(tag_ids),
+            Tag.owner_id == owner_id
+        ))
+        return list(result.scalars().all())
+
+    async def ensure_names(self, names: List[str], owner_id: int) -> tuple[Dict[str, int], int]:
+        """See TagRepository.ensure_names."""
+        wanted = list(dict.fromkeys(names))
+        if not wanted:
+            return {}, 0
+        found = tag_name_cache.lookup(owner_id, wanted)
+        missing = [name for name in wanted if name not in found]
+        if not missing:
+            return found, 0
+        created = dict((await self.db.execute(upsert_names_stmt(missing, owner_id))).all())
+        existing = [name for name in missing if name not in created]
+        if existing:
+            existing_ids = dict((await self.db.execute(names_query(existing, owner_id))).all())
+            tag_name_cache.put(owner_id, existing_ids)
+            found.update(existing_ids)
+        if created:
+            found.update(created)
+            await self.versions.bump(owner_id)
+        return found, len(created)
+
+    async def get_by_names(self, names: List[str], owner_id: int) -> List[Tag]:
+        """See TagRepository.get_by_names."""
+        ids, _ = await self.ensure_names(names, owner_id)
+        if not ids:
+            return []
+        tags = {t.id: t for t in await self.get_by_ids(list(ids.values()), owner_id)}
+        if len(tags) < len(set(ids.values())):
+            tag_name_cache.invalidate(owner_id)
+            ids, _ = await self.ensure_names(names, owner_id)
+            tags = {t.id: t for t in await self.get_by_ids(list(ids.values()), owner_id)}
+        return [tags[ids[name]] for name in dict.fromkeys(names) if ids[name] in tags]
+
+    async def create(self, tag_data: TagCreate, owner_id: int) -> Tag:
+        new_tag = Tag(
+            name=tag_data.name,
+            color=tag_data.color,
+            owner_id=owner_id,
+        )
+        self.db.add(new_tag)
+        await self.versions.bump(owner_id)
+        await self.db.commit()
+        await self.db.refresh(new_tag)
+        change_broker.publish(owner_id, "tag.created", _tag_event(new_tag))
+        return new_tag
+
+    async def update(self, tag_id: int, tag_data: TagCreate, owner_id: int) -> Optional[Tag]:
+        tag = await self.get_by_id(tag_id, owner_id)
+        if not tag:
+            return None
+        tag.name = tag_data.name
+        tag.color = tag_data.color
+        await self.versions.bump(owner_id)
+        await self.db.commit()
+        tag_name_cache.invalidate(owner_id)
+        await self.db.refresh(tag)
+        change_broker.publish(owner_id, "tag.updated", _tag_event(tag))
+        return tag
+
+    async def delete(self, tag_id: int, owner_id: int) -> bool:
+        tag = await self.get_by_id(tag_id, owner_id)
+        if not tag:
+            return False
+        await self.db.delete(tag)
+        await self.versions.bump(owner_id)
+        await self.db.commit()
+        tag_name_cache.invalidate(owner_id)
+        change_broker.publish(owner_id, "tag.deleted", {"id": tag_id})
+        return True
+
+
+# DI Helper
+def get_async_tag_repo(db=Depends(get_async_db)) -> AsyncTagRepository:
+    return AsyncTagRepository(db)
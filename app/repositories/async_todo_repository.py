@@ -0,0 +1,144 @@
+from typing import List, Optional
+from datetime import datetime
+from sqlalchemy import select, delete, insert
+from fastapi import Depends
+
+from ..models.todo import Todo
+from ..models.tag import Tag, todo_tags
+from ..schemas.todo import TodoCreate, TodoUpdate
+from ..core.database import get_async_db
+from .version_repository import AsyncDataVersionRepository
+from .todo_repository import (
+    TodoRecord, _apply_filters, _apply_order, _apply_keyset, _counter_query, _counter_value, _load_tags,
+    _records_query, _tag_records_query, _to_records, _overdue_query, _today_query, _update_stmt, _updated_record,
+    _soft_delete_stmt, _search_count_query, _search_total, _todos, _LIVE,
+)
+
+
+class AsyncTodoRepository:
+    """AsyncSession counterpart of TodoRepository (settings.DB_ASYNC)."""
+
+    def __init__(self, db):
+        self.db = db
+        self.versions = AsyncDataVersionRepository(db)
+
+    async def _records(self, stmt) -> List[TodoRecord]:
+        rows = (await self.db.execute(stmt)).all()
+        if not rows:
+            return []
+        tag_rows = (await self.db.execute(_tag_records_query([r[0] for r in rows]))).all()
+        return _to_records(rows, tag_rows)
+
+    async def get_all(
+        self,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        q: Optional[str] = None,
+        is_done: Optional[bool] = None,
+        sort_desc: bool = True,
+        tag_id: Optional[int] = None,
+        sort: str = "created_at",
+        include_total: bool = True,
+    ) -> tuple[List[TodoRecord], Optional[int]]:
+        stmt = _apply_filters(_records_query(), owner_id, q, is_done, tag_id)
+        page = _apply_order(stmt, sort_desc, q, sort).offset(skip)
+
+        total = None
+        if include_total and q:
+            total = _search_total(await self.db.scalar(_search_count_query(stmt)))
+        elif include_total:
+            total = await self.count(owner_id, is_done, tag_id)
+        if total is None:
+            return await self._records(page.limit(limit + 1)), None
+
+        return await self._records(page.limit(limit)), total
+
+    async def count(self, owner_id: int, is_done: Optional[bool] = None, tag_id: Optional[int] = None) -> int:
+        """Number of owner's todos, read from todo_counters instead of COUNT(*)."""
+        row = (await self.db.execute(_counter_query(owner_id, tag_id))).first()
+        return _counter_value(row, is_done)
+
+    async def get_page_after(
+        self,
+        owner_id: int,
+        after: Optional[tuple[datetime, int]] = None,
+        limit: int = 10,
+        q: Optional[str] = None,
+        is_done: Optional[bool] = None,
+        sort_desc: bool = True,
+        tag_id: Optional[int] = None,
+    ) -> List[TodoRecord]:
+        """Keyset pagination on (created_at, id), see TodoRepository.get_page_after."""
+        stmt = _apply_filters(_records_query(), owner_id, q, is_done, tag_id)
+        stmt = _apply_keyset(stmt, after, sort_desc)
+        return await self._records(_apply_order(stmt, sort_desc).limit(limit + 1))
+
+    async def get_overdue(self, owner_id: int) -> List[TodoRecord]:
+        return await self._records(_overdue_query(owner_id))
+
+    async def get_today(self, owner_id: int) -> List[TodoRecord]:
+        return await self._records(_today_query(owner_id))
+
+    async def get_record(self, todo_id: int, owner_id: int) -> Optional[TodoRecord]:
+        records = await self._records(_records_query().filter(Todo.id == todo_id, Todo.owner_id == owner_id))
+        return records[0] if records else None
+
+    async def get_by_id(self, todo_id: int, owner_id: int) -> Optional[Todo]:
+        result = await self.db.execute(_load_tags(select(Todo)).filter(
+            Todo.id == todo_id,
+            Todo.owner_id == owner_id,
+            _LIVE,
+        ))
+        return result.scalars().first()
+
+    async def create(self, todo_data: TodoCreate, owner_id: int, tags: List[Tag] = None) -> Todo:
+        new_todo = Todo(
+            title=todo_data.title,
+            description=todo_data.description,
+            is_done=todo_data.is_done,
+            due_date=todo_data.due_date,
+            owner_id=owner_id,
+        )
+        new_todo.tags = tags or []
+        self.db.add(new_todo)
+        await self.versions.bump(owner_id)
+        await self.db.commit()
+        await self.db.refresh(new_todo)
+        return new_todo
+
+    async def update(self, todo_id: int, todo_update: TodoUpdate, owner_id: int, tags: List[Tag] = None) -> Optional[TodoRecord]:
+        """Single UPDATE ... RETURNING, see TodoRepository.update."""
+        row = (await self.db.execute(_update_stmt(todo_id, todo_update, owner_id, returning_tags=tags is None))).first()
+        if row is None:
+            await self.db.rollback()
+            return None
+        if tags is not None:
+            await self.db.execute(delete(todo_tags).where(todo_tags.c.todo_id == todo_id))
+            if tags:
+                await self.db.execute(insert(todo_tags), [{"todo_id": todo_id, "tag_id": t.id} for t in tags])
+        await self.versions.bump(owner_id)
+        await self.db.commit()
+        return _updated_record(row, tags)
+
+    async def delete(self, todo_id: int, owner_id: int) -> bool:
+        """Soft delete, see TodoRepository.delete."""
+        deleted = (await self.db.execute(_soft_delete_stmt(owner_id, _todos.c.id == todo_id))).first()
+        if deleted is None:
+            return False
+        await self.versions.bump(owner_id)
+        await self.db.commit()
+        return True
+
+    async def delete_completed(self, owner_id: int) -> int:
+        """Soft delete all completed todos for the owner. Returns count of deleted items."""
+        result = await self.db.execute(_soft_delete_stmt(owner_id, _todos.c.is_done == True, returning=False))
+        if result.rowcount:
+            await self.versions.bump(owner_id)
+        await self.db.commit()
+        return result.rowcount
+
+
+# Dependency Injection Helper
+def get_async_todo_repo(db=Depends(get_async_db)) -> AsyncTodoRepository:
+    return AsyncTodoRepository(db)
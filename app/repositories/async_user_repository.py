@@ -0,0 +1,45 @@
+from typing import Optional
+from sqlalchemy import select
+from fastapi import Depends
+
+from ..models.user import User
+from ..schemas.user import UserCreate
+from ..core.database import get_async_db
+
+
+class AsyncUserRepository:
+    """AsyncSession counterpart of UserRepository (settings.DB_ASYNC)."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        result = await self.db.execute(select(User).filter(User.email == email))
+        return result.scalars().first()
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        return await self.db.get(User, user_id)
+
+    async def create(self, user_data: UserCreate, hashed_password: str) -> User:
+        # Hashing is CPU-bound, so the caller does it off the event loop
+        new_user = User(
+            email=user_data.email,
+            hashed_password=hashed_password,
+        )
+        self.db.add(new_user)
+        await self.db.commit()
+        await self.db.refresh(new_user)
+        return new_user
+
+    async def update_password_hash(self, user_id: int, hashed_password: str) -> Optional[User]:
+        user = await self.get_by_id(user_id)
+        if user is None:
+            return None
+        user.hashed_password = hashed_password
+        await self.db.commit()
+        return user
+
+
+# Dependency Injection Helper
+def get_async_user_repo(db=Depends(get_async_db)) -> AsyncUserRepository:
+    return AsyncUserRepository(db)
@@ -1,15 +1,98 @@
-from typing import List, Optional
+import threading
+import time
+from collections import OrderedDict
+from functools import partial
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from fastapi import Depends
 
 from ..models.tag import Tag
 from ..schemas.tag import TagCreate
-from ..core.database import get_db
+from ..core.config import settings
+from ..core.database import get_db, upsert
+from ..core.events import change_broker
+from ..core.group_commit import on_commit, unit_of_work
+from .version_repository import DataVersionRepository
+
+
+def _tag_event(tag: Tag) -> dict:
+    return {"id": tag.id, "name": tag.name, "color": tag.color, "owner_id": tag.owner_id}
+
+
+class TagNameCache:
+    """Bounded LRU of owner -> {tag name: tag id}.
+
+    Only ids of committed tags are stored. The repository drops an owner's
+    map when one of their tags is renamed or deleted; the TTL bounds
+    staleness caused by other processes.
+    """
+
+    def __init__(self, max_owners: int, ttl_seconds: int):
+        self.max_owners = max_owners
+        self.ttl_seconds = ttl_seconds
+        self._owners: "OrderedDict[int, tuple[float, Dict[str, int]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, owner_id: int, names: Iterable[str]) -> Dict[str, int]:
+        """Return the cached subset of {name: id} for the given names."""
+        with self._lock:
+            entry = self._owners.get(owner_id)
+            if entry is None:
+                return {}
+            expires_at, ids = entry
+            if expires_at <= time.monotonic():
+                del self._owners[owner_id]
+                return {}
+            self._owners.move_to_end(owner_id)
+            return {name: ids[name] for name in names if name in ids}
+
+    def put(self, owner_id: int, ids: Dict[str, int]) -> None:
+        if self.max_owners <= 0 or not ids:
+            return
+        with self._lock:
+            entry = self._owners.get(owner_id)
+            if entry is None or entry[0] <= time.monotonic():
+                entry = (time.monotonic() + self.ttl_seconds, {})
+                self._owners[owner_id] = entry
+            entry[1].update(ids)
+            self._owners.move_to_end(owner_id)
+            while len(self._owners) > self.max_owners:
+                self._owners.popitem(last=False)
+
+    def invalidate(self, owner_id: int) -> None:
+        with self._lock:
+            self._owners.pop(owner_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._owners.clear()
+
+
+tag_name_cache = TagNameCache(settings.TAG_NAME_CACHE_MAX_OWNERS, settings.TAG_NAME_CACHE_TTL_SECONDS)
+
+
+def upsert_names_stmt(names: List[str], owner_id: int):
+    """Insert the tags that do not exist yet, in one statement.
+
+    Conflicts on uq_tags_owner_name are skipped, so RETURNING yields only
+    the rows this statement created.
+    """
+    stmt = upsert(Tag).values([{"name": name, "owner_id": owner_id} for name in names])
+    return stmt.on_conflict_do_nothing(index_elements=[Tag.owner_id, Tag.name]).returning(Tag.name, Tag.id)
+
+
+def names_query(names: List[str], owner_id: int):
+    return select(Tag.name, Tag.id).where(Tag.owner_id == owner_id, Tag.name.in_(names))
 
 
 class TagRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.versions = DataVersionRepository(db)
+
+    def with_session(self, db: Session) -> "TagRepository":
+        return TagRepository(db)
 
     def get_all(self, owner_id: int) -> List[Tag]:
         return self.db.query(Tag).filter(Tag.owner_id == owner_id).order_by(Tag.name).all()
@@ -24,6 +107,46 @@ class TagRepository:
             Tag.owner_id == owner_id
         ).all()
 
+    def ensure_names(self, names: List[str], owner_id: int) -> tuple[Dict[str, int], int]:
+        """Map tag names to ids, creating the missing tags.
+
+        Cached names cost nothing; the rest go through one upsert, and only
+        names that already existed are then read back. Does not commit: runs
+        inside the caller's transaction (todo create/update, import).
+        Returns ({name: id}, number of tags created).
+        """
+        wanted = list(dict.fromkeys(names))
+        if not wanted:
+            return {}, 0
+        found = tag_name_cache.lookup(owner_id, wanted)
+        missing = [name for name in wanted if name not in found]
+        if not missing:
+            return found, 0
+        created = dict(self.db.execute(upsert_names_stmt(missing, owner_id)).all())
+        existing = [name for name in missing if name not in created]
+        if existing:
+            existing_ids = dict(self.db.execute(names_query(existing, owner_id)).all())
+            tag_name_cache.put(owner_id, existing_ids)
+            found.update(existing_ids)
+        if created:
+            found.update(created)
+            self.versions.bump(owner_id)
+        return found, len(created)
+
+    def get_by_names(self, names: List[str], owner_id: int) -> List[Tag]:
+        """Tags for the given names (created if missing), in the order given."""
+        ids, _ = self.ensure_names(names, owner_id)
+        if not ids:
+            return []
+        tags = {t.id: t for t in self.get_by_ids(list(ids.values()), owner_id)}
+        if len(tags) < len(set(ids.values())):
+            # A cached id went stale (tag deleted by another process): start over
+            tag_name_cache.invalidate(owner_id)
+            ids, _ = self.ensure_names(names, owner_id)
+            tags = {t.id: t for t in self.get_by_ids(list(ids.values()), owner_id)}
+        return [tags[ids[name]] for name in dict.fromkeys(names) if ids[name] in tags]
+
+    @unit_of_work
     def create(self, tag_data: TagCreate, owner_id: int) -> Tag:
         new_tag = Tag(
             name=tag_data.name,
@@ -31,26 +154,36 @@ class TagRepository:
             owner_id=owner_id,
         )
         self.db.add(new_tag)
+        self.versions.bump(owner_id)
         self.db.commit()
         self.db.refresh(new_tag)
+        on_commit(self.db, partial(change_broker.publish, owner_id, "tag.created", _tag_event(new_tag)))
         return new_tag
 
+    @unit_of_work
     def update(self, tag_id: int, tag_data: TagCreate, owner_id: int) -> Optional[Tag]:
         tag = self.get_by_id(tag_id, owner_id)
         if not tag:
             return None
         tag.name = tag_data.name
         tag.color = tag_data.color
+        self.versions.bump(owner_id)
         self.db.commit()
+        on_commit(self.db, partial(tag_name_cache.invalidate, owner_id))
         self.db.refresh(tag)
+        on_commit(self.db, partial(change_broker.publish, owner_id, "tag.updated", _tag_event(tag)))
         return tag
 
+    @unit_of_work
     def delete(self, tag_id: int, owner_id: int) -> bool:
         tag = self.get_by_id(tag_id, owner_id)
         if not tag:
             return False
         self.db.delete(tag)
+        self.versions.bump(owner_id)
         self.db.commit()
+        on_commit(self.db, partial(tag_name_cache.invalidate, owner_id))
+        on_commit(self.db, partial(change_broker.publish, owner_id, "tag.deleted", {"id": tag_id}))
         return True
 
 
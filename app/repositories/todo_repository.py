@@ -1,18 +1,309 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, and_, func
+import json
+import re
+from typing import List, NamedTuple, Optional
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import desc, and_, or_, case, func, tuple_, insert, delete, select, update, literal_column
 from fastapi import Depends
-from datetime import datetime, date
+from datetime import datetime, date, time, timedelta
 
-from ..models.todo import Todo
-from ..models.tag import Tag
+from ..models.todo import Todo, todos_fts
+from ..models.tag import Tag, todo_tags
+from ..models.todo_counter import TodoCounter, ALL_TAGS
 from ..schemas.todo import TodoCreate, TodoUpdate
-from ..core.database import get_db
+from ..core.config import settings
+from ..core.database import get_db, IS_SQLITE
+from .version_repository import DataVersionRepository
+
+
+def _load_tags(query):
+    """Load Todo.tags where ORM objects are needed (write paths): one extra
+    `todo_id IN (...)` query per result set. A joined load is not used:
+    SQLite materializes its (todo_tags JOIN tags) and scans every link."""
+    return query.options(selectinload(Todo.tags))
+
+
+def _fts_terms(q: str) -> Optional[str]:
+    """Turn free text into FTS5 terms: every word must match as a prefix."""
+    words = re.findall(r"\w+", q)
+    if not words:
+        return None
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _fts_query(owner_id: int, terms: str) -> str:
+    """MATCH expression scoped to the owner's rows (todos_fts.owner_id)."""
+    return f'owner_id : "{owner_id}" AND {{title description}} : ({terms})'
+
+
+def _like_pattern(word: str) -> str:
+    """'%word%' for ILIKE ... ESCAPE '\\' with LIKE wildcards in `word` escaped."""
+    return "%" + re.sub(r"([\\%_])", r"\\\1", word) + "%"
+
+
+def _search_filter(q: str):
+    """PostgreSQL q filter: every word in title or description (pg_trgm indexes)."""
+    return and_(*(
+        or_(Todo.title.ilike(_like_pattern(w), escape="\\"),
+            Todo.description.ilike(_like_pattern(w), escape="\\"))
+        for w in q.split() or [q]
+    ))
+
+
+def _apply_filters(
+    query,
+    owner_id: int,
+    q: Optional[str] = None,
+    is_done: Optional[bool] = None,
+    tag_id: Optional[int] = None,
+):
+    """Owner/search/status/tag filters. Works on both a Query and a select()."""
+    terms = _fts_terms(q) if q and IS_SQLITE else None
+    if terms is not None:
+        # The owner-scoped MATCH drives the query. `owner_id + 0` keeps SQLite
+        # from starting at an ix_todos_owner_* index and re-running the MATCH
+        # for each of the owner's rows.
+        query = query.join(todos_fts, todos_fts.c.rowid == Todo.id).filter(
+            todos_fts.c.todos_fts.op("MATCH")(_fts_query(owner_id, terms)),
+            Todo.owner_id + 0 == owner_id,
+        )
+    else:
+        # Always filter by owner
+        query = query.filter(Todo.owner_id == owner_id)
+
+    if is_done is not None:
+        query = query.filter(Todo.is_done == is_done)
+
+    if q and not IS_SQLITE:
+        query = query.filter(_search_filter(q))
+    elif q and terms is None:
+        # Punctuation-only search terms have no FTS tokens
+        query = query.filter(Todo.title.ilike(f"%{q}%"))
+
+    if tag_id is not None:
+        query = query.filter(Todo.tags.any(Tag.id == tag_id))
+
+    return query
+
+
+def _apply_order(query, sort_desc: bool = True, q: Optional[str] = None, sort: str = "created_at"):
+    # id breaks ties between rows created in the same instant
+    if sort == "relevance" and q and not IS_SQLITE:
+        document = func.concat_ws(" ", Todo.title, Todo.description)
+        return query.order_by(desc(func.word_similarity(q, document)), desc(Todo.created_at), desc(Todo.id))
+    if sort == "relevance" and q and _fts_terms(q):
+        return query.order_by(todos_fts.c.rank, desc(Todo.created_at), desc(Todo.id))
+    if sort_desc:
+        return query.order_by(desc(Todo.created_at), desc(Todo.id))
+    return query.order_by(Todo.created_at, Todo.id)
+
+
+def _apply_keyset(query, after: Optional[tuple[datetime, int]], sort_desc: bool = True):
+    """Seek past the (created_at, id) key of the previous page."""
+    if after is None:
+        return query
+    key = tuple_(Todo.created_at, Todo.id)
+    if sort_desc:
+        return query.filter(key < tuple_(*after))
+    return query.filter(key > tuple_(*after))
+
+
+def _counter_query(owner_id: int, tag_id: Optional[int] = None):
+    return select(TodoCounter.total, TodoCounter.done).where(
+        TodoCounter.owner_id == owner_id,
+        TodoCounter.tag_id == (tag_id if tag_id is not None else ALL_TAGS),
+    )
+
+
+def _search_count_query(stmt):
+    """COUNT of a search's matches, stopped after SEARCH_COUNT_LIMIT + 1 rows."""
+    return select(func.count()).select_from(stmt.limit(settings.SEARCH_COUNT_LIMIT + 1).subquery())
+
+
+def _search_total(count: int) -> Optional[int]:
+    """The count, or None (unknown) when it reached the cap."""
+    return count if count <= settings.SEARCH_COUNT_LIMIT else None
+
+
+def _counter_value(row, is_done: Optional[bool]) -> int:
+    if row is None:  # Owner (or tag) has no todos yet
+        return 0
+    total, done = row
+    if is_done is None:
+        return total
+    return done if is_done else total - done
+
+
+# ─── Read model: Core rows instead of ORM instances for read-only endpoints ───
+
+class TagRecord(NamedTuple):
+    id: int
+    name: str
+    color: str
+    owner_id: int
+
+
+class TodoRecord(NamedTuple):
+    """Immutable todo row with its tags. Has the attributes _enrich_todo reads,
+    without identity map, change tracking or relationship collections."""
+    id: int
+    title: str
+    description: Optional[str]
+    is_done: bool
+    due_date: Optional[datetime]
+    created_at: datetime
+    updated_at: Optional[datetime]
+    owner_id: int
+    tags: tuple
+
+
+_todos = Todo.__table__
+# Same order as TodoRecord's fields (without tags)
+_RECORD_COLUMNS = (
+    _todos.c.id, _todos.c.title, _todos.c.description, _todos.c.is_done,
+    _todos.c.due_date, _todos.c.created_at, _todos.c.updated_at, _todos.c.owner_id,
+)
+
+
+# Soft-deleted todos (deleted_at set) are invisible to every read and write below
+_LIVE = Todo.deleted_at.is_(None)
+
+
+def _records_query():
+    return select(*_RECORD_COLUMNS).where(_LIVE)
+
+
+def _tag_records_query(todo_ids: List[int]):
+    """Tags of a batch of todos in one query, ordered along the todo_tags primary key."""
+    return (
+        select(todo_tags.c.todo_id, Tag.id, Tag.name, Tag.color, Tag.owner_id)
+        .join(Tag, Tag.id == todo_tags.c.tag_id)
+        .where(todo_tags.c.todo_id.in_(todo_ids))
+        .order_by(todo_tags.c.todo_id, todo_tags.c.tag_id)
+    )
+
+
+def _to_records(rows, tag_rows) -> List[TodoRecord]:
+    tags = {}
+    for todo_id, *tag in tag_rows:
+        tags.setdefault(todo_id, []).append(TagRecord(*tag))
+    return [TodoRecord(*row, tuple(tags.get(row[0], ()))) for row in rows]
+
+
+# The written todo's tags as a JSON array of [id, name, color, owner_id],
+# correlated to the UPDATE target so RETURNING yields the whole record (json1
+# on SQLite). Spelled out: SQLAlchemy drops table qualifiers inside RETURNING.
+_RETURNED_TAGS = literal_column(
+    "(SELECT json_group_array(json_array(tags.id, tags.name, tags.color, tags.owner_id)) "
+    "FROM todo_tags JOIN tags ON tags.id = todo_tags.tag_id "
+    "WHERE todo_tags.todo_id = todos.id)"
+    if IS_SQLITE else
+    "(SELECT coalesce(json_agg(json_build_array(tags.id, tags.name, tags.color, tags.owner_id) ORDER BY tags.id), '[]') "
+    "FROM todo_tags JOIN tags ON tags.id = todo_tags.tag_id "
+    "WHERE todo_tags.todo_id = todos.id)"
+)
+
+
+def _update_stmt(todo_id: int, todo_update: TodoUpdate, owner_id: int, returning_tags: bool = True):
+    """UPDATE ... RETURNING for one todo. Ownership and, when a due_date is
+    set, the due_date > created_at rule are part of the WHERE clause."""
+    values = todo_update.model_dump(exclude_unset=True, exclude={"tag_ids", "tag_names"})
+    values["updated_at"] = datetime.utcnow()
+    stmt = update(_todos).where(_todos.c.id == todo_id, _todos.c.owner_id == owner_id, _LIVE)
+    if values.get("due_date") is not None:
+        stmt = stmt.where(_todos.c.created_at < values["due_date"].replace(tzinfo=None))
+    columns = _RECORD_COLUMNS + (_RETURNED_TAGS,) if returning_tags else _RECORD_COLUMNS
+    return stmt.values(values).returning(*columns)
+
+
+def _updated_record(row, tags: Optional[List[Tag]] = None) -> TodoRecord:
+    """TodoRecord from a _update_stmt row; `tags` are the newly linked tags, if any."""
+    if tags is None:
+        # SQLite returns the JSON text, psycopg/asyncpg may decode it already
+        tags_json = json.loads(row[8]) if isinstance(row[8], str) else row[8]
+        tag_records = (TagRecord(*t) for t in tags_json)
+    else:
+        tag_records = (TagRecord(t.id, t.name, t.color, t.owner_id) for t in tags)
+    return TodoRecord(*row[:8], tuple(tag_records))
+
+
+def _soft_delete_stmt(owner_id: int, condition, returning: bool = True):
+    """Mark the owner's live todos matching `condition` deleted (RETURNING their ids)."""
+    stmt = (
+        update(_todos)
+        .where(_todos.c.owner_id == owner_id, _LIVE, condition)
+        .values(deleted_at=datetime.utcnow())
+    )
+    return stmt.returning(_todos.c.id) if returning else stmt
+
+
+def _overdue_query(owner_id: int):
+    """Tasks past their due_date and NOT completed."""
+    return _records_query().filter(
+        Todo.owner_id == owner_id,
+        Todo.is_done == False,
+        Todo.due_date != None,
+        Todo.due_date < datetime.utcnow(),
+    ).order_by(Todo.due_date)
+
+
+def utc_today(now: Optional[datetime] = None) -> date:
+    """The current day on the UTC clock due dates are stored in; GET
+    /todos/today and the stats' due_today both use it."""
+    return (now or datetime.utcnow()).date()
+
+
+def _today_query(owner_id: int):
+    """Tasks due today (any time within the calendar day)."""
+    # Half-open range instead of DATE(due_date) so ix_todos_owner_due is usable
+    start = datetime.combine(utc_today(), time.min)
+    end = start + timedelta(days=1)
+    return _records_query().filter(
+        Todo.owner_id == owner_id,
+        Todo.due_date >= start,
+        Todo.due_date < end,
+    ).order_by(Todo.due_date)
+
+
+def _due_stats_query(owner_id: int, now: datetime):
+    """One pass over the owner's todos: per due day (NULL = no due date) the
+    total, done and overdue counts. Covered by ix_todos_owner_done_due."""
+    day = func.date(Todo.due_date).label("day")
+    return (
+        select(
+            day,
+            func.count().label("total"),
+            func.sum(case((Todo.is_done == True, 1), else_=0)).label("done"),
+            func.sum(case((and_(Todo.is_done == False, Todo.due_date < now), 1), else_=0)).label("overdue"),
+        )
+        .where(Todo.owner_id == owner_id, _LIVE)
+        .group_by(day)
+        .order_by(day)
+    )
+
+
+def _tag_stats_query(owner_id: int):
+    """Per-tag totals straight from todo_counters (tags without todos count 0)."""
+    return (
+        select(
+            Tag.id, Tag.name, Tag.color,
+            func.coalesce(TodoCounter.total, 0), func.coalesce(TodoCounter.done, 0),
+        )
+        .outerjoin(TodoCounter, and_(TodoCounter.owner_id == Tag.owner_id, TodoCounter.tag_id == Tag.id))
+        .where(Tag.owner_id == owner_id)
+        .order_by(Tag.name)
+    )
 
 
 class TodoRepository:
     def __init__(self, db: Session):
         self.db = db
+        self.versions = DataVersionRepository(db)
+
+    def _records(self, stmt) -> List[TodoRecord]:
+        rows = self.db.execute(stmt).all()
+        if not rows:
+            return []
+        return _to_records(rows, self.db.execute(_tag_records_query([r[0] for r in rows])).all())
 
     def get_all(
         self,
@@ -23,55 +314,99 @@ class TodoRepository:
         is_done: Optional[bool] = None,
         sort_desc: bool = True,
         tag_id: Optional[int] = None,
-    ) -> tuple[List[Todo], int]:
-        
-        # Always filter by owner
-        query = self.db.query(Todo).filter(Todo.owner_id == owner_id)
+        sort: str = "created_at",
+        include_total: bool = True,
+    ) -> tuple[List[TodoRecord], Optional[int]]:
+        """Offset page plus total. With include_total=False, or a search with
+        more than SEARCH_COUNT_LIMIT matches, total is None and one extra row
+        is fetched so the caller can tell whether more exist."""
+        stmt = _apply_filters(_records_query(), owner_id, q, is_done, tag_id)
+        page = _apply_order(stmt, sort_desc, q, sort).offset(skip)
 
-        if is_done is not None:
-            query = query.filter(Todo.is_done == is_done)
-        
-        if q:
-            query = query.filter(Todo.title.ilike(f"%{q}%"))
+        total = None
+        if include_total and q:
+            total = _search_total(self.db.scalar(_search_count_query(stmt)))
+        elif include_total:
+            total = self.count(owner_id, is_done, tag_id)
+        if total is None:
+            return self._records(page.limit(limit + 1)), None
 
-        if tag_id is not None:
-            query = query.filter(Todo.tags.any(Tag.id == tag_id))
+        return self._records(page.limit(limit)), total
 
-        # Sort
-        if sort_desc:
-            query = query.order_by(desc(Todo.created_at))
-        else:
-            query = query.order_by(Todo.created_at)
+    def count(self, owner_id: int, is_done: Optional[bool] = None, tag_id: Optional[int] = None) -> int:
+        """Number of owner's todos, read from todo_counters instead of COUNT(*)."""
+        row = self.db.execute(_counter_query(owner_id, tag_id)).first()
+        return _counter_value(row, is_done)
 
-        total = query.count()
-        items = query.offset(skip).limit(limit).all()
+    def get_page_after(
+        self,
+        owner_id: int,
+        after: Optional[tuple[datetime, int]] = None,
+        limit: int = 10,
+        q: Optional[str] = None,
+        is_done: Optional[bool] = None,
+        sort_desc: bool = True,
+        tag_id: Optional[int] = None,
+    ) -> List[TodoRecord]:
+        """Keyset pagination on (created_at, id).
 
-        return items, total
+        Seeks directly past the `after` key instead of skipping rows, so every
+        page costs the same. Fetches one extra row so the caller can tell
+        whether another page exists.
+        """
+        stmt = _apply_filters(_records_query(), owner_id, q, is_done, tag_id)
+        stmt = _apply_keyset(stmt, after, sort_desc)
+        return self._records(_apply_order(stmt, sort_desc).limit(limit + 1))
 
-    def get_overdue(self, owner_id: int) -> List[Todo]:
-        """Tasks past their due_date and NOT completed."""
-        now = datetime.utcnow()
-        return self.db.query(Todo).filter(
-            Todo.owner_id == owner_id,
-            Todo.is_done == False,
-            Todo.due_date != None,
-            Todo.due_date < now,
-        ).order_by(Todo.due_date).all()
-
-    def get_today(self, owner_id: int) -> List[Todo]:
-        """Tasks due today (any time within the calendar day)."""
-        today = date.today()
-        return self.db.query(Todo).filter(
-            Todo.owner_id == owner_id,
-            func.date(Todo.due_date) == today,
-        ).order_by(Todo.due_date).all()
+    def get_overdue(self, owner_id: int) -> List[TodoRecord]:
+        return self._records(_overdue_query(owner_id))
+
+    def get_today(self, owner_id: int) -> List[TodoRecord]:
+        return self._records(_today_query(owner_id))
+
+    def get_due_stats(self, owner_id: int, now: datetime) -> list:
+        return self.db.execute(_due_stats_query(owner_id, now)).all()
+
+    def get_tag_stats(self, owner_id: int) -> list:
+        return self.db.execute(_tag_stats_query(owner_id)).all()
+
+    def get_record(self, todo_id: int, owner_id: int) -> Optional[TodoRecord]:
+        """Read-only single todo (GET /todos/{id}); writes use get_by_id."""
+        records = self._records(_records_query().filter(Todo.id == todo_id, Todo.owner_id == owner_id))
+        return records[0] if records else None
 
     def get_by_id(self, todo_id: int, owner_id: int) -> Optional[Todo]:
-        return self.db.query(Todo).filter(
+        return _load_tags(self.db.query(Todo)).filter(
             Todo.id == todo_id,
-            Todo.owner_id == owner_id
+            Todo.owner_id == owner_id,
+            _LIVE,
         ).first()
 
+    def get_by_ids(self, todo_ids: List[int], owner_id: int) -> List[Todo]:
+        """Load several todos in one query, filtered by owner (order not guaranteed)."""
+        if not todo_ids:
+            return []
+        return _load_tags(self.db.query(Todo)).filter(
+            Todo.id.in_(todo_ids),
+            Todo.owner_id == owner_id,
+            _LIVE,
+        ).all()
+
+    def iter_export_batches(self, owner_id: int, batch_size: int = 1000):
+        """Yield the owner's todos as lists of TodoRecord, oldest first.
+
+        Rows are fetched with yield_per, so nothing accumulates across
+        batches; each batch's tags come from one extra IN query.
+        """
+        stmt = (
+            _records_query()
+            .where(_todos.c.owner_id == owner_id)
+            .order_by(_todos.c.created_at, _todos.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        for rows in self.db.execute(stmt).partitions():
+            yield _to_records(rows, self.db.execute(_tag_records_query([r[0] for r in rows])).all())
+
     def create(self, todo_data: TodoCreate, owner_id: int, tags: List[Tag] = None) -> Todo:
         new_todo = Todo(
             title=todo_data.title,
@@ -83,41 +418,111 @@ class TodoRepository:
         if tags:
             new_todo.tags = tags
         self.db.add(new_todo)
+        self.versions.bump(owner_id)
         self.db.commit()
         self.db.refresh(new_todo)
         return new_todo
 
-    def update(self, todo_id: int, todo_update: TodoUpdate, owner_id: int, tags: List[Tag] = None) -> Optional[Todo]:
-        db_todo = self.get_by_id(todo_id, owner_id)
-        if not db_todo:
+    def update(self, todo_id: int, todo_update: TodoUpdate, owner_id: int, tags: List[Tag] = None) -> Optional[TodoRecord]:
+        """Apply a PATCH/PUT with a single UPDATE ... RETURNING (no load, no refresh).
+
+        Returns None, with the transaction rolled back, when the todo is not
+        the owner's or the new due_date is not after its created_at.
+        Tag links are only rewritten when `tags` is given.
+        """
+        row = self.db.execute(_update_stmt(todo_id, todo_update, owner_id, returning_tags=tags is None)).first()
+        if row is None:
+            self.db.rollback()
             return None
-        
-        update_data = todo_update.model_dump(exclude_unset=True, exclude={"tag_ids"})
-        for key, value in update_data.items():
-            setattr(db_todo, key, value)
-        
         if tags is not None:
-            db_todo.tags = tags
-        
+            # Counter triggers follow the link changes
+            self.db.execute(delete(todo_tags).where(todo_tags.c.todo_id == todo_id))
+            if tags:
+                self.db.execute(insert(todo_tags), [{"todo_id": todo_id, "tag_id": t.id} for t in tags])
+        self.versions.bump(owner_id)
         self.db.commit()
-        self.db.refresh(db_todo)
-        return db_todo
+        return _updated_record(row, tags)
 
     def delete(self, todo_id: int, owner_id: int) -> bool:
-        db_todo = self.get_by_id(todo_id, owner_id)
-        if not db_todo:
+        """Soft delete; TodoPurger removes the row and its tag links later."""
+        deleted = self.db.execute(_soft_delete_stmt(owner_id, _todos.c.id == todo_id)).first()
+        if deleted is None:
             return False
-        
-        self.db.delete(db_todo)
+        self.versions.bump(owner_id)
         self.db.commit()
         return True
 
+    def bulk_create(self, rows: List[dict], tag_ids: List[List[int]], owner_id: int) -> List[int]:
+        """Insert many todos and their tag links in a single transaction.
+
+        `rows` holds the column values of each todo (created_at defaults to
+        now) and `tag_ids[i]` the (already owner-checked) tags of rows[i]. Both tables are written with
+        one batched INSERT each. Returns new ids in the order of `rows`.
+        """
+        if not rows:
+            return []
+        now = datetime.utcnow()
+        values = [
+            {"created_at": now, "updated_at": now, **row, "owner_id": owner_id}
+            for row in rows
+        ]
+        table = Todo.__table__
+        if IS_SQLITE:
+            # SQLAlchemy can only keep RETURNING in parameter order on SQLite
+            # by sending one INSERT per row. A single batched INSERT takes
+            # consecutive rowids in VALUES order, so sorting restores it.
+            new_ids = sorted(self.db.execute(insert(table).returning(table.c.id), values).scalars().all())
+        else:
+            new_ids = self.db.execute(
+                insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                values,
+            ).scalars().all()
+
+        links = [
+            {"todo_id": todo_id, "tag_id": tag_id}
+            for todo_id, ids in zip(new_ids, tag_ids)
+            for tag_id in ids
+        ]
+        if links:
+            self.db.execute(insert(todo_tags), links)
+
+        self.versions.bump(owner_id)
+        self.db.commit()
+        return list(new_ids)
+
+    def bulk_update(self, changes: List[tuple[Todo, dict, Optional[List[Tag]]]]) -> None:
+        """Apply (todo, values, tags) changes to loaded todos and commit once.
+
+        `tags=None` leaves a todo's tags untouched. Rows that set the same
+        columns are flushed as one executemany UPDATE.
+        """
+        for db_todo, values, tags in changes:
+            for key, value in values.items():
+                setattr(db_todo, key, value)
+            if tags is not None:
+                db_todo.tags = tags
+        if changes:
+            self.versions.bump(changes[0][0].owner_id)
+        self.db.commit()
+
+    def delete_many(self, todo_ids: List[int], owner_id: int) -> List[int]:
+        """Soft delete the owner's todos among `todo_ids` in one statement. Returns deleted ids."""
+        deleted = self.db.execute(_soft_delete_stmt(owner_id, _todos.c.id.in_(todo_ids))).scalars().all()
+        if deleted:
+            self.versions.bump(owner_id)
+            self.db.commit()
+        return list(deleted)
+
     def delete_completed(self, owner_id: int) -> int:
-        """Delete all completed todos for the owner. Returns count of deleted items."""
-        count = self.db.query(Todo).filter(
-            Todo.owner_id == owner_id,
-            Todo.is_done == True
-        ).delete()
+        """Soft delete all completed todos for the owner. Returns count of deleted items.
+
+        Only deleted_at is written, so even a large account is a quick
+        UPDATE; the rows, their tag links and FTS entries are removed in
+        small batches by TodoPurger.
+        """
+        count = self.db.execute(_soft_delete_stmt(owner_id, _todos.c.is_done == True, returning=False)).rowcount
+        if count:
+            self.versions.bump(owner_id)
         self.db.commit()
         return count
 
@@ -5,6 +5,7 @@ from fastapi import Depends
 from ..models.user import User
 from ..schemas.user import UserCreate
 from ..core.database import get_db
+from ..core.group_commit import unit_of_work
 from ..core.security import get_password_hash
 
 
@@ -12,14 +13,19 @@ class UserRepository:
     def __init__(self, db: Session):
         self.db = db
 
+    def with_session(self, db: Session) -> "UserRepository":
+        return UserRepository(db)
+
     def get_by_email(self, email: str) -> Optional[User]:
         return self.db.query(User).filter(User.email == email).first()
 
     def get_by_id(self, user_id: int) -> Optional[User]:
         return self.db.query(User).filter(User.id == user_id).first()
 
-    def create(self, user_data: UserCreate) -> User:
-        hashed_pw = get_password_hash(user_data.password)
+    @unit_of_work
+    def create(self, user_data: UserCreate, hashed_password: Optional[str] = None) -> User:
+        # Routes hash in the password worker pool and pass the result in
+        hashed_pw = hashed_password or get_password_hash(user_data.password)
         new_user = User(
             email=user_data.email,
             hashed_password=hashed_pw,
@@ -29,6 +35,15 @@ class UserRepository:
         self.db.refresh(new_user)
         return new_user
 
+    @unit_of_work
+    def update_password_hash(self, user_id: int, hashed_password: str) -> Optional[User]:
+        user = self.get_by_id(user_id)
+        if user is None:
+            return None
+        user.hashed_password = hashed_password
+        self.db.commit()
+        return user
+
 
 # Dependency Injection Helper
 def get_user_repo(db: Session = Depends(get_db)) -> UserRepository:
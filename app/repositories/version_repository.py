@@ -0,0 +1,43 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..core.database import upsert
+from ..models.data_version import DataVersion
+
+
+def bump_version_stmt(owner_id: int):
+    """Upsert that increments (or starts) the owner's data version."""
+    stmt = upsert(DataVersion).values(owner_id=owner_id, version=1)
+    return stmt.on_conflict_do_update(
+        index_elements=[DataVersion.owner_id],
+        set_={"version": DataVersion.version + 1},
+    )
+
+
+def get_version_stmt(owner_id: int):
+    return select(DataVersion.version).where(DataVersion.owner_id == owner_id)
+
+
+class DataVersionRepository:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get(self, owner_id: int) -> int:
+        return self.db.execute(get_version_stmt(owner_id)).scalar() or 0
+
+    def bump(self, owner_id: int) -> None:
+        """Run inside the write's transaction; the caller commits."""
+        self.db.execute(bump_version_stmt(owner_id))
+
+
+class AsyncDataVersionRepository:
+    """AsyncSession counterpart of DataVersionRepository (settings.DB_ASYNC)."""
+
+    def __init__(self, db):
+        self.db = db
+
+    async def get(self, owner_id: int) -> int:
+        return (await self.db.execute(get_version_stmt(owner_id))).scalar() or 0
+
+    async def bump(self, owner_id: int) -> None:
+        await self.db.execute(bump_version_stmt(owner_id))
@@ -0,0 +1,68 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.exc import IntegrityError
+
+from ..core.security import create_access_token
+from ..core.password_hasher import password_hasher
+from ..repositories.async_user_repository import AsyncUserRepository, get_async_user_repo
+from ..schemas.user import UserCreate, UserResponse, Token
+from ..api.deps import get_current_user_async
+from ..core.auth_cache import Principal
+
+# async def mirror of routers/auth.py, mounted instead of it when settings.DB_ASYNC
+router = APIRouter(prefix="/auth", tags=["auth"])
+
+
+@router.post("/register", response_model=UserResponse, status_code=201)
+async def register(user_data: UserCreate, repo: AsyncUserRepository = Depends(get_async_user_repo)):
+    """Register a new user account."""
+    if await repo.get_by_email(user_data.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email đã được đăng ký",
+        )
+    # Release the pooled connection while hashing
+    await repo.db.close()
+
+    # bcrypt is CPU-bound: keep it off the event loop
+    hashed_password = await password_hasher.hash(user_data.password)
+    try:
+        return await repo.create(user_data, hashed_password)
+    except IntegrityError:  # same email registered while we were hashing
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email đã được đăng ký",
+        )
+
+
+@router.post("/login", response_model=Token)
+async def login(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    repo: AsyncUserRepository = Depends(get_async_user_repo),
+):
+    """Authenticate and return a JWT access token."""
+    user = await repo.get_by_email(form_data.username)  # OAuth2 uses 'username' field
+    await repo.db.close()  # user stays loaded (detached); don't pin a connection while hashing
+
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+    if not valid:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Email hoặc mật khẩu không đúng",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this hash was made
+        await repo.update_password_hash(user.id, new_hash)
+
+    access_token = create_access_token(data={"user_id": user.id, "sub": user.email})
+    return {"access_token": access_token, "token_type": "bearer"}
+
+
+@router.get("/me", response_model=UserResponse)
+async def read_current_user(current_user: Principal = Depends(get_current_user_async)):
+    """Return the currently authenticated user's profile."""
+    return current_user
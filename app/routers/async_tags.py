@@ -0,0 +1,58 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List
+from sqlalchemy.exc import IntegrityError
+from ..schemas.tag import TagCreate, TagResponse
+from ..repositories.async_tag_repository import AsyncTagRepository, get_async_tag_repo
+from ..api.deps import get_current_user_async
+from ..api.conditional import conditional_get_async
+from ..core.auth_cache import Principal
+
+# async def mirror of routers/tags.py, mounted instead of it when settings.DB_ASYNC
+router = APIRouter(prefix="/tags", tags=["tags"])
+
+
+@router.get("/", response_model=List[TagResponse], dependencies=[Depends(conditional_get_async(time_sensitive=False))])
+async def list_tags(
+    repo: AsyncTagRepository = Depends(get_async_tag_repo),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    return await repo.get_all(current_user.id)
+
+
+@router.post("/", response_model=TagResponse, status_code=201)
+async def create_tag(
+    tag_data: TagCreate,
+    repo: AsyncTagRepository = Depends(get_async_tag_repo),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    try:
+        return await repo.create(tag_data, current_user.id)
+    except IntegrityError:  # uq_tags_owner_name
+        raise HTTPException(status_code=409, detail="Tag đã tồn tại")
+
+
+@router.put("/{tag_id}", response_model=TagResponse)
+async def update_tag(
+    tag_id: int,
+    tag_data: TagCreate,
+    repo: AsyncTagRepository = Depends(get_async_tag_repo),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    try:
+        tag = await repo.update(tag_id, tag_data, current_user.id)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Tag đã tồn tại")
+    if not tag:
+        raise HTTPException(status_code=404, detail="Tag không tồn tại")
+    return tag
+
+
+@router.delete("/{tag_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_tag(
+    tag_id: int,
+    repo: AsyncTagRepository = Depends(get_async_tag_repo),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    success = await repo.delete(tag_id, current_user.id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Tag không tồn tại")
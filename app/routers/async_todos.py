@@ -0,0 +1,114 @@
+from fastapi import APIRouter, Depends, Query, Path, Response
+from typing import Optional, List
+from ..schemas.todo import TodoCreate, TodoUpdate, TodoResponse, PaginatedResponse
+from ..services.async_todo_service import AsyncTodoService, get_async_todo_service
+from ..api.deps import get_current_user_async
+from ..api.responses import json_response
+from ..api.conditional import conditional_get_async
+from ..core.auth_cache import Principal
+
+# async def mirror of routers/todos.py, mounted instead of it when settings.DB_ASYNC
+router = APIRouter()
+
+
+@router.get("/todos", response_model=PaginatedResponse, dependencies=[Depends(conditional_get_async())])
+async def read_todos(
+    response: Response,
+    skip: int = Query(0, ge=0, alias="offset"),
+    limit: int = Query(10, ge=1, le=100),
+    q: Optional[str] = None,
+    is_done: Optional[bool] = None,
+    sort_desc: bool = True,
+    tag_id: Optional[int] = None,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass an empty value for the first page, then next_cursor"),
+    sort: str = Query("created_at", pattern="^(created_at|relevance)$", description="'relevance' ranks `q` matches by bm25"),
+    include_total: bool = Query(True, description="false: skip the total, only report has_more"),
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    page = await service.get_todos(current_user.id, skip, limit, q, is_done, sort_desc, tag_id, cursor, sort, include_total)
+    return json_response(page, response)
+
+
+@router.get("/todos/overdue", response_model=List[TodoResponse], dependencies=[Depends(conditional_get_async())])
+async def read_overdue_todos(
+    response: Response,
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    """List tasks that are past their due_date and not yet completed."""
+    return json_response(await service.get_overdue_todos(current_user.id), response)
+
+
+@router.get("/todos/today", response_model=List[TodoResponse], dependencies=[Depends(conditional_get_async())])
+async def read_today_todos(
+    response: Response,
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    """List tasks scheduled for the current calendar day."""
+    return json_response(await service.get_today_todos(current_user.id), response)
+
+
+@router.post("/todos", response_model=TodoResponse, status_code=201)
+async def create_todo(
+    todo: TodoCreate,
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    return await service.create_todo(todo, current_user.id)
+
+
+@router.get("/todos/{todo_id}", response_model=TodoResponse)
+async def read_todo(
+    todo_id: int = Path(..., title="The ID of the todo to get"),
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    return await service.get_todo(todo_id, current_user.id)
+
+
+@router.put("/todos/{todo_id}", response_model=TodoResponse)
+async def update_todo(
+    todo_id: int,
+    todo: TodoCreate,
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    return await service.update_todo(todo_id, todo, current_user.id)
+
+
+@router.patch("/todos/{todo_id}", response_model=TodoResponse)
+async def patch_todo(
+    todo_id: int,
+    todo: TodoUpdate,
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    return await service.update_todo(todo_id, todo, current_user.id)
+
+
+@router.post("/todos/{todo_id}/complete", response_model=TodoResponse)
+async def complete_todo(
+    todo_id: int,
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    return await service.complete_todo(todo_id, current_user.id)
+
+
+@router.delete("/todos/completed")
+async def delete_completed_todos(
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    return await service.delete_completed_todos(current_user.id)
+
+
+@router.delete("/todos/{todo_id}")
+async def delete_todo(
+    todo_id: int,
+    service: AsyncTodoService = Depends(get_async_todo_service),
+    current_user: Principal = Depends(get_current_user_async),
+):
+    return await service.delete_todo(todo_id, current_user.id)
@@ -1,9 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from ..core.database import get_db
-from ..core.security import verify_password, create_access_token
+from ..core.security import create_access_token
+from ..core.password_hasher import password_hasher
 from ..repositories.user_repository import UserRepository
 from ..schemas.user import UserCreate, UserResponse, Token
 from ..api.deps import get_current_user
@@ -12,38 +15,58 @@ from ..models.user import User
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
+# async def so bcrypt waits on the password worker pool, not a threadpool slot;
+# the (short) DB calls are handed to the threadpool explicitly. The session is
+# closed before hashing so a login storm doesn't pin every pooled connection.
+
 @router.post("/register", response_model=UserResponse, status_code=201)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
     """Register a new user account."""
     repo = UserRepository(db)
 
     # Check if email already exists
-    if repo.get_by_email(user_data.email):
+    if await run_in_threadpool(repo.get_by_email, user_data.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email đã được đăng ký",
         )
+    await run_in_threadpool(db.close)
 
-    new_user = repo.create(user_data)
+    hashed_password = await password_hasher.hash(user_data.password)
+    try:
+        new_user = await run_in_threadpool(repo.create, user_data, hashed_password)
+    except IntegrityError:  # same email registered while we were hashing
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email đã được đăng ký",
+        )
     return new_user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db),
 ):
     """Authenticate and return a JWT access token."""
     repo = UserRepository(db)
-    user = repo.get_by_email(form_data.username)  # OAuth2 uses 'username' field
+    user = await run_in_threadpool(repo.get_by_email, form_data.username)  # OAuth2 uses 'username' field
+    await run_in_threadpool(db.close)  # user stays loaded (detached)
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    valid, new_hash = (False, None)
+    if user:
+        valid, new_hash = await password_hasher.verify_and_update(form_data.password, user.hashed_password)
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Email hoặc mật khẩu không đúng",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this hash was made
+        await run_in_threadpool(repo.update_password_hash, user.id, new_hash)
+
     access_token = create_access_token(data={"user_id": user.id, "sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
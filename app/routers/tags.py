@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from typing import List
+from sqlalchemy.exc import IntegrityError
 from ..schemas.tag import TagCreate, TagResponse
 from ..repositories.tag_repository import TagRepository, get_tag_repo
 from ..api.deps import get_current_user
+from ..api.conditional import conditional_get
 from ..models.user import User
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
 
-@router.get("/", response_model=List[TagResponse])
+@router.get("/", response_model=List[TagResponse], dependencies=[Depends(conditional_get(time_sensitive=False))])
 def list_tags(
     repo: TagRepository = Depends(get_tag_repo),
     current_user: User = Depends(get_current_user),
@@ -22,7 +24,10 @@ def create_tag(
     repo: TagRepository = Depends(get_tag_repo),
     current_user: User = Depends(get_current_user),
 ):
-    return repo.create(tag_data, current_user.id)
+    try:
+        return repo.create(tag_data, current_user.id)
+    except IntegrityError:  # uq_tags_owner_name
+        raise HTTPException(status_code=409, detail="Tag đã tồn tại")
 
 
 @router.put("/{tag_id}", response_model=TagResponse)
@@ -32,7 +37,10 @@ def update_tag(
     repo: TagRepository = Depends(get_tag_repo),
     current_user: User = Depends(get_current_user),
 ):
-    tag = repo.update(tag_id, tag_data, current_user.id)
+    try:
+        tag = repo.update(tag_id, tag_data, current_user.id)
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Tag đã tồn tại")
     if not tag:
         raise HTTPException(status_code=404, detail="Tag không tồn tại")
     return tag
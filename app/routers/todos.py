@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, Query, Path, HTTPException
+from fastapi import APIRouter, Depends, Query, Path, Response, HTTPException
 from typing import Optional, List
 from ..schemas.todo import TodoCreate, TodoUpdate, TodoResponse, PaginatedResponse
 from ..services.todo_service import TodoService, get_todo_service
 from ..api.deps import get_current_user
+from ..api.responses import json_response
+from ..api.conditional import conditional_get
 from ..models.user import User
 
 router = APIRouter()
@@ -10,38 +12,45 @@ router = APIRouter()
 # ─── All endpoints require authentication ───
 
 
-@router.get("/todos", response_model=PaginatedResponse)
+@router.get("/todos", response_model=PaginatedResponse, dependencies=[Depends(conditional_get())])
 def read_todos(
+    response: Response,
     skip: int = Query(0, ge=0, alias="offset"),
     limit: int = Query(10, ge=1, le=100),
     q: Optional[str] = None,
     is_done: Optional[bool] = None,
     sort_desc: bool = True,
     tag_id: Optional[int] = None,
+    cursor: Optional[str] = Query(None, description="Keyset pagination: pass an empty value for the first page, then next_cursor"),
+    sort: str = Query("created_at", pattern="^(created_at|relevance)$", description="'relevance' ranks `q` matches by bm25"),
+    include_total: bool = Query(True, description="false: skip the total, only report has_more"),
     service: TodoService = Depends(get_todo_service),
     current_user: User = Depends(get_current_user),
 ):
-    return service.get_todos(current_user.id, skip, limit, q, is_done, sort_desc, tag_id)
+    page = service.get_todos(current_user.id, skip, limit, q, is_done, sort_desc, tag_id, cursor, sort, include_total)
+    return json_response(page, response)
 
 
 # ─── Smart Retrieval Endpoints (Level 6) ───
 
-@router.get("/todos/overdue", response_model=List[TodoResponse])
+@router.get("/todos/overdue", response_model=List[TodoResponse], dependencies=[Depends(conditional_get())])
 def read_overdue_todos(
+    response: Response,
     service: TodoService = Depends(get_todo_service),
     current_user: User = Depends(get_current_user),
 ):
     """List tasks that are past their due_date and not yet completed."""
-    return service.get_overdue_todos(current_user.id)
+    return json_response(service.get_overdue_todos(current_user.id), response)
 
 
-@router.get("/todos/today", response_model=List[TodoResponse])
+@router.get("/todos/today", response_model=List[TodoResponse], dependencies=[Depends(conditional_get())])
 def read_today_todos(
+    response: Response,
     service: TodoService = Depends(get_todo_service),
     current_user: User = Depends(get_current_user),
 ):
     """List tasks scheduled for the current calendar day."""
-    return service.get_today_todos(current_user.id)
+    return json_response(service.get_today_todos(current_user.id), response)
 
 
 @router.post("/todos", response_model=TodoResponse, status_code=201)
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends
+from ..schemas.todo import TodoBulkCreate, TodoBulkUpdate, TodoBulkDelete, BulkResponse
+from ..services.todo_service import TodoService, get_todo_service
+from ..api.deps import get_current_user
+from ..models.user import User
+
+# Mounted before the /todos/{todo_id} routes (both stacks) so "bulk" is not read as an id
+router = APIRouter()
+
+
+@router.post("/todos/bulk", response_model=BulkResponse)
+def bulk_create_todos(
+    payload: TodoBulkCreate,
+    service: TodoService = Depends(get_todo_service),
+    current_user: User = Depends(get_current_user),
+):
+    """Create up to 500 todos in one transaction. Per-item results keep request order."""
+    return service.bulk_create_todos(payload.items, current_user.id)
+
+
+@router.patch("/todos/bulk", response_model=BulkResponse)
+def bulk_update_todos(
+    payload: TodoBulkUpdate,
+    service: TodoService = Depends(get_todo_service),
+    current_user: User = Depends(get_current_user),
+):
+    """Partially update up to 500 todos in one transaction."""
+    return service.bulk_update_todos(payload.items, current_user.id)
+
+
+@router.delete("/todos/bulk", response_model=BulkResponse)
+def bulk_delete_todos(
+    payload: TodoBulkDelete,
+    service: TodoService = Depends(get_todo_service),
+    current_user: User = Depends(get_current_user),
+):
+    """Delete up to 500 todos in one transaction."""
+    return service.bulk_delete_todos(payload.ids, current_user.id)
@@ -0,0 +1,84 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from ..core.config import settings
+from ..core.events import change_broker, EVICTED
+from ..core.auth_cache import Principal
+from ..api.deps import get_stream_user, stream_principal
+
+# Mounted before the /todos/{todo_id} routes (both stacks), like todos_bulk
+router = APIRouter()
+
+
+async def _sse_stream(owner_id: int):
+    # Subscribe inside the generator so the finally block always unsubscribes
+    subscription = change_broker.subscribe(owner_id)
+    try:
+        yield "retry: 3000\nevent: ready\ndata: {}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), settings.EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is EVICTED:
+                yield "event: evicted\ndata: {}\n\n"
+                return
+            yield event.sse()
+    finally:
+        change_broker.unsubscribe(subscription)
+
+
+@router.get("/todos/stream")
+async def stream_changes(current_user: Principal = Depends(get_stream_user)):
+    """Server-Sent Events with the current user's todo/tag changes.
+
+    Events: todo.created/updated/completed/deleted, todos.bulk_created/
+    bulk_updated/bulk_deleted/completed_deleted/imported and tag.created/
+    updated/deleted. After `evicted` (client too slow), reconnect and refetch.
+    """
+    return StreamingResponse(
+        _sse_stream(current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/todos/ws")
+async def websocket_changes(websocket: WebSocket):
+    """Same feed as /todos/stream, one JSON message per event.
+
+    Authenticate with ?access_token= or an Authorization: Bearer header.
+    """
+    authorization = websocket.headers.get("authorization", "")
+    token = websocket.query_params.get("access_token") or authorization.removeprefix("Bearer ").strip()
+    try:
+        principal = await run_in_threadpool(stream_principal, token)
+    except HTTPException:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    await websocket.accept()
+
+    subscription = change_broker.subscribe(principal.id)
+
+    async def send_events():
+        while True:
+            event = await subscription.queue.get()
+            if event is EVICTED:
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+            await websocket.send_text(event.json())
+
+    async def wait_for_disconnect():
+        async for _ in websocket.iter_text():
+            pass
+
+    tasks = {asyncio.ensure_future(send_events()), asyncio.ensure_future(wait_for_disconnect())}
+    try:
+        _, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in pending:
+            task.cancel()
+    finally:
+        change_broker.unsubscribe(subscription)
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends
+from ..schemas.todo import TodoStats
+from ..services.stats_service import StatsService, get_stats_service
+from ..api.deps import get_current_user
+from ..api.conditional import conditional_get
+from ..models.user import User
+
+# Mounted before the /todos/{todo_id} routes (both stacks), like todos_bulk
+router = APIRouter()
+
+
+@router.get("/todos/stats", response_model=TodoStats, dependencies=[Depends(conditional_get())])
+def read_todo_stats(
+    service: StatsService = Depends(get_stats_service),
+    current_user: User = Depends(get_current_user),
+):
+    """Done/open/overdue/due-today counts, per-tag counts and due-date histograms."""
+    return service.get_stats(current_user.id)
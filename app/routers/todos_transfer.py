@@ -0,0 +1,52 @@
+from anyio import from_thread
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from ..core.config import settings
+from ..schemas.todo import ImportSummary
+from ..services.todo_transfer import stream_export, iter_lines, TodoImporter, EXPORT_MEDIA_TYPES
+from ..api.deps import get_current_user
+from ..models.user import User
+
+# Mounted before the /todos/{todo_id} routes (both stacks), like todos_bulk
+router = APIRouter()
+
+
+@router.get("/todos/export")
+def export_todos(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_user),
+):
+    """Stream every todo of the current user, oldest first, in constant memory."""
+    return StreamingResponse(
+        stream_export(current_user.id, format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="todos.{format}"'},
+    )
+
+
+@router.post("/todos/import", response_model=ImportSummary)
+async def import_todos(
+    request: Request,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    batch_size: int = Query(settings.IMPORT_BATCH_SIZE, ge=1, le=10000),
+    current_user: User = Depends(get_current_user),
+):
+    """Import todos from an NDJSON/CSV request body (same columns as the export).
+
+    The body is parsed as it arrives and inserted batch_size rows per
+    transaction; invalid lines, and batches that fail to insert, are
+    reported and skipped.
+    """
+    body = request.stream()
+
+    def chunks():
+        # Runs in the worker thread: pull the next body chunk from the event loop
+        while True:
+            try:
+                yield from_thread.run(body.__anext__)
+            except StopAsyncIteration:
+                return
+
+    importer = TodoImporter(current_user.id, batch_size)
+    return await run_in_threadpool(importer.run, iter_lines(chunks()), format)
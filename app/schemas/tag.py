@@ -1,5 +1,8 @@
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List
+from pydantic import BaseModel, Field, ConfigDict, StringConstraints
+from typing import Annotated, Optional, List
+
+# A tag referenced by name (TodoCreate/TodoUpdate.tag_names, import rows)
+TagName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1, max_length=50)]
 
 
 class TagBase(BaseModel):
@@ -1,7 +1,7 @@
-from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, Field, ConfigDict, field_validator
+from datetime import date, datetime
 from typing import Optional, List
-from .tag import TagResponse
+from .tag import TagResponse, TagName
 
 # Base Model
 class TodoBase(BaseModel):
@@ -15,6 +15,7 @@ class TodoBase(BaseModel):
 # Create Model
 class TodoCreate(TodoBase):
     tag_ids: Optional[List[int]] = None  # Level 6: Assign tags on creation
+    tag_names: Optional[List[TagName]] = None  # Missing tags are created
 
 # Patch Model (Partial Update)
 class TodoUpdate(BaseModel):
@@ -25,6 +26,7 @@ class TodoUpdate(BaseModel):
     is_done: Optional[bool] = None
     due_date: Optional[datetime] = None  # Level 6: Update deadline
     tag_ids: Optional[List[int]] = None  # Level 6: Update tags
+    tag_names: Optional[List[TagName]] = None  # Combined with tag_ids; missing tags are created
 
 # Response Model
 class TodoResponse(TodoBase):
@@ -39,6 +41,104 @@ class TodoResponse(TodoBase):
 
 class PaginatedResponse(BaseModel):
     items: List[TodoResponse]
-    total: int
+    total: Optional[int] = None  # Not computed in cursor mode
     limit: int
     offset: int
+    next_cursor: Optional[str] = None  # Opaque key of the next page (cursor mode)
+    has_more: Optional[bool] = None
+
+# Bulk Models
+BULK_MAX_ITEMS = 500
+
+class TodoBulkCreate(BaseModel):
+    items: List[TodoCreate] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class TodoBulkUpdateItem(TodoUpdate):
+    id: int
+
+class TodoBulkUpdate(BaseModel):
+    items: List[TodoBulkUpdateItem] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class TodoBulkDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+class BulkItemResult(BaseModel):
+    index: int  # Position in the request batch
+    id: Optional[int] = None
+    status: int  # HTTP status this item would have had as a single request
+    detail: Optional[str] = None
+    item: Optional[TodoResponse] = None
+
+class BulkResponse(BaseModel):
+    results: List[BulkItemResult]
+    succeeded: int
+    failed: int
+
+# Import Models
+class TodoImportRow(TodoBase):
+    """One NDJSON line / CSV row of POST /todos/import. Tags are given by name."""
+    created_at: Optional[datetime] = None  # Kept when migrating from another tool
+    tags: List[TagName] = []
+
+    @field_validator("description", "due_date", "created_at", mode="before")
+    @classmethod
+    def _empty_is_none(cls, value):
+        return None if value == "" else value
+
+    @field_validator("is_done", mode="before")
+    @classmethod
+    def _empty_is_false(cls, value):
+        return False if value in ("", None) else value
+
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _tag_names(cls, value):
+        # CSV: "a;b", NDJSON: ["a", "b"] or the export's [{"name": "a", ...}]
+        if value in ("", None):
+            return []
+        if isinstance(value, str):
+            value = value.split(";")
+        names = [v.get("name") if isinstance(v, dict) else v for v in value]
+        return [n.strip() for n in names if isinstance(n, str) and n.strip()]
+
+class ImportLineError(BaseModel):
+    line: int  # 1-based line (CSV: record's last line) of the input
+    detail: str
+    last_line: Optional[int] = None  # A failed batch: lines line..last_line were not imported
+
+class ImportSummary(BaseModel):
+    lines: int  # Records read, excluding blank lines and the CSV header
+    imported: int
+    failed: int
+    batches: int
+    tags_created: int
+    elapsed_seconds: float
+    rows_per_second: float
+    errors: List[ImportLineError]
+    errors_truncated: bool = False
+
+# Stats Models
+class DueBucket(BaseModel):
+    start: date  # The day, or the Monday of the week
+    total: int
+    done: int
+    overdue: int
+
+class TagStats(BaseModel):
+    id: int
+    name: str
+    color: Optional[str] = None
+    total: int
+    done: int
+
+class TodoStats(BaseModel):
+    total: int
+    done: int
+    open: int
+    overdue: int
+    due_today: int
+    no_due_date: int
+    by_tag: List[TagStats]
+    due_by_day: List[DueBucket]
+    due_by_week: List[DueBucket]
+    generated_at: datetime  # Stats may be served from a memo for a few seconds
@@ -0,0 +1,138 @@
+from typing import Optional, Union, List
+from datetime import datetime
+from fastapi import HTTPException, Depends
+from ..core.database import get_async_db
+from ..core.events import change_broker
+from ..schemas.todo import TodoCreate, TodoUpdate
+from ..repositories.async_todo_repository import AsyncTodoRepository
+from ..repositories.async_tag_repository import AsyncTagRepository
+from .todo_service import _make_naive, _enrich_todo, _enrich_todos, _page, _encode_cursor, _decode_cursor
+
+
+class AsyncTodoService:
+    """Async counterpart of TodoService (settings.DB_ASYNC). Same rules, same errors."""
+
+    def __init__(self, repo: AsyncTodoRepository, tag_repo: AsyncTagRepository):
+        self.repo = repo
+        self.tag_repo = tag_repo
+
+    async def _resolve_tags(self, tag_ids: Optional[List[int]], owner_id: int, tag_names: Optional[List[str]] = None):
+        """Resolve tag_ids (filtered by owner) and tag_names (created if missing) to Tag ORM objects."""
+        if tag_ids is None and tag_names is None:
+            return None
+        tags = await self.tag_repo.get_by_ids(tag_ids, owner_id) if tag_ids else []
+        if tag_names:
+            tags += await self.tag_repo.get_by_names(tag_names, owner_id)
+        return list({t.id: t for t in tags}.values())
+
+    async def get_todos(
+        self,
+        owner_id: int,
+        skip: int = 0,
+        limit: int = 10,
+        q: Optional[str] = None,
+        is_done: Optional[bool] = None,
+        sort_desc: bool = True,
+        tag_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        sort: str = "created_at",
+        include_total: bool = True,
+    ) -> dict:
+        if cursor is not None:
+            if sort == "relevance":
+                raise HTTPException(status_code=400, detail="Không hỗ trợ cursor khi sắp xếp theo độ liên quan")
+            items = await self.repo.get_page_after(
+                owner_id=owner_id,
+                after=_decode_cursor(cursor),
+                limit=limit,
+                q=q,
+                is_done=is_done,
+                sort_desc=sort_desc,
+                tag_id=tag_id,
+            )
+            has_more = len(items) > limit
+            items = items[:limit]
+            return _page(
+                _enrich_todos(items), limit, 0,
+                next_cursor=_encode_cursor(items[-1]) if has_more else None,
+                has_more=has_more,
+            )
+
+        items, total = await self.repo.get_all(
+            owner_id=owner_id,
+            skip=skip,
+            limit=limit,
+            q=q,
+            is_done=is_done,
+            sort_desc=sort_desc,
+            tag_id=tag_id,
+            sort=sort,
+            include_total=include_total,
+        )
+        if total is None:
+            has_more = len(items) > limit
+            items = items[:limit]
+        else:
+            has_more = skip + len(items) < total
+        return _page(_enrich_todos(items), limit, skip, total=total, has_more=has_more)
+
+    async def create_todo(self, todo: TodoCreate, owner_id: int) -> dict:
+        if todo.due_date is not None and _make_naive(todo.due_date) <= datetime.utcnow():
+            raise HTTPException(
+                status_code=400,
+                detail="Deadline phải sau thời điểm hiện tại"
+            )
+        tags = await self._resolve_tags(todo.tag_ids, owner_id, todo.tag_names)
+        new_todo = await self.repo.create(todo, owner_id, tags=tags or [])
+        result = _enrich_todo(new_todo)
+        change_broker.publish(owner_id, "todo.created", result)
+        return result
+
+    async def get_todo(self, todo_id: int, owner_id: int) -> dict:
+        todo = await self.repo.get_record(todo_id, owner_id)
+        if not todo:
+            raise HTTPException(status_code=404, detail="Task không tồn tại hoặc không thuộc về bạn")
+        return _enrich_todo(todo)
+
+    async def update_todo(self, todo_id: int, todo_update: Union[TodoCreate, TodoUpdate], owner_id: int, event_type: str = "todo.updated") -> dict:
+        tags = await self._resolve_tags(getattr(todo_update, 'tag_ids', None), owner_id, getattr(todo_update, 'tag_names', None))
+        # One UPDATE ... RETURNING checks ownership and the deadline rule (due_date > created_at)
+        updated_todo = await self.repo.update(todo_id, todo_update, owner_id, tags=tags)
+        if not updated_todo:
+            # Rare path: find out which rule the UPDATE's WHERE clause rejected
+            if getattr(todo_update, 'due_date', None) is not None and await self.repo.get_by_id(todo_id, owner_id):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Deadline phải sau thời điểm tạo công việc"
+                )
+            raise HTTPException(status_code=404, detail="Task không tồn tại hoặc không thuộc về bạn")
+        result = _enrich_todo(updated_todo)
+        change_broker.publish(owner_id, event_type, result)
+        return result
+
+    async def delete_todo(self, todo_id: int, owner_id: int):
+        success = await self.repo.delete(todo_id, owner_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="Task không tồn tại hoặc không thuộc về bạn")
+        change_broker.publish(owner_id, "todo.deleted", {"id": todo_id})
+        return {"message": "Xóa thành công"}
+
+    async def complete_todo(self, todo_id: int, owner_id: int) -> dict:
+        return await self.update_todo(todo_id, TodoUpdate(is_done=True), owner_id, event_type="todo.completed")
+
+    async def delete_completed_todos(self, owner_id: int) -> dict:
+        count = await self.repo.delete_completed(owner_id)
+        if count:
+            change_broker.publish(owner_id, "todos.completed_deleted", {"count": count})
+        return {"message": f"Deleted {count} completed tasks", "count": count}
+
+    async def get_overdue_todos(self, owner_id: int) -> List[dict]:
+        return _enrich_todos(await self.repo.get_overdue(owner_id))
+
+    async def get_today_todos(self, owner_id: int) -> List[dict]:
+        return _enrich_todos(await self.repo.get_today(owner_id))
+
+
+# Dependency Injection Helper — MUST share a single DB session
+def get_async_todo_service(db=Depends(get_async_db)) -> AsyncTodoService:
+    return AsyncTodoService(AsyncTodoRepository(db), AsyncTagRepository(db))
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from fastapi import Depends
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import get_db
+from ..repositories.todo_repository import TodoRepository, utc_today
+from ..repositories.version_repository import DataVersionRepository
+from ..schemas.todo import DueBucket, TagStats, TodoStats
+
+
+class StatsMemo:
+    """Bounded per-owner memo of TodoStats, keyed by the owner's data version.
+
+    Every repository write bumps the version, so a write invalidates the
+    entry; the TTL bounds how stale the time-dependent counts (overdue,
+    due today) can get without a write.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, tuple[int, float, TodoStats]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, owner_id: int, version: int) -> Optional[TodoStats]:
+        with self._lock:
+            entry = self._entries.get(owner_id)
+            if entry is None:
+                return None
+            cached_version, expires_at, stats = entry
+            if cached_version != version or expires_at <= time.monotonic():
+                del self._entries[owner_id]
+                return None
+            self._entries.move_to_end(owner_id)
+            return stats
+
+    def put(self, owner_id: int, version: int, stats: TodoStats) -> None:
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[owner_id] = (version, time.monotonic() + self.ttl_seconds, stats)
+            self._entries.move_to_end(owner_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+stats_memo = StatsMemo(settings.STATS_CACHE_MAX_SIZE, settings.STATS_CACHE_TTL_SECONDS)
+
+
+def _as_date(value) -> Optional[date]:
+    # SQLite's date() returns 'YYYY-MM-DD' text
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+
+def _build_stats(due_rows, tag_rows, now: datetime) -> TodoStats:
+    today = utc_today(now)
+    total = done = overdue = due_today = no_due_date = 0
+    by_day, by_week = [], {}
+    for day, day_total, day_done, day_overdue in due_rows:
+        day = _as_date(day)
+        day_done, day_overdue = day_done or 0, day_overdue or 0
+        total += day_total
+        done += day_done
+        overdue += day_overdue
+        if day is None:
+            no_due_date = day_total
+            continue
+        if day == today:
+            due_today = day_total
+        by_day.append(DueBucket(start=day, total=day_total, done=day_done, overdue=day_overdue))
+        week = by_week.setdefault(day - timedelta(days=day.weekday()), [0, 0, 0])
+        week[0] += day_total
+        week[1] += day_done
+        week[2] += day_overdue
+
+    return TodoStats(
+        total=total,
+        done=done,
+        open=total - done,
+        overdue=overdue,
+        due_today=due_today,
+        no_due_date=no_due_date,
+        by_tag=[
+            TagStats(id=tag_id, name=name, color=color, total=tag_total, done=tag_done)
+            for tag_id, name, color, tag_total, tag_done in tag_rows
+        ],
+        due_by_day=by_day,
+        due_by_week=[
+            DueBucket(start=start, total=t, done=d, overdue=o)
+            for start, (t, d, o) in sorted(by_week.items())
+        ],
+        generated_at=now,
+    )
+
+
+class StatsService:
+    def __init__(self, repo: TodoRepository, versions: DataVersionRepository):
+        self.repo = repo
+        self.versions = versions
+
+    def get_stats(self, owner_id: int) -> TodoStats:
+        """Dashboard counts: one aggregate scan of the owner's todos plus the
+        per-tag counters, memoized until the next write (or the TTL)."""
+        version = self.versions.get(owner_id)
+        stats = stats_memo.get(owner_id, version)
+        if stats is not None:
+            return stats
+        now = datetime.utcnow()
+        stats = _build_stats(self.repo.get_due_stats(owner_id, now), self.repo.get_tag_stats(owner_id), now)
+        stats_memo.put(owner_id, version, stats)
+        return stats
+
+
+# Dependency Injection Helper — MUST share a single DB session
+def get_stats_service(db: Session = Depends(get_db)) -> StatsService:
+    return StatsService(TodoRepository(db), DataVersionRepository(db))
@@ -0,0 +1,126 @@
+"""Background hard-delete of soft-deleted todos.
+
+Deletes only set todos.deleted_at. A daemon thread removes those rows (their
+todo_tags links and, through triggers, their FTS entries) in short
+transactions, sized so each one holds the SQLite write lock for about
+PURGE_BATCH_TARGET_SECONDS, then returns free pages to the filesystem with
+PRAGMA incremental_vacuum instead of a blocking full VACUUM.
+"""
+import logging
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import delete, select
+
+from ..core.config import settings
+from ..core.database import SessionLocal, engine
+from ..core.metrics import TODOS_PURGED, PURGE_BATCH_LATENCY, PAGES_VACUUMED
+from ..models.todo import Todo
+from ..models.tag import todo_tags
+
+logger = logging.getLogger("app.purger")
+
+_todos = Todo.__table__
+
+
+class TodoPurger:
+    def __init__(self, interval: float, batch_size: int, target_seconds: float,
+                 pause_seconds: float, vacuum_pages: int):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.target_seconds = target_seconds
+        self.pause_seconds = pause_seconds
+        self.vacuum_pages = vacuum_pages
+        self.min_batch = max(1, min(10, batch_size))
+        self.max_batch = batch_size * 10
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="todo-purger", daemon=True)
+        self._thread.start()
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.purge()
+            except Exception:
+                logger.exception("todo purge pass failed")
+
+    def purge_batch(self, db, limit: int) -> int:
+        """Hard-delete up to `limit` soft-deleted todos in one transaction."""
+        ids = db.execute(
+            select(_todos.c.id)
+            .where(_todos.c.deleted_at.is_not(None))
+            .order_by(_todos.c.deleted_at)
+            .limit(limit)
+        ).scalars().all()
+        if ids:
+            # Explicit, so links go even with SQLITE_FOREIGN_KEYS off; the
+            # counter triggers skip soft-deleted todos (already uncounted)
+            db.execute(delete(todo_tags).where(todo_tags.c.todo_id.in_(ids)))
+            db.execute(delete(_todos).where(_todos.c.id.in_(ids)))
+        db.commit()
+        return len(ids)
+
+    def purge(self) -> int:
+        """One pass: purge every soft-deleted todo, then vacuum. Returns rows purged."""
+        purged, limit = 0, self.batch_size
+        with SessionLocal() as db:
+            while not self._stop.is_set():
+                started = time.perf_counter()
+                count = self.purge_batch(db, limit)
+                elapsed = time.perf_counter() - started
+                if not count:
+                    break
+                purged += count
+                TODOS_PURGED.inc(amount=count)
+                PURGE_BATCH_LATENCY.observe(elapsed)
+                if count < limit:
+                    break
+                # Keep each write transaction near the target duration
+                if elapsed > self.target_seconds:
+                    limit = max(self.min_batch, limit // 2)
+                elif elapsed < self.target_seconds / 2:
+                    limit = min(self.max_batch, limit * 2)
+                self._stop.wait(self.pause_seconds)
+        vacuumed = self.vacuum()
+        if purged or vacuumed:
+            logger.info("purged %d soft-deleted todos, vacuumed %d pages", purged, vacuumed)
+        return purged
+
+    def vacuum(self) -> int:
+        """Return up to vacuum_pages free pages (auto_vacuum=INCREMENTAL only)."""
+        if self.vacuum_pages <= 0 or engine.dialect.name != "sqlite":
+            return 0
+        with engine.connect() as conn:
+            if conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+                return 0
+            free = conn.exec_driver_sql("PRAGMA freelist_count").scalar()
+            if not free:
+                return 0
+            pages = min(free, self.vacuum_pages)
+            # pysqlite steps a statement once (= one page); executescript()
+            # runs it to completion, in a single transaction
+            conn.connection.driver_connection.executescript(f"PRAGMA incremental_vacuum({pages});")
+        PAGES_VACUUMED.inc(amount=pages)
+        return pages
+
+
+todo_purger = TodoPurger(
+    interval=settings.PURGE_INTERVAL_SECONDS,
+    batch_size=settings.PURGE_BATCH_SIZE,
+    target_seconds=settings.PURGE_BATCH_TARGET_SECONDS,
+    pause_seconds=settings.PURGE_BATCH_PAUSE_SECONDS,
+    vacuum_pages=settings.PURGE_VACUUM_PAGES,
+)
@@ -1,9 +1,17 @@
+import base64
+import json
+from functools import partial
 from typing import Optional, Union, List
 from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, Depends
 from ..core.database import get_db
-from ..schemas.todo import TodoCreate, TodoUpdate, TodoResponse, PaginatedResponse
+from ..core.events import change_broker
+from ..core.group_commit import on_commit, unit_of_work
+from ..schemas.todo import (
+    TodoCreate, TodoUpdate,
+    TodoBulkUpdateItem, BulkItemResult, BulkResponse,
+)
 from ..repositories.todo_repository import TodoRepository
 from ..repositories.tag_repository import TagRepository
 
@@ -15,25 +23,69 @@ def _make_naive(dt):
     return dt
 
 
-def _enrich_todo(todo) -> dict:
-    """Convert a Todo ORM object to a dict with computed is_overdue field."""
-    data = {
-        "id": todo.id,
+def _encode_cursor(todo) -> str:
+    """Build an opaque cursor from the (created_at, id) key of the last row on a page."""
+    raw = json.dumps([todo.created_at.isoformat(), todo.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Optional[tuple]:
+    """Inverse of _encode_cursor. An empty cursor means "first page"."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, todo_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(todo_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Cursor không hợp lệ")
+
+
+def _enrich_todo(todo, now: Optional[datetime] = None) -> dict:
+    """Convert a Todo ORM object to a dict with computed is_overdue field.
+
+    Keys follow TodoResponse's field order and tags are plain dicts, so list
+    endpoints can encode the result as-is (see api/responses.json_response).
+    """
+    if now is None:
+        now = datetime.utcnow()
+    return {
         "title": todo.title,
         "description": todo.description,
         "is_done": todo.is_done,
         "due_date": todo.due_date,
+        "id": todo.id,
         "created_at": todo.created_at,
         "updated_at": todo.updated_at,
         "owner_id": todo.owner_id,
-        "tags": todo.tags,
+        "tags": [
+            {"name": t.name, "color": t.color, "id": t.id, "owner_id": t.owner_id}
+            for t in todo.tags
+        ],
         "is_overdue": (
             not todo.is_done
             and todo.due_date is not None
-            and todo.due_date < datetime.utcnow()
+            and todo.due_date < now
         ),
     }
-    return data
+
+
+def _enrich_todos(todos) -> List[dict]:
+    now = datetime.utcnow()
+    return [_enrich_todo(t, now) for t in todos]
+
+
+def _page(items: List[dict], limit: int, offset: int, total: Optional[int] = None,
+          next_cursor: Optional[str] = None, has_more: Optional[bool] = None) -> dict:
+    """PaginatedResponse as a plain dict (same keys, same order)."""
+    return {
+        "items": items,
+        "total": total,
+        "limit": limit,
+        "offset": offset,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
 
 
 class TodoService:
@@ -41,14 +93,26 @@ class TodoService:
         self.repo = repo
         self.tag_repo = tag_repo
 
-    def _resolve_tags(self, tag_ids: Optional[List[int]], owner_id: int):
-        """Resolve tag_ids to Tag ORM objects, filtered by owner."""
-        if tag_ids is None:
+    @property
+    def db(self) -> Session:
+        return self.repo.db
+
+    def with_session(self, db: Session) -> "TodoService":
+        """Same service on another session (group-commit units)."""
+        return TodoService(TodoRepository(db), TagRepository(db))
+
+    def _publish(self, owner_id: int, event_type: str, data) -> None:
+        """Send a change event once the write is committed."""
+        on_commit(self.db, partial(change_broker.publish, owner_id, event_type, data))
+
+    def _resolve_tags(self, tag_ids: Optional[List[int]], owner_id: int, tag_names: Optional[List[str]] = None):
+        """Resolve tag_ids (filtered by owner) and tag_names (created if missing) to Tag ORM objects."""
+        if tag_ids is None and tag_names is None:
             return None
-        if not tag_ids:
-            return []
-        tags = self.tag_repo.get_by_ids(tag_ids, owner_id)
-        return tags
+        tags = self.tag_repo.get_by_ids(tag_ids, owner_id) if tag_ids else []
+        if tag_names:
+            tags += self.tag_repo.get_by_names(tag_names, owner_id)
+        return list({t.id: t for t in tags}.values())
 
     def get_todos(
         self,
@@ -59,7 +123,15 @@ class TodoService:
         is_done: Optional[bool] = None,
         sort_desc: bool = True,
         tag_id: Optional[int] = None,
-    ) -> PaginatedResponse:
+        cursor: Optional[str] = None,
+        sort: str = "created_at",
+        include_total: bool = True,
+    ) -> dict:
+        if cursor is not None:
+            if sort == "relevance":
+                raise HTTPException(status_code=400, detail="Không hỗ trợ cursor khi sắp xếp theo độ liên quan")
+            return self._get_todos_by_cursor(owner_id, cursor, limit, q, is_done, sort_desc, tag_id)
+
         items, total = self.repo.get_all(
             owner_id=owner_id,
             skip=skip,
@@ -68,15 +140,44 @@ class TodoService:
             is_done=is_done,
             sort_desc=sort_desc,
             tag_id=tag_id,
+            sort=sort,
+            include_total=include_total,
         )
-        enriched = [_enrich_todo(t) for t in items]
-        return PaginatedResponse(
-            items=enriched,
-            total=total,
+        if total is None:
+            has_more = len(items) > limit
+            items = items[:limit]
+        else:
+            has_more = skip + len(items) < total
+        return _page(_enrich_todos(items), limit, skip, total=total, has_more=has_more)
+
+    def _get_todos_by_cursor(
+        self,
+        owner_id: int,
+        cursor: str,
+        limit: int,
+        q: Optional[str],
+        is_done: Optional[bool],
+        sort_desc: bool,
+        tag_id: Optional[int],
+    ) -> dict:
+        items = self.repo.get_page_after(
+            owner_id=owner_id,
+            after=_decode_cursor(cursor),
             limit=limit,
-            offset=skip
+            q=q,
+            is_done=is_done,
+            sort_desc=sort_desc,
+            tag_id=tag_id,
+        )
+        has_more = len(items) > limit
+        items = items[:limit]
+        return _page(
+            _enrich_todos(items), limit, 0,
+            next_cursor=_encode_cursor(items[-1]) if has_more else None,
+            has_more=has_more,
         )
 
+    @unit_of_work
     def create_todo(self, todo: TodoCreate, owner_id: int) -> dict:
         # Validate: due_date must be in the future (after created_at which is ~now)
         if todo.due_date is not None and _make_naive(todo.due_date) <= datetime.utcnow():
@@ -84,56 +185,167 @@ class TodoService:
                 status_code=400,
                 detail="Deadline phải sau thời điểm hiện tại"
             )
-        tags = self._resolve_tags(todo.tag_ids, owner_id)
+        tags = self._resolve_tags(todo.tag_ids, owner_id, todo.tag_names)
         new_todo = self.repo.create(todo, owner_id, tags=tags or [])
-        return _enrich_todo(new_todo)
+        result = _enrich_todo(new_todo)
+        self._publish(owner_id, "todo.created", result)
+        return result
 
     def get_todo(self, todo_id: int, owner_id: int) -> dict:
-        todo = self.repo.get_by_id(todo_id, owner_id)
+        todo = self.repo.get_record(todo_id, owner_id)
         if not todo:
             raise HTTPException(status_code=404, detail="Task không tồn tại hoặc không thuộc về bạn")
         return _enrich_todo(todo)
 
-    def update_todo(self, todo_id: int, todo_update: Union[TodoCreate, TodoUpdate], owner_id: int) -> dict:
-        # Validate: due_date must be after the task's created_at
-        new_due = getattr(todo_update, 'due_date', None)
-        if new_due is not None:
-            existing = self.repo.get_by_id(todo_id, owner_id)
-            if not existing:
-                raise HTTPException(status_code=404, detail="Task không tồn tại hoặc không thuộc về bạn")
-            if _make_naive(new_due) <= existing.created_at:
+    @unit_of_work
+    def update_todo(self, todo_id: int, todo_update: Union[TodoCreate, TodoUpdate], owner_id: int, event_type: str = "todo.updated") -> dict:
+        tags = self._resolve_tags(getattr(todo_update, 'tag_ids', None), owner_id, getattr(todo_update, 'tag_names', None))
+        # One UPDATE ... RETURNING checks ownership and the deadline rule (due_date > created_at)
+        updated_todo = self.repo.update(todo_id, todo_update, owner_id, tags=tags)
+        if not updated_todo:
+            # Rare path: find out which rule the UPDATE's WHERE clause rejected
+            if getattr(todo_update, 'due_date', None) is not None and self.repo.get_by_id(todo_id, owner_id):
                 raise HTTPException(
                     status_code=400,
                     detail="Deadline phải sau thời điểm tạo công việc"
                 )
-        tag_ids = getattr(todo_update, 'tag_ids', None)
-        tags = self._resolve_tags(tag_ids, owner_id)
-        updated_todo = self.repo.update(todo_id, todo_update, owner_id, tags=tags)
-        if not updated_todo:
             raise HTTPException(status_code=404, detail="Task không tồn tại hoặc không thuộc về bạn")
-        return _enrich_todo(updated_todo)
+        result = _enrich_todo(updated_todo)
+        self._publish(owner_id, event_type, result)
+        return result
 
+    @unit_of_work
     def delete_todo(self, todo_id: int, owner_id: int):
         success = self.repo.delete(todo_id, owner_id)
         if not success:
             raise HTTPException(status_code=404, detail="Task không tồn tại hoặc không thuộc về bạn")
+        self._publish(owner_id, "todo.deleted", {"id": todo_id})
         return {"message": "Xóa thành công"}
 
+    @unit_of_work
     def complete_todo(self, todo_id: int, owner_id: int) -> dict:
         update_data = TodoUpdate(is_done=True)
-        return self.update_todo(todo_id, update_data, owner_id)
+        return self.update_todo(todo_id, update_data, owner_id, event_type="todo.completed")
+
+    # ─── Bulk operations: one tag lookup, one transaction per batch ───
+
+    def _resolve_item_tags(self, items: list, owner_id: int) -> tuple[List[Optional[List[int]]], dict]:
+        """Per item: its tag ids (tag_ids, then tag_names), or None when it sets
+        neither; plus {id: Tag} for every tag used.
+
+        The names of the whole batch are resolved (and missing tags created)
+        together, then every id is owner-checked with a single query. Unknown
+        / foreign tag ids are dropped, as in create_todo.
+        """
+        names = [n for item in items if item.tag_names for n in item.tag_names]
+        name_ids, _ = self.tag_repo.ensure_names(names, owner_id)
+        wanted = {t for item in items if item.tag_ids for t in item.tag_ids} | set(name_ids.values())
+        tag_map = {t.id: t for t in self.tag_repo.get_by_ids(list(wanted), owner_id)} if wanted else {}
+        resolved = []
+        for item in items:
+            if item.tag_ids is None and item.tag_names is None:
+                resolved.append(None)
+                continue
+            ids = list(item.tag_ids or []) + [name_ids[n] for n in item.tag_names or []]
+            resolved.append([t for t in dict.fromkeys(ids) if t in tag_map])
+        return resolved, tag_map
+
+    @staticmethod
+    def _bulk_response(results: List[BulkItemResult]) -> BulkResponse:
+        succeeded = sum(1 for r in results if r.status < 400)
+        return BulkResponse(results=results, succeeded=succeeded, failed=len(results) - succeeded)
+
+    @unit_of_work
+    def bulk_create_todos(self, items: List[TodoCreate], owner_id: int) -> BulkResponse:
+        now = datetime.utcnow()
+        results: List[Optional[BulkItemResult]] = [None] * len(items)
+        valid = []
+        for index, todo in enumerate(items):
+            if todo.due_date is not None and _make_naive(todo.due_date) <= now:
+                results[index] = BulkItemResult(index=index, status=400, detail="Deadline phải sau thời điểm hiện tại")
+            else:
+                valid.append(index)
+
+        item_tags, _ = self._resolve_item_tags([items[i] for i in valid], owner_id)
+        rows = [items[i].model_dump(include={"title", "description", "is_done", "due_date"}) for i in valid]
+        tag_ids = [ids or [] for ids in item_tags]
+
+        new_ids = self.repo.bulk_create(rows, tag_ids, owner_id)
+        if new_ids:
+            self._publish(owner_id, "todos.bulk_created", {"ids": new_ids})
+        created = {t.id: t for t in self.repo.get_by_ids(new_ids, owner_id)}
+        for index, todo_id in zip(valid, new_ids):
+            results[index] = BulkItemResult(
+                index=index, id=todo_id, status=201, item=_enrich_todo(created[todo_id])
+            )
+        return self._bulk_response(results)
+
+    @unit_of_work
+    def bulk_update_todos(self, items: List[TodoBulkUpdateItem], owner_id: int) -> BulkResponse:
+        existing = {t.id: t for t in self.repo.get_by_ids([i.id for i in items], owner_id)}
+        results: List[Optional[BulkItemResult]] = [None] * len(items)
+        valid, seen = [], set()
+        for index, item in enumerate(items):
+            db_todo = existing.get(item.id)
+            if db_todo is None:
+                results[index] = BulkItemResult(index=index, id=item.id, status=404, detail="Task không tồn tại hoặc không thuộc về bạn")
+                continue
+            if item.id in seen:
+                results[index] = BulkItemResult(index=index, id=item.id, status=409, detail="Task xuất hiện nhiều lần trong cùng một lô")
+                continue
+            if item.due_date is not None and _make_naive(item.due_date) <= db_todo.created_at:
+                results[index] = BulkItemResult(index=index, id=item.id, status=400, detail="Deadline phải sau thời điểm tạo công việc")
+                continue
+            seen.add(item.id)
+            valid.append(index)
+
+        # Only accepted items may create tags
+        item_tags, tag_map = self._resolve_item_tags([items[i] for i in valid], owner_id)
+        changes = []
+        for index, ids in zip(valid, item_tags):
+            item = items[index]
+            values = item.model_dump(exclude_unset=True, exclude={"id", "tag_ids", "tag_names"})
+            tags = None if ids is None else [tag_map[t] for t in ids]
+            changes.append((existing[item.id], values, tags))
+
+        # Read before the commit expires them (one refresh per todo otherwise)
+        changed_ids = [t.id for t, _, _ in changes]
+        self.repo.bulk_update(changes)
+        if changes:
+            self._publish(owner_id, "todos.bulk_updated", {"ids": changed_ids})
+        updated = {t.id: t for t in self.repo.get_by_ids(list(seen), owner_id)}
+        for index, item in enumerate(items):
+            if results[index] is None:
+                results[index] = BulkItemResult(
+                    index=index, id=item.id, status=200, item=_enrich_todo(updated[item.id])
+                )
+        return self._bulk_response(results)
+
+    @unit_of_work
+    def bulk_delete_todos(self, todo_ids: List[int], owner_id: int) -> BulkResponse:
+        deleted = set(self.repo.delete_many(todo_ids, owner_id))
+        if deleted:
+            self._publish(owner_id, "todos.bulk_deleted", {"ids": sorted(deleted)})
+        results = [
+            BulkItemResult(index=index, id=todo_id, status=200)
+            if todo_id in deleted
+            else BulkItemResult(index=index, id=todo_id, status=404, detail="Task không tồn tại hoặc không thuộc về bạn")
+            for index, todo_id in enumerate(todo_ids)
+        ]
+        return self._bulk_response(results)
 
+    @unit_of_work
     def delete_completed_todos(self, owner_id: int) -> dict:
         count = self.repo.delete_completed(owner_id)
+        if count:
+            self._publish(owner_id, "todos.completed_deleted", {"count": count})
         return {"message": f"Deleted {count} completed tasks", "count": count}
 
     def get_overdue_todos(self, owner_id: int) -> List[dict]:
-        todos = self.repo.get_overdue(owner_id)
-        return [_enrich_todo(t) for t in todos]
+        return _enrich_todos(self.repo.get_overdue(owner_id))
 
     def get_today_todos(self, owner_id: int) -> List[dict]:
-        todos = self.repo.get_today(owner_id)
-        return [_enrich_todo(t) for t in todos]
+        return _enrich_todos(self.repo.get_today(owner_id))
 
 
 # Dependency Injection Helper — MUST share a single DB session
@@ -0,0 +1,230 @@
+import codecs
+import csv
+import io
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..core.events import change_broker
+from ..repositories.todo_repository import TodoRepository
+from ..repositories.tag_repository import TagRepository
+from ..schemas.todo import TodoImportRow, ImportLineError, ImportSummary
+
+logger = logging.getLogger("app.import")
+
+EXPORT_FIELDS = ["id", "title", "description", "is_done", "due_date", "created_at", "updated_at", "tags"]
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+# CSV has no lists; tag names are joined with this separator
+CSV_TAG_SEPARATOR = ";"
+
+
+def _iso(value):
+    return value.isoformat() if value is not None else None
+
+
+def _export_record(todo) -> dict:
+    return {
+        "id": todo.id,
+        "title": todo.title,
+        "description": todo.description,
+        "is_done": bool(todo.is_done),
+        "due_date": _iso(todo.due_date),
+        "created_at": _iso(todo.created_at),
+        "updated_at": _iso(todo.updated_at),
+        "tags": [{"id": t.id, "name": t.name, "color": t.color} for t in todo.tags],
+    }
+
+
+def _ndjson_chunk(todos) -> str:
+    return "".join(json.dumps(_export_record(t), ensure_ascii=False) + "\n" for t in todos)
+
+
+def _csv_chunk(todos, header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(EXPORT_FIELDS)
+    for todo in todos:
+        record = _export_record(todo)
+        record["tags"] = CSV_TAG_SEPARATOR.join(t["name"] for t in record["tags"])
+        record["is_done"] = "true" if record["is_done"] else "false"
+        writer.writerow(["" if record[f] is None else record[f] for f in EXPORT_FIELDS])
+    return buffer.getvalue()
+
+
+def stream_export(owner_id: int, fmt: str, batch_size: int = None) -> Iterator[str]:
+    """Yield the owner's todos as NDJSON lines or CSV rows, one chunk per batch.
+
+    Runs on its own session: the response body is produced after the
+    request's dependencies (and their session) are finished.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    with SessionLocal() as db:
+        batches = TodoRepository(db).iter_export_batches(owner_id, batch_size)
+        if fmt == "csv":
+            header = True
+            for todos in batches:
+                yield _csv_chunk(todos, header)
+                header = False
+            if header:  # No todos: still send the header row
+                yield _csv_chunk([], header=True)
+        else:
+            for todos in batches:
+                yield _ndjson_chunk(todos)
+
+
+# ─── Import ───
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[str]:
+    """Split a byte stream into text lines (line endings kept), decoding incrementally."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    for chunk in chunks:
+        # Split on "\n" only: str.splitlines() would also break on U+2028 etc.
+        *lines, pending = (pending + decoder.decode(chunk)).split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _iter_ndjson(lines: Iterable[str]):
+    """Yield (line number, dict or error message) for each non-blank line."""
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            yield number, f"JSON không hợp lệ: {exc}"
+            continue
+        if not isinstance(record, dict):
+            yield number, "Mỗi dòng phải là một JSON object"
+            continue
+        yield number, record
+
+
+def _iter_csv(lines: Iterable[str]):
+    reader = csv.DictReader(lines)
+    for record in reader:
+        if not any(record.values()):
+            continue
+        yield reader.line_num, record
+
+
+def _validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in exc.errors()
+    )
+
+
+class TodoImporter:
+    """Parse NDJSON/CSV records, validate them with TodoImportRow and insert
+    them batch by batch, one transaction per batch.
+
+    Tags are matched (or created) by name; names already resolved are
+    remembered for the rest of the import. Unlike POST /todos, past due
+    dates are accepted: migrated todos may legitimately be overdue.
+
+    A batch that fails to insert is rolled back and reported as one error
+    spanning its lines (line..last_line); the import goes on with the next
+    batch, so the summary always says which lines went in.
+    """
+
+    def __init__(self, owner_id: int, batch_size: Optional[int] = None, max_errors: Optional[int] = None):
+        self.owner_id = owner_id
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.max_errors = settings.IMPORT_MAX_ERRORS if max_errors is None else max_errors
+        self.tag_ids: dict = {}
+        self.lines = self.imported = self.batches = self.tags_created = 0
+        self.errors: List[ImportLineError] = []
+        self.failed = 0
+
+    def _error(self, line: int, detail: str, last_line: Optional[int] = None, rows: int = 1) -> None:
+        self.failed += rows
+        if len(self.errors) < self.max_errors:
+            self.errors.append(ImportLineError(line=line, detail=detail, last_line=last_line))
+
+    def _flush(self, db, batch: List[tuple]) -> None:
+        """Insert one batch of (line number, row); a failure only loses this batch."""
+        new_names = [n for _, row in batch for n in row.tags if n not in self.tag_ids]
+        try:
+            created = self._insert(db, [row for _, row in batch], new_names)
+        except Exception as exc:
+            db.rollback()
+            # Tags created by this batch's transaction are gone with it
+            for name in new_names:
+                self.tag_ids.pop(name, None)
+            first, last = batch[0][0], batch[-1][0]
+            logger.exception("import owner=%s lines %d-%d failed", self.owner_id, first, last)
+            self._error(first, f"Không thể lưu các dòng {first}-{last}: {type(exc).__name__}",
+                        last_line=last, rows=len(batch))
+            return
+        self.tags_created += created
+        self.imported += len(batch)
+        self.batches += 1
+        logger.info("import owner=%s batch=%d imported=%d failed=%d",
+                    self.owner_id, self.batches, self.imported, self.failed)
+
+    def _insert(self, db, batch: List[TodoImportRow], new_names: List[str]) -> int:
+        """Insert and commit the rows; returns the number of tags created."""
+        created = 0
+        if new_names:
+            found, created = TagRepository(db).ensure_names(new_names, self.owner_id)
+            self.tag_ids.update(found)
+        now = datetime.utcnow()
+        rows, tag_ids = [], []
+        for row in batch:
+            # executemany needs the same keys in every row
+            values = row.model_dump(include={"title", "description", "is_done", "due_date", "created_at"})
+            values["created_at"] = values["created_at"] or now
+            rows.append(values)
+            tag_ids.append(list(dict.fromkeys(self.tag_ids[n] for n in row.tags)))
+        TodoRepository(db).bulk_create(rows, tag_ids, self.owner_id)  # commits
+        return created
+
+    def run(self, lines: Iterable[str], fmt: str) -> ImportSummary:
+        started = time.perf_counter()
+        records = _iter_csv(lines) if fmt == "csv" else _iter_ndjson(lines)
+        batch: List[tuple] = []  # (line number, row)
+        with SessionLocal() as db:
+            for number, record in records:
+                self.lines += 1
+                if isinstance(record, str):
+                    self._error(number, record)
+                    continue
+                try:
+                    batch.append((number, TodoImportRow.model_validate(record)))
+                except ValidationError as exc:
+                    self._error(number, _validation_detail(exc))
+                    continue
+                if len(batch) >= self.batch_size:
+                    self._flush(db, batch)
+                    batch = []
+            if batch:
+                self._flush(db, batch)
+        if self.imported:
+            change_broker.publish(self.owner_id, "todos.imported", {"count": self.imported, "tags_created": self.tags_created})
+
+        elapsed = time.perf_counter() - started
+        return ImportSummary(
+            lines=self.lines,
+            imported=self.imported,
+            failed=self.failed,
+            batches=self.batches,
+            tags_created=self.tags_created,
+            elapsed_seconds=round(elapsed, 3),
+            rows_per_second=round(self.imported / elapsed, 1) if elapsed > 0 else 0.0,
+            errors=self.errors,
+            errors_truncated=self.failed > len(self.errors),
+        )
@@ -0,0 +1,198 @@
+"""Synthetic data: N users x M todos x K tags, bulk-loaded through Core inserts.
+
+    python -m benchmarks.datagen [--users 100] [--todos 1000] [--tags 10] [--seed 0]
+
+Loads into the configured DATABASE_URL (migrated to head first). Every
+user is bench<i>@example.com with password --password, so benchmarks.load
+--url can log in against a server started on the same database. Todos get
+0-2 of their owner's tags, dates spread around now and ~30% done.
+
+Rows go in with executemany batches, ids assigned client-side, in one
+transaction. The per-row triggers on todos/todo_tags are dropped
+(SQLite) or disabled (PostgreSQL) for the load; the FTS entries and
+todo_counters rows of the new owners are then built set-based, as the
+migrations backfill them.
+"""
+import argparse
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+WORDS = (
+    "report meeting invoice review deploy release email call plan budget "
+    "design draft fix test write read update backup renew order pay book "
+    "client team weekly monthly quarterly server website docs contract "
+    "groceries dentist gym laundry travel tickets taxes insurance garden"
+).split()
+COLORS = ("#6366f1", "#ef4444", "#10b981", "#f59e0b", "#3b82f6", "#8b5cf6")
+BATCH = 20000
+TEXT_POOL = 4096  # distinct titles/descriptions drawn per run
+
+
+def _emails(users: int, start: int = 0):
+    return [f"bench{i}@example.com" for i in range(start, start + users)]
+
+
+def _next_id(conn, table) -> int:
+    from sqlalchemy import func, select
+    return (conn.execute(select(func.max(table.c.id))).scalar() or 0) + 1
+
+
+@contextmanager
+def _triggers_off(conn):
+    """Per-row triggers on todos/todo_tags off for the block (same transaction)."""
+    if conn.dialect.name == "sqlite":
+        saved = conn.exec_driver_sql(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name IN ('todos', 'todo_tags')"
+        ).all()
+        for name, _ in saved:
+            conn.exec_driver_sql(f"DROP TRIGGER {name}")
+        try:
+            yield
+        finally:
+            for _, sql in saved:
+                conn.exec_driver_sql(sql)
+    else:
+        for table in ("todos", "todo_tags"):
+            conn.exec_driver_sql(f"ALTER TABLE {table} DISABLE TRIGGER USER")
+        try:
+            yield
+        finally:
+            for table in ("todos", "todo_tags"):
+                conn.exec_driver_sql(f"ALTER TABLE {table} ENABLE TRIGGER USER")
+
+
+def _build_derived(conn, first_owner: int, first_todo: int) -> None:
+    """What the triggers would have written for the loaded owners/todos."""
+    from sqlalchemy import text
+
+    params = {"owner": first_owner, "todo": first_todo}
+    if conn.dialect.name == "sqlite":
+        conn.execute(text(
+            "INSERT INTO todos_fts (rowid, title, description, owner_id) "
+            "SELECT id, title, description, owner_id FROM todos WHERE id >= :todo"
+        ), params)
+    conn.execute(text(
+        "INSERT INTO todo_counters (owner_id, tag_id, total, done) "
+        "SELECT owner_id, 0, COUNT(*), SUM(CASE WHEN is_done THEN 1 ELSE 0 END) "
+        "FROM todos WHERE owner_id >= :owner GROUP BY owner_id"
+    ), params)
+    conn.execute(text(
+        "INSERT INTO todo_counters (owner_id, tag_id, total, done) "
+        "SELECT t.owner_id, tt.tag_id, COUNT(*), SUM(CASE WHEN t.is_done THEN 1 ELSE 0 END) "
+        "FROM todo_tags tt JOIN todos t ON t.id = tt.todo_id "
+        "WHERE t.owner_id >= :owner GROUP BY t.owner_id, tt.tag_id"
+    ), params)
+
+
+def _todo_rows(rng, owner_id: int, first_id: int, count: int, tag_ids, now: datetime, titles, descriptions):
+    todos, links = [], []
+    for todo_id in range(first_id, first_id + count):
+        created = now - timedelta(seconds=rng.randrange(90 * 86400))
+        due = None
+        if rng.random() < 0.5:
+            due = min(created + timedelta(days=rng.randint(1, 60)), now + timedelta(days=30))
+        todos.append({
+            "id": todo_id,
+            "title": rng.choice(titles),
+            "description": rng.choice(descriptions),
+            "is_done": rng.random() < 0.3,
+            "created_at": created,
+            "updated_at": created,
+            "due_date": due,
+            "owner_id": owner_id,
+        })
+        if tag_ids:
+            for tag_id in rng.sample(tag_ids, min(len(tag_ids), rng.choice((0, 1, 1, 2)))):
+                links.append({"todo_id": todo_id, "tag_id": tag_id})
+    return todos, links
+
+
+def generate(engine, users: int, todos: int, tags: int, seed: int = 0,
+             password: str = "bench-password") -> dict:
+    """Insert the data set; returns {"emails": [...], "password": ..., "rows": {...}}."""
+    from sqlalchemy import insert
+    from app.core.security import get_password_hash
+    from app.models import User, Tag, Todo
+    from app.models.tag import todo_tags
+    from app.repositories.version_repository import bump_version_stmt
+
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    hashed = get_password_hash(password)  # one bcrypt hash shared by every user
+    titles = [" ".join(rng.choices(WORDS, k=rng.randint(2, 6))) for _ in range(TEXT_POOL)]
+    descriptions = [" ".join(rng.choices(WORDS, k=rng.randint(5, 20))) for _ in range(TEXT_POOL)]
+    descriptions += [None] * (len(descriptions) * 2 // 3)  # ~40% without one
+    users_t, tags_t, todos_t = User.__table__, Tag.__table__, Todo.__table__
+    rows = {"users": 0, "tags": 0, "todos": 0, "todo_tags": 0}
+
+    with engine.begin() as conn, _triggers_off(conn):
+        user_id, tag_id, todo_id = _next_id(conn, users_t), _next_id(conn, tags_t), _next_id(conn, todos_t)
+        first_todo = todo_id
+        emails = _emails(users, start=user_id)
+        conn.execute(insert(users_t), [
+            {"id": user_id + i, "email": email, "hashed_password": hashed, "is_active": True, "created_at": now}
+            for i, email in enumerate(emails)
+        ])
+        rows["users"] = users
+
+        pending_todos, pending_links = [], []
+        for owner_id in range(user_id, user_id + users):
+            tag_ids = list(range(tag_id, tag_id + tags))
+            if tags:
+                conn.execute(insert(tags_t), [
+                    {"id": t, "name": f"tag-{t - tag_id}", "color": rng.choice(COLORS), "owner_id": owner_id}
+                    for t in tag_ids
+                ])
+            tag_id += tags
+            owner_todos, owner_links = _todo_rows(rng, owner_id, todo_id, todos, tag_ids, now, titles, descriptions)
+            todo_id += todos
+            pending_todos += owner_todos
+            pending_links += owner_links
+            if len(pending_todos) >= BATCH:
+                conn.execute(insert(todos_t), pending_todos)
+                conn.execute(insert(todo_tags), pending_links)
+                rows["todos"] += len(pending_todos)
+                rows["todo_tags"] += len(pending_links)
+                pending_todos, pending_links = [], []
+        if pending_todos:
+            conn.execute(insert(todos_t), pending_todos)
+            if pending_links:
+                conn.execute(insert(todo_tags), pending_links)
+            rows["todos"] += len(pending_todos)
+            rows["todo_tags"] += len(pending_links)
+        rows["tags"] = users * tags
+        _build_derived(conn, user_id, first_todo)
+
+        # New data: ETags issued before the load must not match
+        for owner_id in range(user_id, user_id + users):
+            conn.execute(bump_version_stmt(owner_id))
+    return {"emails": emails, "password": password, "rows": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--todos", type=int, default=1000, help="todos per user")
+    parser.add_argument("--tags", type=int, default=10, help="tags per user")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--password", default="bench-password")
+    args = parser.parse_args()
+
+    from alembic import command
+    from alembic.config import Config
+    from app.core.database import engine
+
+    command.upgrade(Config("alembic.ini"), "head")
+    start = time.perf_counter()
+    result = generate(engine, args.users, args.todos, args.tags, args.seed, args.password)
+    elapsed = time.perf_counter() - start
+    total = sum(result["rows"].values())
+    print(", ".join(f"{name}={count}" for name, count in result["rows"].items()))
+    print(f"{elapsed:.2f}s  {total / elapsed:,.0f} rows/s  "
+          f"users {result['emails'][0]} .. {result['emails'][-1]} / {args.password}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Write throughput with and without group commit as concurrency grows.
+
+    python -m benchmarks.group_commit [--seconds 3] [--concurrency 1 2 4 8 16 32 64]
+        [--users 16] [--max-batch 64] [--max-wait-ms 0]
+
+Migrates a throwaway database, then for each concurrency level runs that
+many threads for --seconds, each creating todos through TodoService (one
+session per request, as the sync routes do) for its own user. Every
+level runs once committing per request and once with GROUP_COMMIT; the
+table shows writes/s, p50/p99 latency and the mean batch size.
+
+The commit cost depends on the storage profile: SQLITE_PROFILE=safe
+(synchronous=FULL, an fsync per commit) is where batching pays most.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000 if values else float("nan")
+
+
+def _seed(users: int) -> None:
+    from sqlalchemy import insert
+    from app.core.database import engine
+    from app.models import User
+
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"bench{i}@example.com", "hashed_password": "x", "created_at": now}
+            for i in range(1, users + 1)
+        ])
+
+
+def _run(concurrency: int, seconds: float, users: int) -> dict:
+    from app.core.database import SessionLocal
+    from app.repositories.tag_repository import TagRepository
+    from app.repositories.todo_repository import TodoRepository
+    from app.schemas.todo import TodoCreate
+    from app.services.todo_service import TodoService
+
+    stop = time.perf_counter() + seconds
+    latencies, errors = [], [0]
+    lock = threading.Lock()
+
+    def writer(n: int):
+        owner_id = n % users + 1
+        mine, failed = [], 0
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                with SessionLocal() as db:
+                    TodoService(TodoRepository(db), TagRepository(db)).create_todo(
+                        TodoCreate(title=f"bench write {n}"), owner_id
+                    )
+                mine.append(time.perf_counter() - started)
+            except Exception:  # pool or busy timeout
+                failed += 1
+        with lock:
+            latencies.extend(mine)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return {
+        "writes_per_s": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 50),
+        "p99_ms": _percentile(latencies, 99),
+        "errors": errors[0],
+    }
+
+
+def _batch_stats():
+    """(units, batches) committed by the group writer so far."""
+    from app.core.metrics import GROUP_COMMIT_BATCH_SIZE
+
+    values = dict(line.rsplit(" ", 1) for line in GROUP_COMMIT_BATCH_SIZE.render() if not line.startswith("#"))
+    name = GROUP_COMMIT_BATCH_SIZE.name
+    return float(values.get(f"{name}_sum", 0)), float(values.get(f"{name}_count", 0))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0, help="per concurrency level and mode")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=0.0)
+    args = parser.parse_args()
+
+    repo_root = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app's database lives at ./todo_app.db
+        os.chdir(tmp)
+        from alembic import command
+        from alembic.config import Config
+        command.upgrade(Config(os.path.join(repo_root, "alembic.ini")), "head")
+
+        from app.core.config import settings
+        from app.core.group_commit import group_writer
+        _seed(args.users)
+        group_writer.max_batch = max(1, args.max_batch)
+        group_writer.max_wait = args.max_wait_ms / 1000
+
+        print(f"profile {settings.SQLITE_PROFILE}, {args.seconds:g}s per run\n")
+        print(f"{'threads':>7}  {'mode':<12} {'writes/s':>9} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'batch':>6} {'errors':>6}  speedup")
+        try:
+            for concurrency in args.concurrency:
+                baseline = None
+                for enabled in (False, True):
+                    group_writer.enabled = enabled
+                    before = _batch_stats()
+                    result = _run(concurrency, args.seconds, args.users)
+                    after = _batch_stats()
+                    batches = after[1] - before[1]
+                    batch = f"{(after[0] - before[0]) / batches:.1f}" if enabled and batches else "1"
+                    if baseline is None:
+                        baseline = result["writes_per_s"]
+                    speedup = f"{result['writes_per_s'] / baseline:.2f}x" if baseline else "-"
+                    print(f"{concurrency:>7}  {'group commit' if enabled else 'per request':<12} "
+                          f"{result['writes_per_s']:>9,.0f} {result['p50_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+                          f"{batch:>6} {result['errors']:>6}  {speedup}")
+        finally:
+            group_writer.shutdown()
+            os.chdir(repo_root)
+
+
+if __name__ == "__main__":
+    main()
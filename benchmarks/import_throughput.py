@@ -0,0 +1,91 @@
+"""POST /todos/import throughput in rows per second (requires httpx).
+
+    python -m benchmarks.import_throughput [--rows 100000] [--batch-size 1000] [--format ndjson]
+
+Runs the app in-process against a throwaway database and uploads a
+generated file in 64 KiB chunks, so the body is parsed while it streams.
+Compare --batch-size values to see the cost per transaction.
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+
+CHUNK = 64 * 1024
+
+
+def _payload(rows: int, fmt: str) -> bytes:
+    records = [
+        {
+            "title": f"imported todo {i}",
+            "description": f"row {i} of the migration",
+            "is_done": i % 3 == 0,
+            "due_date": "2030-01-01T00:00:00" if i % 2 else None,
+            "tags": [f"project-{i % 20}", "imported"],
+        }
+        for i in range(rows)
+    ]
+    if fmt == "ndjson":
+        return "".join(json.dumps(r) + "\n" for r in records).encode()
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(records[0]))
+    writer.writeheader()
+    for r in records:
+        writer.writerow({**r, "due_date": r["due_date"] or "", "tags": ";".join(r["tags"])})
+    return buffer.getvalue().encode()
+
+
+async def _bench(rows: int, batch_size: int, fmt: str) -> None:
+    import httpx
+    from app.main import app
+
+    body = _payload(rows, fmt)
+
+    async def chunks():
+        for start in range(0, len(body), CHUNK):
+            yield body[start:start + CHUNK]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.post("/api/v1/auth/register", json={"email": "import@example.com", "password": "import-password"})
+        r = await client.post("/api/v1/auth/login", data={"username": "import@example.com", "password": "import-password"})
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        start = time.perf_counter()
+        r = await client.post(
+            f"/api/v1/todos/import?format={fmt}&batch_size={batch_size}", content=chunks(), headers=headers
+        )
+        wall = time.perf_counter() - start
+        r.raise_for_status()
+        summary = r.json()
+
+    print(f"format={fmt} rows={rows} batch_size={batch_size} payload={len(body) / 1e6:.1f} MB")
+    print(f"imported={summary['imported']} failed={summary['failed']} batches={summary['batches']} "
+          f"tags_created={summary['tags_created']}")
+    print(f"server: {summary['rows_per_second']:.0f} rows/s  end-to-end: {summary['imported'] / wall:.0f} rows/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson")
+    args = parser.parse_args()
+
+    repo_root = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app's database lives at ./todo_app.db
+        os.chdir(tmp)
+        from alembic import command
+        from alembic.config import Config
+        command.upgrade(Config(os.path.join(repo_root, "alembic.ini")), "head")
+        asyncio.run(_bench(args.rows, args.batch_size, args.format))
+        os.chdir(repo_root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,584 @@
+"""Load driver for every API route: p50/p95/p99 latency and requests/s (requires httpx).
+
+    python -m benchmarks.load [--concurrency 16] [--requests 5000 | --seconds 30]
+        [--users 10] [--todos 1000] [--tags 10] [--url http://127.0.0.1:8000]
+        [--json out.json] [--save-baseline benchmarks/baseline.json]
+        [--compare benchmarks/baseline.json] [--threshold 0.2] [--rate-limits]
+
+In-process (default): migrates a throwaway database, loads --users x --todos
+x --tags with benchmarks.datagen and drives app.main.app (lifespan running)
+through httpx.ASGITransport. The per-user rate limits are off unless
+--rate-limits is given: the workers share a few accounts, so with them
+on the write routes would measure the limiter's 429s, not the handlers. With --url: drives a running server whose
+database was loaded by benchmarks.datagen with the same --users/--password.
+
+Each of --concurrency workers picks routes by weight (ROUTES) until the
+request budget or time runs out. Reads go to a seeded account, writes to
+a scratch account the worker registers, so the seeded data stays put.
+Untimed setup requests (e.g. creating the todo a DELETE removes) are not
+counted. GET /todos/stream (time to the `ready` event) and /todos/ws
+(handshake) need a real server: they only run with --url.
+
+--compare flags a route whose p50 or p95 grew by more than --threshold
+(and --noise-ms) over the baseline, whose error rate grew by more than
+--error-threshold, or that fell under MIN_SAMPLES successful requests
+(e.g. because it now fails); likewise a total req/s drop of more than
+--threshold. The exit status is 1 if anything regressed. Every route
+also records its response status counts ("error" for a request that
+raised), so a report shows why requests failed. Baselines are
+machine-specific: save one on the machine you compare on.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from .datagen import WORDS
+
+API = "/api/v1"
+MIN_SAMPLES = 20  # fewer samples are not compared (but losing them is flagged)
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return round(values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000, 3) if values else float("nan")
+
+
+def _succeeded(code: str) -> bool:
+    return code != "error" and int(code) < 400
+
+
+def _error_rate(row: dict) -> float:
+    """Share of a route's requests that failed (4xx/5xx or raised)."""
+    attempts = row["n"] + row["errors"]
+    return row["errors"] / attempts if attempts else 0.0
+
+
+class Worker:
+    """Per-worker accounts and the ids its write requests work on."""
+
+    def __init__(self, index: int, seed: int):
+        self.index = index
+        self.rng = random.Random(seed * 1000 + index)
+        self.email = ""
+        self.password = ""
+        self.headers = {}  # seeded account (reads)
+        self.scratch = {}  # scratch account (writes)
+        self.todo_ids = []  # seeded todos
+        self.tag_ids = []  # seeded tags
+        self.etag = None
+        self.created = []  # scratch todos
+        self.created_tags = []  # scratch tags
+        self.serial = 0
+
+    def name(self, prefix: str) -> str:
+        self.serial += 1
+        return f"{prefix} {self.index}-{self.serial}"
+
+    def todo(self, **extra) -> dict:
+        due = datetime.utcnow() + timedelta(days=self.rng.randint(1, 30))
+        return {
+            "title": " ".join(self.rng.choices(WORDS, k=3)),
+            "description": " ".join(self.rng.choices(WORDS, k=8)),
+            "due_date": due.isoformat() if self.rng.random() < 0.5 else None,
+            "tag_names": self.rng.sample(["work", "home", "urgent", "later"], 2),
+            **extra,
+        }
+
+
+async def _created_todo(client, w: Worker, pop: bool = False) -> int:
+    """A scratch todo id, created (untimed) if the worker has none left."""
+    if not w.created:
+        r = await client.post(f"{API}/todos", json=w.todo(), headers=w.scratch)
+        r.raise_for_status()
+        w.created.append(r.json()["id"])
+    return w.created.pop() if pop else w.rng.choice(w.created)
+
+
+async def _created_tag(client, w: Worker, pop: bool = False) -> int:
+    if not w.created_tags:
+        r = await client.post(f"{API}/tags/", json={"name": w.name("tag")}, headers=w.scratch)
+        r.raise_for_status()
+        w.created_tags.append(r.json()["id"])
+    return w.created_tags.pop() if pop else w.rng.choice(w.created_tags)
+
+
+def _keep(key: str):
+    """on_response callback appending the new id to a Worker list."""
+    def callback(w: Worker, r) -> None:
+        getattr(w, key).append(r.json()["id"])
+    return callback
+
+
+# Each op does its untimed setup and returns the request to time:
+# (method, url, httpx kwargs, callback(worker, response) or None)
+
+async def _register(client, w):
+    email = f"load-{uuid.uuid4().hex}@example.com"
+    return "POST", f"{API}/auth/register", {"json": {"email": email, "password": "load-password"}}, None
+
+
+async def _login(client, w):
+    return "POST", f"{API}/auth/login", {"data": {"username": w.email, "password": w.password}}, None
+
+
+async def _me(client, w):
+    return "GET", f"{API}/auth/me", {"headers": w.headers}, None
+
+
+async def _list(client, w):
+    return "GET", f"{API}/todos", {"params": {"limit": 20}, "headers": w.headers}, None
+
+
+async def _list_not_modified(client, w):
+    def remember(w, r):
+        w.etag = r.headers.get("etag") or w.etag
+    headers = {**w.headers, "If-None-Match": w.etag} if w.etag else w.headers
+    return "GET", f"{API}/todos", {"params": {"limit": 20}, "headers": headers}, remember
+
+
+async def _search(client, w):
+    params = {"q": w.rng.choice(WORDS), "limit": 20, "sort": w.rng.choice(["created_at", "relevance"])}
+    return "GET", f"{API}/todos", {"params": params, "headers": w.headers}, None
+
+
+async def _cursor(client, w):
+    params = {"cursor": "", "limit": 50, "include_total": "false", "is_done": "false"}
+    return "GET", f"{API}/todos", {"params": params, "headers": w.headers}, None
+
+
+async def _by_tag(client, w):
+    params = {"tag_id": w.rng.choice(w.tag_ids), "limit": 20}
+    return "GET", f"{API}/todos", {"params": params, "headers": w.headers}, None
+
+
+async def _overdue(client, w):
+    return "GET", f"{API}/todos/overdue", {"headers": w.headers}, None
+
+
+async def _today(client, w):
+    return "GET", f"{API}/todos/today", {"headers": w.headers}, None
+
+
+async def _stats(client, w):
+    return "GET", f"{API}/todos/stats", {"headers": w.headers}, None
+
+
+async def _get(client, w):
+    return "GET", f"{API}/todos/{w.rng.choice(w.todo_ids)}", {"headers": w.headers}, None
+
+
+async def _export(client, w):
+    params = {"format": w.rng.choice(["ndjson", "csv"])}
+    return "GET", f"{API}/todos/export", {"params": params, "headers": w.headers}, None
+
+
+async def _create(client, w):
+    return "POST", f"{API}/todos", {"json": w.todo(), "headers": w.scratch}, _keep("created")
+
+
+async def _replace(client, w):
+    todo_id = await _created_todo(client, w)
+    return "PUT", f"{API}/todos/{todo_id}", {"json": w.todo(is_done=False), "headers": w.scratch}, None
+
+
+async def _patch(client, w):
+    todo_id = await _created_todo(client, w)
+    body = {"title": " ".join(w.rng.choices(WORDS, k=3)), "tag_ids": []}
+    return "PATCH", f"{API}/todos/{todo_id}", {"json": body, "headers": w.scratch}, None
+
+
+async def _complete(client, w):
+    todo_id = await _created_todo(client, w)
+    return "POST", f"{API}/todos/{todo_id}/complete", {"headers": w.scratch}, None
+
+
+async def _delete(client, w):
+    todo_id = await _created_todo(client, w, pop=True)
+    return "DELETE", f"{API}/todos/{todo_id}", {"headers": w.scratch}, None
+
+
+async def _delete_completed(client, w):
+    return "DELETE", f"{API}/todos/completed", {"headers": w.scratch}, lambda w, r: w.created.clear()
+
+
+async def _bulk_create(client, w):
+    def keep(w, r):
+        w.created += [item["id"] for item in r.json()["results"] if item["id"] is not None]
+    body = {"items": [w.todo() for _ in range(20)]}
+    return "POST", f"{API}/todos/bulk", {"json": body, "headers": w.scratch}, keep
+
+
+async def _bulk_update(client, w):
+    await _created_todo(client, w)
+    items = [{"id": todo_id, "is_done": w.rng.random() < 0.5} for todo_id in w.created[-20:]]
+    return "PATCH", f"{API}/todos/bulk", {"json": {"items": items}, "headers": w.scratch}, None
+
+
+async def _bulk_delete(client, w):
+    await _created_todo(client, w)
+    ids, w.created = w.created[-20:], w.created[:-20]
+    return "DELETE", f"{API}/todos/bulk", {"json": {"ids": ids}, "headers": w.scratch}, None
+
+
+async def _import(client, w):
+    body = "".join(json.dumps({**w.todo(), "tags": ["imported"]}) + "\n" for _ in range(100))
+    headers = {**w.scratch, "Content-Type": "application/x-ndjson"}
+    return "POST", f"{API}/todos/import", {"content": body.encode(), "headers": headers}, None
+
+
+async def _tags(client, w):
+    return "GET", f"{API}/tags/", {"headers": w.headers}, None
+
+
+async def _tag_create(client, w):
+    body = {"name": w.name("tag")}
+    return "POST", f"{API}/tags/", {"json": body, "headers": w.scratch}, _keep("created_tags")
+
+
+async def _tag_update(client, w):
+    tag_id = await _created_tag(client, w)
+    return "PUT", f"{API}/tags/{tag_id}", {"json": {"name": w.name("tag")}, "headers": w.scratch}, None
+
+
+async def _tag_delete(client, w):
+    tag_id = await _created_tag(client, w, pop=True)
+    return "DELETE", f"{API}/tags/{tag_id}", {"headers": w.scratch}, None
+
+
+# name -> (weight, op, needs a real server)
+ROUTES = {
+    "POST /auth/register": (1, _register, False),
+    "POST /auth/login": (1, _login, False),
+    "GET /auth/me": (4, _me, False),
+    "GET /todos": (16, _list, False),
+    "GET /todos (If-None-Match)": (4, _list_not_modified, False),
+    "GET /todos?q=": (6, _search, False),
+    "GET /todos?cursor=": (4, _cursor, False),
+    "GET /todos?tag_id=": (4, _by_tag, False),
+    "GET /todos/overdue": (3, _overdue, False),
+    "GET /todos/today": (3, _today, False),
+    "GET /todos/stats": (3, _stats, False),
+    "GET /todos/{id}": (8, _get, False),
+    "GET /todos/export": (1, _export, False),
+    "POST /todos": (6, _create, False),
+    "PUT /todos/{id}": (2, _replace, False),
+    "PATCH /todos/{id}": (4, _patch, False),
+    "POST /todos/{id}/complete": (3, _complete, False),
+    "DELETE /todos/{id}": (3, _delete, False),
+    "DELETE /todos/completed": (1, _delete_completed, False),
+    "POST /todos/bulk": (1, _bulk_create, False),
+    "PATCH /todos/bulk": (1, _bulk_update, False),
+    "DELETE /todos/bulk": (1, _bulk_delete, False),
+    "POST /todos/import": (1, _import, False),
+    "GET /tags": (4, _tags, False),
+    "POST /tags": (1, _tag_create, False),
+    "PUT /tags/{id}": (1, _tag_update, False),
+    "DELETE /tags/{id}": (1, _tag_delete, False),
+    "GET /todos/stream": (1, None, True),
+    "WS /todos/ws": (1, None, True),
+}
+
+
+async def _stream(client, w):
+    """Time to the `ready` event of GET /todos/stream (timed as a whole here)."""
+    async with client.stream("GET", f"{API}/todos/stream", headers=w.headers) as r:
+        if r.status_code != 200:
+            return r.status_code
+        async for line in r.aiter_lines():
+            if line.startswith("event: ready"):
+                break
+        return r.status_code
+
+
+async def _websocket(base_url: str, w):
+    import websockets
+
+    token = w.headers["Authorization"].removeprefix("Bearer ")
+    url = base_url.replace("http", "ws", 1) + f"{API}/todos/ws?access_token={token}"
+    async with websockets.connect(url):
+        pass
+    return 101
+
+
+async def _login_token(client, email: str, password: str) -> dict:
+    r = await client.post(f"{API}/auth/login", data={"username": email, "password": password})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def _setup(client, w: Worker, email: str, password: str, tokens: dict, run_id: str) -> None:
+    w.email, w.password = email, password
+    if email not in tokens:
+        tokens[email] = await _login_token(client, email, password)
+    w.headers = tokens[email]
+    r = await client.get(f"{API}/todos", params={"limit": 100, "include_total": "false"}, headers=w.headers)
+    r.raise_for_status()
+    w.todo_ids = [item["id"] for item in r.json()["items"]]
+    r = await client.get(f"{API}/tags/", headers=w.headers)
+    r.raise_for_status()
+    w.tag_ids = [tag["id"] for tag in r.json()] or [0]
+
+    scratch = f"load-{run_id}-{w.index}@example.com"
+    r = await client.post(f"{API}/auth/register", json={"email": scratch, "password": "load-password"})
+    r.raise_for_status()
+    w.scratch = await _login_token(client, scratch, "load-password")
+
+
+async def _drive(client, base_url, w: Worker, names, weights, budget, deadline, samples, statuses) -> None:
+    while time.perf_counter() < deadline:
+        if budget is not None:
+            if budget[0] <= 0:
+                return
+            budget[0] -= 1
+        name = w.rng.choices(names, weights)[0]
+        _, op, _ = ROUTES[name]
+        try:
+            if op is None:
+                start = time.perf_counter()
+                code = await (_stream(client, w) if name == "GET /todos/stream" else _websocket(base_url, w))
+                elapsed, response = time.perf_counter() - start, None
+            else:
+                method, url, kwargs, callback = await op(client, w)
+                start = time.perf_counter()
+                response = await client.request(method, url, **kwargs)
+                elapsed, code = time.perf_counter() - start, response.status_code
+        except Exception:
+            code = "error"
+        counts = statuses[name]
+        counts[str(code)] = counts.get(str(code), 0) + 1
+        if code == "error" or code >= 400:
+            continue
+        samples[name].append(elapsed)
+        if response is not None and callback is not None:
+            callback(w, response)
+
+
+async def _run(client, base_url, args, emails, password, use_server: bool) -> dict:
+    names = [name for name, (_, _, server) in ROUTES.items() if use_server or not server]
+    if args.routes:
+        names = [name for name in names if any(part in name for part in args.routes)]
+    weights = [ROUTES[name][0] for name in names]
+    run_id = uuid.uuid4().hex[:8]
+    workers = [Worker(i, args.seed) for i in range(args.concurrency)]
+    tokens = {}
+    for w in workers:
+        await _setup(client, w, emails[w.index % len(emails)], password, tokens, run_id)
+
+    samples = {name: [] for name in names}
+    statuses = {name: {} for name in names}
+    budget = None if args.seconds else [args.requests]
+    started = time.perf_counter()
+    deadline = started + (args.seconds or float("inf"))
+    await asyncio.gather(*[
+        _drive(client, base_url, w, names, weights, budget, deadline, samples, statuses) for w in workers
+    ])
+    wall = time.perf_counter() - started
+
+    routes = {}
+    for name in names:
+        values = samples[name]
+        routes[name] = {
+            "n": len(values),
+            "errors": sum(count for code, count in statuses[name].items() if not _succeeded(code)),
+            "statuses": statuses[name],
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "p99_ms": _percentile(values, 99),
+            "rps": round(len(values) / wall, 2),
+        }
+    every = [v for values in samples.values() for v in values]
+    total = {
+        "n": len(every),
+        "errors": sum(row["errors"] for row in routes.values()),
+        "p50_ms": _percentile(every, 50),
+        "p95_ms": _percentile(every, 95),
+        "p99_ms": _percentile(every, 99),
+        "rps": round(len(every) / wall, 2),
+        "seconds": round(wall, 2),
+    }
+    return {"routes": routes, "total": total}
+
+
+def _meta(args, mode: str) -> dict:
+    from app.core.config import settings
+
+    return {
+        "mode": mode,
+        "concurrency": args.concurrency,
+        "requests": None if args.seconds else args.requests,
+        "seconds": args.seconds,
+        "users": args.users,
+        "todos": args.todos,
+        "tags": args.tags,
+        "seed": args.seed,
+        "routes": args.routes,
+        "db_async": settings.DB_ASYNC,
+        # What the in-process app ran with; a --url server uses its own settings
+        "rate_limits": None if mode == "http" else {
+            "read_per_second": settings.RATE_LIMIT_READ_PER_SECOND,
+            "write_per_second": settings.RATE_LIMIT_WRITE_PER_SECOND,
+            "write_max_concurrency": settings.WRITE_MAX_CONCURRENCY,
+        },
+        "sqlite_profile": settings.SQLITE_PROFILE,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": f"{platform.system()} {platform.machine()} {os.cpu_count()} cpus",
+        "created_at": datetime.utcnow().isoformat(timespec="seconds"),
+    }
+
+
+def _print_result(result: dict) -> None:
+    meta = result["meta"]
+    print(f"mode={meta['mode']} concurrency={meta['concurrency']} users={meta['users']} "
+          f"todos={meta['todos']} tags={meta['tags']} db_async={meta['db_async']}")
+    print(f"{'route':<28} {'n':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>8}")
+    for name, row in [*result["routes"].items(), ("total", result["total"])]:
+        failed = " ".join(
+            f"{code}x{count}" for code, count in sorted(row.get("statuses", {}).items()) if not _succeeded(code)
+        )
+        print(f"{name:<28} {row['n']:>6} {row['errors']:>4} {row['p50_ms']:>8.2f} "
+              f"{row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['rps']:>8.1f}  {failed}")
+
+
+def compare(result: dict, baseline: dict, threshold: float, noise_ms: float, error_threshold: float) -> list:
+    """Print the comparison and return the regressed route names (plus "total")."""
+    keys = ("mode", "concurrency", "users", "todos", "tags", "routes", "db_async", "sqlite_profile", "machine",
+            "rate_limits")
+    changed = [k for k in keys if result["meta"].get(k) != baseline["meta"].get(k)]
+    if changed:
+        print("warning: baseline ran with different " + ", ".join(
+            f"{k} ({baseline['meta'].get(k)} -> {result['meta'].get(k)})" for k in changed))
+
+    def delta(new, old):
+        return (new - old) / old if old else 0.0
+
+    regressions = []
+    def errors_grew(row, old):
+        return _error_rate(row) > _error_rate(old) + error_threshold
+
+    print(f"\n{'route':<28} {'p50 ms':>17} {'p95 ms':>17} {'errors':>15}")
+    for name, row in result["routes"].items():
+        old = baseline["routes"].get(name)
+        if old is None:
+            print(f"{name:<28} (not in baseline)")
+            continue
+        flag = ""
+        if errors_grew(row, old):
+            flag = "REGRESSION (errors)"
+            regressions.append(name)
+        elif row["n"] < MIN_SAMPLES <= old["n"]:
+            flag = "REGRESSION (lost samples)"
+            regressions.append(name)
+        elif min(row["n"], old["n"]) < MIN_SAMPLES:
+            flag = "few samples"
+        elif any(
+            row[k] > old[k] * (1 + threshold) and row[k] - old[k] > noise_ms for k in ("p50_ms", "p95_ms")
+        ):
+            flag = "REGRESSION"
+            regressions.append(name)
+        print(f"{name:<28} {old['p50_ms']:7.2f} -> {row['p50_ms']:7.2f} ({delta(row['p50_ms'], old['p50_ms']):+5.0%})"
+              f" {old['p95_ms']:7.2f} -> {row['p95_ms']:7.2f} ({delta(row['p95_ms'], old['p95_ms']):+5.0%})"
+              f" {_error_rate(old):6.1%} -> {_error_rate(row):6.1%}  {flag}")
+    old_rps, rps = baseline["total"]["rps"], result["total"]["rps"]
+    flag = ""
+    if rps < old_rps * (1 - threshold):
+        flag = "REGRESSION"
+        regressions.append("total")
+    elif errors_grew(result["total"], baseline["total"]):
+        flag = "REGRESSION (errors)"
+        regressions.append("total")
+    print(f"{'total req/s':<28} {old_rps:7.1f} -> {rps:7.1f} ({delta(rps, old_rps):+5.0%})"
+          f"{'':>19} {_error_rate(baseline['total']):6.1%} -> {_error_rate(result['total']):6.1%}  {flag}")
+    return regressions
+
+
+async def _in_process(args) -> dict:
+    import httpx
+    from app.core.database import engine
+    from app.main import app
+    from .datagen import generate
+
+    data = generate(engine, args.users, args.todos, args.tags, args.seed, args.password)
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            return await _run(client, None, args, data["emails"], args.password, use_server=False)
+
+
+async def _over_http(args) -> dict:
+    import httpx
+
+    emails = [f"bench{i}@example.com" for i in range(1, args.users + 1)]
+    limits = httpx.Limits(max_connections=args.concurrency * 2)
+    async with httpx.AsyncClient(base_url=args.url, timeout=60, limits=limits) as client:
+        return await _run(client, args.url, args, emails, args.password, use_server=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="drive a running server instead of the app in-process")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=5000, help="total timed requests")
+    parser.add_argument("--seconds", type=float, help="run for a duration instead of --requests")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--todos", type=int, default=1000, help="todos per user")
+    parser.add_argument("--tags", type=int, default=10, help="tags per user")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--rate-limits", action="store_true",
+                        help="in-process: keep the per-user RATE_LIMIT_* budgets on")
+    parser.add_argument("--routes", nargs="*", help="only routes whose name contains one of these")
+    parser.add_argument("--json", help="write the result to this file")
+    parser.add_argument("--save-baseline", help="write the result as the baseline to this file")
+    parser.add_argument("--compare", help="compare with this baseline; exit 1 on a regression")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)")
+    parser.add_argument("--noise-ms", type=float, default=0.5, help="ignore latency changes below this")
+    parser.add_argument("--error-threshold", type=float, default=0.01,
+                        help="allowed error rate growth (0.01 = 1 point)")
+    args = parser.parse_args()
+
+    repo_root = os.getcwd()
+    if args.url:
+        result = asyncio.run(_over_http(args))
+        result["meta"] = _meta(args, "http")
+    else:
+        if not args.rate_limits:
+            # Read when app.core.config is first imported
+            os.environ["RATE_LIMIT_READ_PER_SECOND"] = "0"
+            os.environ["RATE_LIMIT_WRITE_PER_SECOND"] = "0"
+        with tempfile.TemporaryDirectory() as tmp:
+            # The app's database lives at ./todo_app.db
+            os.chdir(tmp)
+            from alembic import command
+            from alembic.config import Config
+            command.upgrade(Config(os.path.join(repo_root, "alembic.ini")), "head")
+            result = asyncio.run(_in_process(args))
+            result["meta"] = _meta(args, "in-process")
+            os.chdir(repo_root)
+
+    _print_result(result)
+    for path in (args.json, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(result, f, indent=2, sort_keys=True)
+                f.write("\n")
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.threshold, args.noise_ms, args.error_threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
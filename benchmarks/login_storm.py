@@ -0,0 +1,94 @@
+"""/todos latency while a login storm runs (requires httpx).
+
+    python -m benchmarks.login_storm [--seconds 5] [--concurrency 32]
+
+Runs the app in-process against a throwaway database. First measures
+GET /todos latency alone, then again while --concurrency clients log in
+back to back. With password hashing in the worker pool the /todos
+percentiles should barely move; compare with PASSWORD_HASH_WORKERS=0
+(hashing on the request threadpool).
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+
+def _percentile(values, pct):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))] * 1000 if values else float("nan")
+
+
+async def _poll(client, headers, stop, latencies):
+    while time.perf_counter() < stop:
+        start = time.perf_counter()
+        r = await client.get("/api/v1/todos", headers=headers)
+        r.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def _login_loop(client, stop, counts):
+    form = {"username": "storm@example.com", "password": "storm-password"}
+    while time.perf_counter() < stop:
+        r = await client.post("/api/v1/auth/login", data=form)
+        counts[r.status_code] = counts.get(r.status_code, 0) + 1
+        if r.status_code == 503:
+            await asyncio.sleep(float(r.headers.get("Retry-After", "1")) / 10)
+
+
+async def _bench(seconds: float, concurrency: int) -> None:
+    import httpx
+    from app.main import app
+    from app.core.config import settings
+    from app.core.password_hasher import password_hasher
+
+    password_hasher.start()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/v1/auth/register", json={"email": "storm@example.com", "password": "storm-password"})
+        r = await client.post("/api/v1/auth/login", data={"username": "storm@example.com", "password": "storm-password"})
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+        for i in range(50):
+            await client.post("/api/v1/todos", json={"title": f"storm todo {i}"}, headers=headers)
+
+        baseline = []
+        await _poll(client, headers, time.perf_counter() + seconds, baseline)
+
+        during, counts = [], {}
+        stop = time.perf_counter() + seconds
+        await asyncio.gather(
+            _poll(client, headers, stop, during),
+            *[_login_loop(client, stop, counts) for _ in range(concurrency)],
+        )
+    password_hasher.shutdown()
+
+    print(f"PASSWORD_HASH_WORKERS={settings.PASSWORD_HASH_WORKERS} BCRYPT_ROUNDS={settings.BCRYPT_ROUNDS} "
+          f"concurrency={concurrency}")
+    print(f"logins/s: {counts.get(200, 0) / seconds:.1f}  rejected (503): {counts.get(503, 0)}")
+    for label, values in (("idle", baseline), ("storm", during)):
+        print(f"/todos {label:<6} n={len(values):<6} p50={_percentile(values, 50):7.2f} ms "
+              f"p95={_percentile(values, 95):7.2f} ms p99={_percentile(values, 99):7.2f} ms "
+              f"mean={statistics.fmean(values) * 1000 if values else float('nan'):7.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    repo_root = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app's database lives at ./todo_app.db
+        os.chdir(tmp)
+        from alembic import command
+        from alembic.config import Config
+        command.upgrade(Config(os.path.join(repo_root, "alembic.ini")), "head")
+        asyncio.run(_bench(args.seconds, args.concurrency))
+        os.chdir(repo_root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""ORM hydration vs the Core read model used by the list endpoints.
+
+    python -m benchmarks.read_model [--todos 5000] [--page 100] [--rounds 200]
+
+Seeds a throwaway database, then times the same page query (newest first,
+tags attached, turned into response dicts) through full Todo ORM objects
+with selectinload and through TodoRepository's TodoRecord path. Memory is
+the tracemalloc peak while reading --todos rows at once.
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+
+def _seed(db, todos: int) -> int:
+    from sqlalchemy import insert
+    from app.models import User, Tag
+    from app.repositories.todo_repository import TodoRepository
+
+    owner_id = db.execute(
+        insert(User).returning(User.id), {"email": "bench@example.com", "hashed_password": "x"}
+    ).scalar_one()
+    tag_ids = db.execute(
+        insert(Tag).returning(Tag.id, sort_by_parameter_order=True),
+        [{"name": f"tag {i}", "owner_id": owner_id} for i in range(5)],
+    ).scalars().all()
+    rows = [{"title": f"todo {i}", "description": "benchmark row " * 4, "is_done": i % 3 == 0, "due_date": None}
+            for i in range(todos)]
+    TodoRepository(db).bulk_create(rows, [tag_ids[i % 5:i % 5 + 2] for i in range(todos)], owner_id)
+    return owner_id
+
+
+def _orm_page(db, owner_id: int, limit: int):
+    from app.models import Todo
+    from app.repositories.todo_repository import _apply_filters, _apply_order, _load_tags
+
+    query = _load_tags(_apply_order(_apply_filters(db.query(Todo), owner_id)), "selectin")
+    return query.limit(limit).all()
+
+
+def _time(fn, rounds: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - start) / rounds
+
+
+def _peak(fn) -> int:
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def _bench(todos: int, page: int, rounds: int) -> None:
+    from app.core.database import SessionLocal
+    from app.repositories.todo_repository import TodoRepository
+    from app.services.todo_service import _enrich_todos
+
+    with SessionLocal() as db:
+        owner_id = _seed(db, todos)
+
+    def orm(limit):
+        with SessionLocal() as db:
+            return _enrich_todos(_orm_page(db, owner_id, limit))
+
+    def core(limit):
+        with SessionLocal() as db:
+            return _enrich_todos(TodoRepository(db).get_all(owner_id, limit=limit, include_total=False)[0])
+
+    assert orm(page) == core(page + 1)[:page], "paths return different data"
+    print(f"todos={todos} page={page} rounds={rounds}")
+    for name, fn in (("orm", orm), ("core", core)):
+        per_page = _time(lambda: fn(page), rounds)
+        peak = _peak(lambda: fn(todos))
+        print(f"{name:<5} {per_page * 1000:7.2f} ms/page  {per_page * 1e6 / page:6.1f} us/row  "
+              f"peak {peak / 1e6:6.1f} MB for {todos} rows ({peak / todos:,.0f} B/row)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--todos", type=int, default=5000)
+    parser.add_argument("--page", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    repo_root = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The app's database lives at ./todo_app.db
+        os.chdir(tmp)
+        from alembic import command
+        from alembic.config import Config
+        command.upgrade(Config(os.path.join(repo_root, "alembic.ini")), "head")
+        _bench(args.todos, args.page, args.rounds)
+        os.chdir(repo_root)
+
+
+if __name__ == "__main__":
+    main()
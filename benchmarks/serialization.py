@@ -0,0 +1,94 @@
+"""Per-page serialization cost of GET /todos, before and after the fast path.
+
+    python -m benchmarks.serialization [--items 100] [--tags 2] [--rounds 2000]
+
+No database: pages are built from transient Todo/Tag objects, so only the
+Python-side work is measured. "dict+jsonable" is the original path (dict per
+row, PaginatedResponse validation, FastAPI's re-validation, jsonable_encoder
+and json.dumps); "dict+dump_json" is the same with newer FastAPI's
+dump_json; "dict+to_json" is what the list endpoints do now (response
+dicts built once, encoded by pydantic-core without re-validation).
+"""
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+
+
+def _legacy_enrich(todo) -> dict:
+    return {
+        "id": todo.id,
+        "title": todo.title,
+        "description": todo.description,
+        "is_done": todo.is_done,
+        "due_date": todo.due_date,
+        "created_at": todo.created_at,
+        "updated_at": todo.updated_at,
+        "owner_id": todo.owner_id,
+        "tags": todo.tags,
+        "is_overdue": not todo.is_done and todo.due_date is not None and todo.due_date < datetime.utcnow(),
+    }
+
+
+def _fixtures(items: int, tags: int):
+    from app.models import Todo, Tag
+
+    now = datetime.utcnow()
+    tag_objs = [Tag(id=i + 1, name=f"tag {i}", color="#6366f1", owner_id=1) for i in range(tags)]
+    todos = []
+    for i in range(items):
+        todo = Todo(
+            id=i + 1, title=f"todo number {i}", description="some description " * 3,
+            is_done=i % 3 == 0, due_date=now + timedelta(days=i - items // 2) if i % 2 else None,
+            created_at=now, updated_at=now, owner_id=1,
+        )
+        todo.tags = list(tag_objs)
+        todos.append(todo)
+    return todos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--tags", type=int, default=2)
+    parser.add_argument("--rounds", type=int, default=2000)
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from pydantic import TypeAdapter
+    from pydantic_core import to_json
+    from app.schemas.todo import PaginatedResponse
+    from app.services.todo_service import _enrich_todos, _page
+
+    adapter = TypeAdapter(PaginatedResponse)  # What FastAPI validates against
+
+    todos = _fixtures(args.items, args.tags)
+
+    def legacy_page():
+        return PaginatedResponse(items=[_legacy_enrich(t) for t in todos], total=len(todos), limit=args.items, offset=0)
+
+    def dict_jsonable():
+        page = adapter.validate_python(legacy_page(), from_attributes=True)
+        return json.dumps(jsonable_encoder(page), ensure_ascii=False, separators=(",", ":")).encode()
+
+    def dict_dump_json():
+        return adapter.dump_json(adapter.validate_python(legacy_page(), from_attributes=True))
+
+    def dict_to_json():
+        return to_json(_page(_enrich_todos(todos), args.items, 0, total=len(todos)))
+
+    reference = dict_jsonable()
+    print(f"items={args.items} tags/item={args.tags} rounds={args.rounds} "
+          f"byte-identical={dict_to_json() == reference}")
+    for name, fn in (("dict+jsonable", dict_jsonable), ("dict+dump_json", dict_dump_json),
+                     ("dict+to_json", dict_to_json)):
+        assert json.loads(fn()) == json.loads(reference), f"{name} output differs"
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            fn()
+        per_page = (time.perf_counter() - start) / args.rounds
+        print(f"{name:<16} {per_page * 1e6:9.1f} us/page  {per_page * 1e6 / args.items:6.2f} us/item")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Read/write throughput of each SQLite storage profile.
+
+    python -m benchmarks.sqlite_profiles [--seconds 5] [--readers 8] [--writers 2]
+
+Each profile gets a fresh database file in a temp directory. Writer threads
+insert one todo per commit, reader threads run the owner-scoped list query;
+both run concurrently for --seconds.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from sqlalchemy import create_engine, insert, select, desc
+
+from app.core.config import settings
+from app.core.database import Base
+from app.core.storage import STORAGE_PROFILES, resolve_pragmas, install_pragmas, storage_report
+from app.models import User, Todo
+
+OWNERS = 10
+
+
+def _engine(path: str, profile: str):
+    engine = create_engine(
+        f"sqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    install_pragmas(engine, resolve_pragmas(settings, profile))
+    return engine
+
+
+def _seed(engine) -> None:
+    Base.metadata.create_all(engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": i, "email": f"bench{i}@example.com", "hashed_password": "x", "created_at": now}
+            for i in range(1, OWNERS + 1)
+        ])
+        conn.execute(insert(Todo), [
+            {"title": f"todo {n}", "owner_id": n % OWNERS + 1, "is_done": n % 3 == 0,
+             "created_at": now, "updated_at": now}
+            for n in range(20000)
+        ])
+
+
+def _run(engine, seconds: float, readers: int, writers: int) -> dict:
+    stop = time.perf_counter() + seconds
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def reader(n: int):
+        done = 0
+        query = select(Todo.id, Todo.title).where(Todo.owner_id == n % OWNERS + 1) \
+            .order_by(desc(Todo.created_at), desc(Todo.id)).limit(20)
+        while time.perf_counter() < stop:
+            with engine.connect() as conn:
+                conn.execute(query).all()
+            done += 1
+        with lock:
+            counts["reads"] += done
+
+    def writer(n: int):
+        done = errors = 0
+        while time.perf_counter() < stop:
+            now = datetime.utcnow()
+            try:
+                with engine.begin() as conn:
+                    conn.execute(insert(Todo), {"title": "bench write", "owner_id": n % OWNERS + 1,
+                                                "is_done": False, "created_at": now, "updated_at": now})
+                done += 1
+            except Exception:  # busy_timeout exceeded
+                errors += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--profiles", nargs="*", default=list(STORAGE_PROFILES))
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'reads/s':>10} {'writes/s':>10} {'errors':>7}  pragmas")
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in args.profiles:
+            engine = _engine(os.path.join(tmp, f"{profile}.db"), profile)
+            _seed(engine)
+            counts = _run(engine, args.seconds, args.readers, args.writers)
+            report = storage_report(engine)
+            engine.dispose()
+            print(
+                f"{profile:<10} {counts['reads'] / args.seconds:>10.0f} "
+                f"{counts['writes'] / args.seconds:>10.0f} {counts['errors']:>7}  "
+                f"journal={report['journal_mode']} synchronous={report['synchronous']} "
+                f"mmap={report['mmap_size']} cache={report['cache_size']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Shared fixtures: one freshly migrated database per test session.
+
+The backend comes from TEST_DATABASE_URL (default: a SQLite file in a temp
+directory), e.g.
+
+    TEST_DATABASE_URL=postgresql+psycopg://postgres@localhost/todo_test pytest
+
+A PostgreSQL test database is emptied (schema public dropped) before the
+migrations run, so never point it at real data.
+"""
+import os
+import tempfile
+import uuid
+
+# Settings are read when app.core.config is imported: set them first
+_TMP = tempfile.mkdtemp(prefix="todo-tests-")
+os.environ["DATABASE_URL"] = os.environ.get("TEST_DATABASE_URL") or f"sqlite:///{_TMP}/test.db"
+os.environ.pop("DATABASE_ASYNC_URL", None)
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("RATE_LIMIT_READ_PER_SECOND", "0")
+os.environ.setdefault("RATE_LIMIT_WRITE_PER_SECOND", "0")
+os.environ.setdefault("WRITE_MAX_CONCURRENCY", "0")
+
+import pytest
+from alembic import command
+from alembic.config import Config
+
+from app.core.database import engine, SessionLocal, IS_SQLITE
+from app.core.security import create_access_token
+from app.repositories.user_repository import UserRepository
+from app.schemas.user import UserCreate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+requires_sqlite = pytest.mark.skipif(not IS_SQLITE, reason="SQLite only")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def migrated_db():
+    if not IS_SQLITE:
+        with engine.begin() as conn:
+            conn.exec_driver_sql("DROP SCHEMA public CASCADE")
+            conn.exec_driver_sql("CREATE SCHEMA public")
+    command.upgrade(Config(os.path.join(ROOT, "alembic.ini")), "head")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    """A new user per test, so tests never see each other's rows."""
+    email = f"user-{uuid.uuid4().hex[:12]}@example.com"
+    return UserRepository(db).create(UserCreate(email=email, password="password123"), hashed_password="x")
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth_headers(user):
+    token = create_access_token(data={"user_id": user.id, "sub": user.email})
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,80 @@
+"""Bearer token checks in api/deps.py and registration in the auth routers."""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.api.deps import get_current_user_async
+from app.core.config import settings
+from app.core.database import ASYNC_SQLALCHEMY_DATABASE_URL
+from app.core.security import ALGORITHM
+from app.repositories.async_user_repository import AsyncUserRepository
+from app.repositories.user_repository import UserRepository
+from app.routers import async_auth
+from app.schemas.user import UserCreate
+
+
+def _token_without_exp(user) -> str:
+    # Validly signed, but python-jose does not require the exp claim
+    return jwt.encode({"user_id": user.id, "sub": user.email}, settings.SECRET_KEY, algorithm=ALGORITHM)
+
+
+def test_token_without_exp_is_rejected(client, user):
+    headers = {"Authorization": f"Bearer {_token_without_exp(user)}"}
+
+    response = client.get("/api/v1/auth/me", headers=headers)
+
+    assert response.status_code == 401
+
+
+def test_token_without_exp_is_rejected_on_the_async_stack(user):
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(get_current_user_async(_token_without_exp(user), db=None))
+    assert exc.value.status_code == 401
+
+
+def test_valid_token_is_accepted(client, auth_headers, user):
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == user.email
+
+
+def test_register_duplicate_email_is_rejected(client, user):
+    response = client.post("/api/v1/auth/register", json={"email": user.email, "password": "password123"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email đã được đăng ký"
+
+
+def test_register_race_on_insert_is_rejected(client, user, monkeypatch):
+    # Another request registers the email after our lookup: the unique index catches it
+    monkeypatch.setattr(UserRepository, "get_by_email", lambda self, email: None)
+
+    response = client.post("/api/v1/auth/register", json={"email": user.email, "password": "password123"})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Email đã được đăng ký"
+
+
+def test_register_race_on_insert_is_rejected_on_the_async_stack(user, monkeypatch):
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    async def lookup_missed(self, email):
+        return None
+
+    async def register():
+        engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL)
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                user_data = UserCreate(email=user.email, password="password123")
+                return await async_auth.register(user_data, AsyncUserRepository(session))
+        finally:
+            await engine.dispose()
+
+    monkeypatch.setattr(AsyncUserRepository, "get_by_email", lookup_missed)
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(register())
+    assert exc.value.status_code == 400
+    assert exc.value.detail == "Email đã được đăng ký"
@@ -0,0 +1,80 @@
+"""Repository paths that differ between SQLite and PostgreSQL.
+
+CI runs the whole suite once per backend (TEST_DATABASE_URL, see
+conftest.py); these tests cover what core.database.upsert(), the counter
+triggers of both dialects and the json_agg/json_group_array UPDATE ...
+RETURNING do.
+"""
+from app.core.database import async_url
+from app.repositories.tag_repository import TagRepository, tag_name_cache
+from app.repositories.todo_repository import TodoRepository
+from app.repositories.version_repository import DataVersionRepository
+from app.schemas.tag import TagCreate
+from app.schemas.todo import TodoCreate, TodoUpdate
+from app.services.todo_purger import TodoPurger
+
+
+def test_async_url_uses_the_async_driver():
+    assert async_url("sqlite:///./todo_app.db") == "sqlite+aiosqlite:///./todo_app.db"
+    assert (async_url("postgresql+psycopg://todo:secret@db:5432/todo")
+            == "postgresql+asyncpg://todo:secret@db:5432/todo")
+
+
+def test_version_bump_upserts(db, user):
+    versions = DataVersionRepository(db)
+    start = versions.get(user.id)
+
+    versions.bump(user.id)
+    versions.bump(user.id)
+    db.commit()
+
+    assert versions.get(user.id) == start + 2
+
+
+def test_tag_names_upsert_reuses_existing_tags(db, user):
+    tags = TagRepository(db)
+    work = tags.create(TagCreate(name="work"), user.id)
+    tag_name_cache.invalidate(user.id)
+
+    ids, created = tags.ensure_names(["work", "home"], user.id)
+    db.commit()
+
+    assert created == 1
+    assert ids["work"] == work.id
+    assert sorted(t.name for t in tags.get_all(user.id)) == ["home", "work"]
+
+
+def test_update_returns_the_todo_with_its_tags(db, user):
+    tag = TagRepository(db).create(TagCreate(name="work"), user.id)
+    todos = TodoRepository(db)
+    todo = todos.create(TodoCreate(title="tagged todo"), user.id, tags=[tag])
+
+    record = todos.update(todo.id, TodoUpdate(title="renamed todo"), user.id)
+
+    assert record.title == "renamed todo"
+    assert [(t.id, t.name) for t in record.tags] == [(tag.id, "work")]
+
+
+def test_counters_follow_every_write(db, user):
+    tag = TagRepository(db).create(TagCreate(name="work"), user.id)
+    todos = TodoRepository(db)
+    ids = [
+        todos.create(TodoCreate(title=f"counted {i}"), user.id, tags=[tag] if i < 2 else None).id
+        for i in range(3)
+    ]
+
+    def counts():
+        return (todos.count(user.id), todos.count(user.id, is_done=True),
+                todos.count(user.id, tag_id=tag.id), todos.count(user.id, is_done=True, tag_id=tag.id))
+
+    assert counts() == (3, 0, 2, 0)
+    todos.update(ids[0], TodoUpdate(is_done=True), user.id)
+    assert counts() == (3, 1, 2, 1)
+    todos.update(ids[2], TodoUpdate(), user.id, tags=[tag])
+    assert counts() == (3, 1, 3, 1)
+    todos.delete(ids[0], user.id)
+    assert counts() == (2, 0, 2, 0)
+
+    # Hard-deleting the soft-deleted row must not count it out a second time
+    TodoPurger(interval=60, batch_size=100, target_seconds=1, pause_seconds=0, vacuum_pages=0).purge_batch(db, 100)
+    assert counts() == (2, 0, 2, 0)
@@ -0,0 +1,38 @@
+"""Bulk endpoints: rejected items leave no trace."""
+from datetime import timedelta
+
+from app.repositories.todo_repository import TodoRepository
+from app.repositories.version_repository import DataVersionRepository
+from app.schemas.todo import TodoCreate
+
+API = "/api/v1"
+
+
+def test_bulk_update_rejected_items_create_no_tags(client, auth_headers, db, user):
+    todo = TodoRepository(db).create(TodoCreate(title="to update"), user.id)
+    too_early = (todo.created_at - timedelta(days=1)).isoformat()
+    items = [
+        {"id": 10**9, "tag_names": ["missing"]},
+        {"id": todo.id, "due_date": too_early, "tag_names": ["bad deadline"]},
+        {"id": todo.id, "title": "updated", "tag_names": ["kept"]},
+        {"id": todo.id, "tag_names": ["duplicate"]},
+    ]
+
+    response = client.patch(f"{API}/todos/bulk", json={"items": items}, headers=auth_headers)
+
+    assert [r["status"] for r in response.json()["results"]] == [404, 400, 200, 409]
+    tags = client.get(f"{API}/tags/", headers=auth_headers).json()
+    assert [t["name"] for t in tags] == ["kept"]
+
+
+def test_bulk_update_with_only_rejected_items_changes_nothing(client, auth_headers, db, user):
+    versions = DataVersionRepository(db)
+    before = versions.get(user.id)
+
+    response = client.patch(f"{API}/todos/bulk", json={"items": [{"id": 10**9, "tag_names": ["missing"]}]},
+                            headers=auth_headers)
+
+    assert response.json()["failed"] == 1
+    assert client.get(f"{API}/tags/", headers=auth_headers).json() == []
+    db.expire_all()
+    assert versions.get(user.id) == before
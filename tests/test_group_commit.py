@@ -0,0 +1,116 @@
+"""GroupCommitWriter: units of one batch succeed or fail independently,
+and a failed batch commit reaches every caller."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from app.core import group_commit
+from app.core.events import change_broker
+from app.core.group_commit import GroupCommitWriter, GroupSession
+from app.repositories.tag_repository import TagRepository
+from app.repositories.todo_repository import TodoRepository
+from app.schemas.tag import TagCreate
+from app.schemas.todo import TodoCreate, TodoUpdate
+from app.services.todo_service import TodoService
+
+
+@pytest.fixture
+def writers(monkeypatch):
+    """Installs a writer in place of the app's group_writer. Its next batch
+    is exactly the next `batch_size` submits; writer.batches records the
+    size of every batch it ran."""
+    created = []
+
+    def make(batch_size):
+        writer = GroupCommitWriter(enabled=True, max_batch=batch_size, max_wait_ms=5000)
+        writer.batches = []
+        commit_batch = writer._commit_batch
+
+        def recording(batch):
+            writer.batches.append(len(batch))
+            commit_batch(batch)
+
+        writer._commit_batch = recording
+        monkeypatch.setattr(group_commit, "group_writer", writer)
+        created.append(writer)
+        return writer
+
+    yield make
+    for writer in created:
+        writer.shutdown()
+        if writer._engine is not None:
+            writer._engine.dispose()
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """(owner_id, event_type) of every change event published."""
+    published = []
+    monkeypatch.setattr(change_broker, "publish", lambda owner_id, event_type, data=None: published.append((owner_id, event_type)))
+    return published
+
+
+def run_concurrently(*calls):
+    """Call each function on its own thread; returns each one's result or exception."""
+    with ThreadPoolExecutor(len(calls)) as pool:
+        futures = [pool.submit(call) for call in calls]
+        return [f.exception() or f.result() for f in futures]
+
+
+def test_units_of_a_batch_fail_independently(db, user, writers, events):
+    tags = TagRepository(db)
+    tags.create(TagCreate(name="work"), user.id)
+    todo = TodoRepository(db).create(TodoCreate(title="original"), user.id)
+    service = TodoService(TodoRepository(db), tags)
+    writer = writers(batch_size=5)
+    events.clear()  # the seed rows' events
+
+    def fails_after_writing(session):
+        TagRepository(session).create(TagCreate(name="ghost"), user.id)
+        raise ValueError("boom")
+
+    updated, missing, duplicate, failed, created = run_concurrently(
+        lambda: service.update_todo(todo.id, TodoUpdate(title="renamed"), user.id),
+        lambda: service.update_todo(10**9, TodoUpdate(title="renamed"), user.id),
+        lambda: tags.create(TagCreate(name="work"), user.id),
+        lambda: writer.submit(fails_after_writing),
+        lambda: tags.create(TagCreate(name="home"), user.id),
+    )
+
+    assert writer.batches == [5]
+    assert updated["title"] == "renamed"
+    assert isinstance(missing, HTTPException) and missing.status_code == 404
+    assert isinstance(duplicate, IntegrityError)
+    assert isinstance(failed, ValueError)
+    assert created.name == "home"
+
+    db.expire_all()
+    assert TodoRepository(db).get_record(todo.id, user.id).title == "renamed"
+    assert sorted(t.name for t in tags.get_all(user.id)) == ["home", "work"]
+    # Only the committed units' on_commit callbacks ran
+    assert sorted(events) == [(user.id, "tag.created"), (user.id, "todo.updated")]
+
+
+def test_failed_batch_commit_reaches_every_caller(db, user, writers, events, monkeypatch):
+    commit = GroupSession.commit
+
+    def failing_commit(self):
+        if self.unit_transaction is None:
+            raise RuntimeError("disk I/O error")
+        return commit(self)
+
+    monkeypatch.setattr(GroupSession, "commit", failing_commit)
+    tags = TagRepository(db)
+    writer = writers(batch_size=2)
+
+    results = run_concurrently(
+        lambda: tags.create(TagCreate(name="first"), user.id),
+        lambda: tags.create(TagCreate(name="second"), user.id),
+    )
+
+    assert writer.batches == [2]
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+    assert tags.get_all(user.id) == []
+    assert events == []
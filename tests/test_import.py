@@ -0,0 +1,46 @@
+"""POST /todos/import keeps going when one batch fails to insert."""
+import json
+
+from sqlalchemy.exc import OperationalError
+
+from app.repositories.todo_repository import TodoRepository
+
+API = "/api/v1"
+
+
+def _ndjson(rows):
+    return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+def test_failed_batch_is_reported_and_skipped(client, auth_headers, monkeypatch):
+    bulk_create = TodoRepository.bulk_create
+    calls = []
+
+    def second_batch_fails(self, rows, tag_ids, owner_id):
+        calls.append(len(rows))
+        if len(calls) == 2:
+            raise OperationalError("INSERT", {}, Exception("database is locked"))
+        return bulk_create(self, rows, tag_ids, owner_id)
+
+    monkeypatch.setattr(TodoRepository, "bulk_create", second_batch_fails)
+    rows = [
+        {"title": "imported 1"},
+        {"title": "imported 2"},
+        {"title": "lost 3", "tags": ["fresh"]},
+        {"title": "lost 4"},
+        {"title": "imported 5", "tags": ["fresh"]},
+    ]
+
+    response = client.post(f"{API}/todos/import", params={"batch_size": 2}, content=_ndjson(rows),
+                           headers={**auth_headers, "Content-Type": "application/x-ndjson"})
+
+    assert response.status_code == 200
+    summary = response.json()
+    assert (summary["imported"], summary["failed"], summary["batches"]) == (3, 2, 2)
+    assert [(e["line"], e["last_line"]) for e in summary["errors"]] == [(3, 4)]
+    assert summary["tags_created"] == 1
+
+    todos = client.get(f"{API}/todos", params={"limit": 10}, headers=auth_headers).json()["items"]
+    by_title = {t["title"]: [tag["name"] for tag in t["tags"]] for t in todos}
+    # "fresh" was rolled back with lines 3-4 and created again for line 5
+    assert by_title == {"imported 1": [], "imported 2": [], "imported 5": ["fresh"]}
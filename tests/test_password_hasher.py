@@ -0,0 +1,19 @@
+"""PasswordHasher worker pool."""
+import asyncio
+
+from app.core.password_hasher import PasswordHasher
+
+
+def test_start_spawns_every_worker():
+    hasher = PasswordHasher(workers=2, max_pending=4)
+    try:
+        hasher.start()
+
+        processes = hasher._executor._processes
+        assert len(processes) == 2
+        assert all(p.is_alive() for p in processes.values())
+
+        hashed = asyncio.run(hasher.hash("password123"))
+        assert asyncio.run(hasher.verify_and_update("password123", hashed))[0]
+    finally:
+        hasher.shutdown()
@@ -0,0 +1,113 @@
+"""Every owner-scoped TodoRepository/TagRepository query must use an index.
+
+Each case runs a repository call, captures the SQL it sends and asks the
+database for the plan: SQLite's EXPLAIN QUERY PLAN must not contain a
+`SCAN` of todos / tags / todo_tags (or an alias such as todo_tags_1),
+whether bare or `USING [COVERING] INDEX` - walking a whole index is a full
+scan too. No ORDER BY index scan is intended; list one in ALLOWED_SCANS
+if that changes. On PostgreSQL (with enable_seqscan off, so tiny tables
+don't favour scans) EXPLAIN must not contain a `Seq Scan` on those tables.
+"""
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import engine, IS_SQLITE
+from app.repositories.tag_repository import TagRepository
+from app.repositories.todo_repository import TodoRepository
+from app.schemas.tag import TagCreate
+from app.schemas.todo import TodoCreate, TodoUpdate
+
+TABLES = ("todos", "tags", "todo_tags")
+FULL_SCAN = (
+    re.compile(r"^SCAN (%s)(_\d+)?\b" % "|".join(TABLES)) if IS_SQLITE
+    else re.compile(r"Seq Scan on (%s)\b" % "|".join(TABLES))
+)
+
+# (case, plan line) pairs that may scan on purpose
+ALLOWED_SCANS = set()
+
+
+@contextmanager
+def captured_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().split(None, 1)[0].upper() in ("SELECT", "UPDATE", "DELETE"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def plan_lines(statement, parameters):
+    with engine.connect() as conn:
+        if IS_SQLITE:
+            rows = conn.exec_driver_sql("EXPLAIN QUERY PLAN " + statement, parameters).all()
+            return [row[-1] for row in rows]
+        conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        rows = conn.exec_driver_sql("EXPLAIN " + statement, parameters).all()
+        conn.rollback()
+        return [row[0].strip() for row in rows]
+
+
+@pytest.fixture
+def seeded(db, user):
+    tags = TagRepository(db)
+    tag = tags.create(TagCreate(name="work"), user.id)
+    todos = TodoRepository(db)
+    now = datetime.utcnow()
+    for i, due in enumerate((None, now - timedelta(days=2), now + timedelta(minutes=5), now + timedelta(days=3))):
+        todos.create(TodoCreate(title=f"report {i}", description="quarterly numbers", due_date=due),
+                     user.id, tags=[tag] if i % 2 else None)
+    return user.id, tag.id
+
+
+CASES = {
+    "list": lambda todos, tags, owner, tag: todos.get_all(owner),
+    "list without total": lambda todos, tags, owner, tag: todos.get_all(owner, include_total=False),
+    "list done": lambda todos, tags, owner, tag: todos.get_all(owner, is_done=False),
+    "list oldest first": lambda todos, tags, owner, tag: todos.get_all(owner, sort_desc=False),
+    "list by tag": lambda todos, tags, owner, tag: todos.get_all(owner, tag_id=tag),
+    "search": lambda todos, tags, owner, tag: todos.get_all(owner, q="report"),
+    "search by relevance": lambda todos, tags, owner, tag: todos.get_all(owner, q="quarter", sort="relevance"),
+    "cursor first page": lambda todos, tags, owner, tag: todos.get_page_after(owner),
+    "cursor next page": lambda todos, tags, owner, tag: todos.get_page_after(owner, after=(datetime.utcnow(), 10**9)),
+    "cursor by tag": lambda todos, tags, owner, tag: todos.get_page_after(owner, tag_id=tag, is_done=False),
+    "overdue": lambda todos, tags, owner, tag: todos.get_overdue(owner),
+    "today": lambda todos, tags, owner, tag: todos.get_today(owner),
+    "counters": lambda todos, tags, owner, tag: todos.count(owner),
+    "tag counters": lambda todos, tags, owner, tag: todos.count(owner, tag_id=tag),
+    "due stats": lambda todos, tags, owner, tag: todos.get_due_stats(owner, datetime.utcnow()),
+    "tag stats": lambda todos, tags, owner, tag: todos.get_tag_stats(owner),
+    "single record": lambda todos, tags, owner, tag: todos.get_record(1, owner),
+    "single todo": lambda todos, tags, owner, tag: todos.get_by_id(1, owner),
+    "todos by ids": lambda todos, tags, owner, tag: todos.get_by_ids([1, 2, 3], owner),
+    "update": lambda todos, tags, owner, tag: todos.update(10**9, TodoUpdate(title="renamed"), owner),
+    "delete many": lambda todos, tags, owner, tag: todos.delete_many([10**9], owner),
+    "delete completed": lambda todos, tags, owner, tag: todos.delete_completed(owner),
+    "tags": lambda todos, tags, owner, tag: tags.get_all(owner),
+    "tag by id": lambda todos, tags, owner, tag: tags.get_by_id(tag, owner),
+    "tags by ids": lambda todos, tags, owner, tag: tags.get_by_ids([tag], owner),
+    "tags by names": lambda todos, tags, owner, tag: tags.get_by_names(["work", "new"], owner),
+}
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_query_uses_an_index(case, db, seeded):
+    owner_id, tag_id = seeded
+    with captured_statements() as statements:
+        CASES[case](TodoRepository(db), TagRepository(db), owner_id, tag_id)
+    db.rollback()
+    assert statements, f"{case}: no query captured"
+
+    for statement, parameters in statements:
+        plan = plan_lines(statement, parameters)
+        scans = [line for line in plan if FULL_SCAN.search(line) and (case, line) not in ALLOWED_SCANS]
+        assert not scans, f"{case}: full table scan\n{statement}\n" + "\n".join(plan)
@@ -0,0 +1,67 @@
+"""GET /todos?q=: owner-scoped matches, prefix search and the capped total."""
+import uuid
+
+import pytest
+
+from app.core.config import settings
+from app.repositories.todo_repository import TodoRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas.todo import TodoCreate
+from app.schemas.user import UserCreate
+
+
+def _create(db, owner_id, *titles, description=None):
+    repo = TodoRepository(db)
+    return [repo.create(TodoCreate(title=t, description=description), owner_id).id for t in titles]
+
+
+@pytest.fixture
+def other_user(db):
+    email = f"other-{uuid.uuid4().hex[:12]}@example.com"
+    return UserRepository(db).create(UserCreate(email=email, password="password123"), hashed_password="x")
+
+
+def test_search_only_matches_the_owners_todos(db, user, other_user):
+    mine = _create(db, user.id, "quarterly report", "weekly review")
+    _create(db, other_user.id, "quarterly report", "report draft")
+
+    items, total = TodoRepository(db).get_all(user.id, q="report")
+
+    assert [t.id for t in items] == [mine[0]]
+    assert total == 1
+
+
+def test_search_matches_word_prefixes_in_title_and_description(db, user):
+    ids = _create(db, user.id, "call the dentist", "pay invoices")
+    described = _create(db, user.id, "errand", description="renew the insurance contract")
+
+    repo = TodoRepository(db)
+    assert [t.id for t in repo.get_all(user.id, q="dent")[0]] == [ids[0]]
+    assert [t.id for t in repo.get_all(user.id, q="insur contr")[0]] == described
+    # The owner id is indexed too, but never matched by the search words
+    assert repo.get_all(user.id, q=str(user.id))[1] == 0
+
+
+def test_search_total_is_capped(db, user, monkeypatch):
+    _create(db, user.id, *(f"report {i}" for i in range(5)))
+    repo = TodoRepository(db)
+
+    monkeypatch.setattr(settings, "SEARCH_COUNT_LIMIT", 5)
+    items, total = repo.get_all(user.id, q="report", limit=2)
+    assert (len(items), total) == (2, 5)
+
+    monkeypatch.setattr(settings, "SEARCH_COUNT_LIMIT", 4)
+    items, total = repo.get_all(user.id, q="report", limit=2)
+    assert total is None
+    assert len(items) == 3  # one extra row: there is another page
+
+
+def test_search_endpoint_reports_has_more_without_total(client, auth_headers, db, user, monkeypatch):
+    _create(db, user.id, *(f"report {i}" for i in range(3)))
+    monkeypatch.setattr(settings, "SEARCH_COUNT_LIMIT", 2)
+
+    page = client.get("/api/v1/todos", params={"q": "report", "limit": 2}, headers=auth_headers).json()
+
+    assert page["total"] is None
+    assert page["has_more"] is True
+    assert len(page["items"]) == 2
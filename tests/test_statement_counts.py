@@ -0,0 +1,103 @@
+"""Exact number of SQL statements per endpoint, so an N+1 query or a loader
+change that adds round trips fails here instead of in production."""
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import engine
+from app.repositories.tag_repository import TagRepository
+from app.repositories.todo_repository import TodoRepository
+from app.schemas.tag import TagCreate
+from app.schemas.todo import TodoCreate
+
+API = "/api/v1"
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+
+@pytest.fixture
+def api(client, auth_headers):
+    """Call the API as the test user; the principal cache is warmed first,
+    so counts do not include the one-time users lookup."""
+    client.get(f"{API}/auth/me", headers=auth_headers)
+
+    def call(method, url, **kwargs):
+        with count_statements() as statements:
+            response = client.request(method, API + url, headers=auth_headers, **kwargs)
+        assert response.status_code < 400, response.text
+        return response, statements
+
+    return call
+
+
+@pytest.fixture
+def seeded(api, db, user):
+    """Tag "work" and five todos (odd ones tagged, one overdue, one due
+    today); returns (tag id, todo ids). Past deadlines are rejected by the
+    API, so the rows go through the repository."""
+    tags = TagRepository(db)
+    tag = tags.create(TagCreate(name="work"), user.id)
+    now = datetime.utcnow()
+    due = [None, now - timedelta(days=2), now.replace(hour=12), None, None]
+    todos = TodoRepository(db)
+    ids = [
+        todos.create(TodoCreate(title=f"todo number {i}", due_date=due[i]), user.id,
+                     tags=[tag] if i % 2 else None).id
+        for i in range(5)
+    ]
+    return tag.id, ids
+
+
+# (method, url, request kwargs, statements); {id} is the first todo
+CASES = [
+    ("GET", "/todos", {}, 4),
+    ("GET", "/todos?cursor=", {}, 3),
+    ("GET", "/todos?q=number", {}, 4),
+    ("GET", "/todos?tag_id={tag}", {}, 4),
+    ("GET", "/todos/overdue", {}, 3),
+    ("GET", "/todos/today", {}, 3),
+    ("GET", "/todos/{id}", {}, 2),
+    ("GET", "/tags/", {}, 2),
+    ("POST", "/todos", {"json": {"title": "created", "tag_ids": []}}, 4),
+    ("PATCH", "/todos/{id}", {"json": {"title": "renamed"}}, 2),
+    ("POST", "/todos/{id}/complete", {}, 2),
+    ("DELETE", "/todos/{id}", {}, 2),
+    ("DELETE", "/todos/completed", {}, 1),
+]
+
+
+@pytest.mark.parametrize("method,url,kwargs,expected", CASES, ids=[f"{m} {u}" for m, u, _, _ in CASES])
+def test_endpoint_statement_count(api, seeded, method, url, kwargs, expected):
+    tag, ids = seeded
+    _, statements = api(method, url.format(id=ids[0], tag=tag), **kwargs)
+    assert len(statements) == expected, "\n".join(statements)
+
+
+# Bulk endpoints must cost the same whatever the number of items
+@pytest.mark.parametrize("size", [2, 4])
+def test_bulk_statement_counts(api, seeded, size):
+    tag, ids = seeded
+    items = [{"title": f"bulk {i}", "tag_names": ["work", f"new {i}"]} for i in range(size)]
+    _, statements = api("POST", "/todos/bulk", json={"items": items})
+    assert len(statements) == 9, "\n".join(statements)
+
+    items = [{"id": todo_id, "is_done": True, "tag_ids": [tag]} for todo_id in ids[:size]]
+    _, statements = api("PATCH", "/todos/bulk", json={"items": items})
+    assert len(statements) == 8, "\n".join(statements)
+
+    _, statements = api("DELETE", "/todos/bulk", json={"ids": ids[:size]})
+    assert len(statements) == 2, "\n".join(statements)
@@ -0,0 +1,31 @@
+"""GET /todos/today and the stats' due_today agree on what "today" is."""
+import time
+from datetime import datetime
+
+import pytest
+
+from app.repositories.todo_repository import TodoRepository
+from app.repositories.version_repository import DataVersionRepository
+from app.schemas.todo import TodoCreate
+from app.services.stats_service import StatsService
+
+
+@pytest.fixture
+def server_tz_off_by_a_day(monkeypatch):
+    """A server time zone whose local date differs from the UTC date right now."""
+    monkeypatch.setenv("TZ", "Etc/GMT-14" if datetime.utcnow().hour >= 10 else "Etc/GMT+12")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_today_uses_the_utc_day(db, user, server_tz_off_by_a_day):
+    repo = TodoRepository(db)
+    todo = repo.create(TodoCreate(title="due now", due_date=datetime.utcnow()), user.id)
+
+    today = repo.get_today(user.id)
+    stats = StatsService(repo, DataVersionRepository(db)).get_stats(user.id)
+
+    assert [t.id for t in today] == [todo.id]
+    assert stats.due_today == 1